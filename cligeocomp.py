@@ -1,84 +1,186 @@
 #!/usr/bin/env python
 
+import io
 import sys
-import time
+import json
 import os.path
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 import geocomp
 from geocomp import config
+from geocomp.common import registry
 from geocomp.gui import dummy
+from geocomp.gui import recorder
 
-def get_func (strTemp):
-
-	listTemp = strTemp.split('/')
-	if listTemp[0] == 'geocomp':
-		listTemp.pop (0)
-
-	last = listTemp.pop ()
-	ext = last.rfind ('.py', -4)
-	#ext = rfind (last, '.py', -4)
-	if ext != -1: 
-		last = last[:ext]
-
-	mod = geocomp
-	for name in listTemp:
-		mod = getattr (mod, name)
-
-	tempTuple = (list(filter (lambda x, last=last: x[0] == last, mod.children)))[0]
-
-	if tempTuple[1] == None: return None
-
-	mod = getattr (mod, last)
-	func = getattr (mod, tempTuple[1])
-
-	return func
-
-def run_alg (func, localInput):
-	init = time.clock ()
-	cont, extra = geocomp.run_algorithm (func, localInput)
-	end = time.clock ()
+# diretorio onde gravar os traces da visualizacao (veja -t)
+tracedir = None
 
-	delta = end - init
+def get_func (strTemp):
+	"A funcao do algoritmo strTemp (veja geocomp.common.registry)"
+	return registry.get_func (strTemp)
+
+def init_worker (verbose, cache, trace):
+	"Prepara um processo para rodar algoritmos"
+	global tracedir
+	config.VERBOSE = verbose
+	config.CACHE = cache
+	tracedir = trace
+	geocomp.init_display (dummy, None)
 
-	print(repr(cont), '  ','%.2f'%delta,'s', '  ', extra)
+def run_alg (func_name, filename, output = False, memory = False):
+	"""Roda o algoritmo func_name sobre o arquivo filename
+
+	Devolve um dicionario com o algoritmo, o arquivo, os campos de
+	Result.as_dict (output so se output for verdadeiro), error (None, ou
+	a descricao da falha: algoritmo desconhecido, arquivo que nao pode
+	ser lido ou erro do algoritmo) e stdout (o que o algoritmo
+	imprimiu). Se tracedir nao for None, grava a visualizacao em
+	tracedir/<arquivo>.<algoritmo>.trace (veja geocomp.gui.recorder)."""
+	record = { 'algorithm': func_name, 'file': filename, 'error': None }
+	if tracedir is not None:
+		record['trace'] = os.path.join (tracedir, '%s.%s.trace' %
+		            (os.path.basename (filename), func_name.replace ('/', '_')))
+		geocomp.init_display (recorder, record['trace'])
+	out = io.StringIO ()
+	with contextlib.redirect_stdout (out):
+		try:
+			func = get_func (func_name)
+			# os algoritmos de pontos aceitam o PointSet mapeado do cache
+			arrays = registry.get (func_name).input_type == 'points'
+			lInput = geocomp.open_file (filename, arrays)
+			result = geocomp.run_algorithm (func, lInput, memory)
+			record.update (result.as_dict (output))
+			record['algorithm'] = func_name
+		except Exception as e:
+			record['error'] = '%s: %s' % (type (e).__name__, e)
+		finally:
+			if tracedir is not None:
+				recorder.close ()
+				geocomp.init_display (dummy, None)
+	record['stdout'] = out.getvalue ()
+	return record
+
+def run_jobs (jobs, njobs, output = False, memory = False):
+	"""Roda os jobs (pares (algoritmo, arquivo)) em njobs processos
+
+	Gera os resultados de run_alg na ordem dos jobs, a medida que ficam
+	prontos. Com njobs == 1, roda tudo neste processo."""
+	if njobs == 1:
+		for job in jobs:
+			yield run_alg (*job, output, memory)
+		return
+
+	with ProcessPoolExecutor (njobs, initializer = init_worker,
+	                          initargs = (config.VERBOSE, config.CACHE, tracedir)) as executor:
+		futures = [ executor.submit (run_alg, *job, output, memory)
+		            for job in jobs ]
+		for future in futures:
+			yield future.result ()
+
+def report (name, record, sink = None):
+	"""Imprime o resultado de um job e, se sink nao for None, grava o
+	registro (sem stdout) como uma linha de JSON em sink"""
+	print(name, ':', end=' ')
+	print(record['stdout'], end='')
+	if record['error'] is not None:
+		print('erro:', record['error'])
+	else:
+		mem = ''
+		if record['peak_memory'] is not None:
+			mem = '%.1f MB' % (record['peak_memory'] / 2**20)
+		print(repr(record['count']), '  ','%.2f'%record['wall_time'],'s', '  ',
+		      '%.2f'%record['cpu_time'], 's cpu', '  ', mem, record['extra_info'])
 	sys.stdout.flush ()
 
-def many_algs (strings):
+	if sink is not None:
+		record = dict (record)
+		del record['stdout']
+		sink.write (json.dumps (record) + '\n')
+		sink.flush ()
+
+def many_algs (strings, njobs = 1, sink = None, memory = False):
 	filename = strings.pop (0)
 	print(filename, ':')
-	lInput = geocomp.open_file (filename)
-
-	for func_name in strings:
-		print(os.path.basename (func_name),':', end=' ')
-		func = get_func (func_name)
 
-		run_alg (func, lInput)
+	jobs = [ (func_name, filename) for func_name in strings ]
+	results = run_jobs (jobs, njobs, sink is not None, memory)
+	for (func_name, f), record in zip (jobs, results):
+		report (os.path.basename (func_name), record, sink)
 
-def many_files (strings):
+def many_files (strings, njobs = 1, sink = None, memory = False):
 	func_name = strings.pop (0)
-	print(func_name,':')
-	func = get_func (func_name)
-
-	for filename in strings:
-		print(os.path.basename (filename),':', end=' ')
-		lInput = geocomp.open_file (filename)
-
-		run_alg (func, lInput)
-
+	many_pairs ([ func_name ], strings, njobs, sink, memory)
+
+def many_pairs (func_names, filenames, njobs = 1, sink = None, memory = False):
+	"Roda cada algoritmo de func_names sobre cada arquivo de filenames"
+	jobs = [ (func_name, filename) for func_name in func_names
+	                               for filename in filenames ]
+	results = run_jobs (jobs, njobs, sink is not None, memory)
+	last = None
+	for (func_name, filename), record in zip (jobs, results):
+		if func_name != last:
+			print(func_name,':')
+			last = func_name
+		report (os.path.basename (filename), record, sink)
+
+
+def usage ():
+	print(sys.argv[0], '[options] <algorithm> <file1> [file2]...')
+	print(sys.argv[0], '[options] -a <file1> <algorithm1> [algorithm2]...')
+	print(sys.argv[0], '[options] -p <algorithm1>[,algorithm2]... <file1> [file2]...')
+	print(sys.argv[0], '--clear-cache [file1]...')
+	print('options:')
+	print('  -j N:    roda N algoritmos ao mesmo tempo (N = 0: um por processador)')
+	print('  -o FILE: grava um registro JSON por algoritmo rodado em FILE')
+	print('           (contagens, tempos e a saida do algoritmo)')
+	print('  -m:      mede o pico de memoria de cada algoritmo (mais lento)')
+	print('  -v:      deixa os algoritmos imprimirem os pontos e resultados')
+	print('  -c:      guarda os arquivos lidos no cache (veja config.CACHEDIR),')
+	print('           para as proximas execucoes nao os analisarem de novo')
+	print('  -t DIR:  grava a visualizacao de cada algoritmo em DIR, para ser')
+	print('           vista com python -m geocomp.gui.replay')
+	sys.exit (1)
 
 if __name__ == '__main__':
-	if len (sys.argv) < 2:
-		print(sys.argv[0], '<algorithm> <file1> [file2]...')
-		print(sys.argv[0], '-a <file1> <algorithm1> [algorithm2]...')
-		sys.exit (1)
+	njobs = 1
+	sink = None
+	memory = False
+	args = sys.argv[1:]
+	while args and args[0] in ('-j', '-o', '-m', '-v', '-c', '-t'):
+		opt = args.pop (0)
+		if opt == '-m':
+			memory = True
+		elif opt == '-v':
+			config.VERBOSE = True
+		elif opt == '-c':
+			config.CACHE = True
+		elif not args:
+			usage ()
+		elif opt == '-j':
+			njobs = int (args.pop (0)) or os.cpu_count ()
+		elif opt == '-t':
+			tracedir = args.pop (0)
+			os.makedirs (tracedir, exist_ok = True)
+		else:
+			sink = open (args.pop (0), 'w')
+
+	if len (args) < 1:
+		usage ()
+
+	if args[0] == '--clear-cache':
+		from geocomp.common import cache
+		n = cache.clear (args[1:] or None)
+		print(n, 'entradas apagadas de', config.CACHEDIR)
+		sys.exit (0)
 
 	geocomp.init_display (dummy, None)
 
-	if sys.argv[1] == '-a':
-		sys.argv.pop (0)
-		sys.argv.pop (0)
-		many_algs (sys.argv)
+	if args[0] == '-a':
+		many_algs (args[1:], njobs, sink, memory)
+	elif args[0] == '-p':
+		many_pairs (args[1].split (','), args[2:], njobs, sink, memory)
 	else: 
-		sys.argv.pop (0)
-		many_files (sys.argv)
-
+		many_files (args, njobs, sink, memory)
 
+	if sink is not None:
+		sink.close ()
@@ -5,19 +5,23 @@
 Sub-modulos:
 - closest: algoritmos para encontar o par de pontos mais próximo
 - lineintersections: algoritmos para encontrar todas as intersecções de segmentos
+- convex_hull: algoritmos para o fecho convexo
 
 - common:     classes e operacoes usadas por diversos algoritmos
 - gui:        implementacoes das operacoes graficas
+
+Os sub-modulos dos problemas (e os modulos dos algoritmos) so sao
+importados quando usados: veja common.registry.
 """
 
-from . import closest
-from . import lineintersections
-from . import convex_hull
 from .common.guicontrol import init_display
 from .common.guicontrol import plot_input
 from .common.guicontrol import run_algorithm
+from .common.guicontrol import to_json
 from .common.prim import get_count
 from .common.prim import reset_count
+from .common.cache import read as open_file
+from .common import registry
 
 children = (   ( 'lineintersections',  None, 'Interseção de Todos os  Segs - Beatriz & Igor' ),
                ( 'closest',  None, 'Par Mais Prox -  Gabriel & Luis' ),
@@ -25,3 +29,4 @@ children = (   ( 'lineintersections',  None, 'Interseção de Todos os  Segs - B
 	)
 
 __all__ = [p[0] for p in children]
+__getattr__ = registry.lazy (__name__, __all__)
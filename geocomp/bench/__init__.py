@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+"""Medidas de desempenho dos algoritmos
+
+Sub-modulos:
+- generators: geradores de pontos aleatorios (os mesmos de utils/)
+- suite:      curvas de escala dos algoritmos e ajuste dos expoentes
+
+Pela linha de comando: python -m geocomp.bench --help
+"""
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Roda a suite de benchmarks (veja geocomp.bench.suite)"""
+
+import sys
+import argparse
+
+from geocomp.bench import suite
+from geocomp.bench.generators import GENERATORS
+
+
+def print_record(r):
+    if r['error']:
+        result = 'erro: ' + r['error']
+    else:
+        result = '%10.4fs %12d' % (r['time'], r['count'])
+    print('%-44s %-12s %8d  %s' % (r['algorithm'], r['generator'], r['n'], result))
+    sys.stdout.flush()
+
+
+def print_fits(fits):
+    print()
+    print('%-44s %-12s %8s %8s' % ('algoritmo', 'gerador', 'tempo', 'prims'))
+    for f in fits:
+        k = ['%8.2f' % e if e is not None else '%8s' % '-'
+             for e in (f['time_exponent'], f['count_exponent'])]
+        print('%-44s %-12s %s %s' % (f['algorithm'], f['generator'], k[0], k[1]))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m geocomp.bench',
+        description='Mede os algoritmos registrados em entradas de tamanhos '
+                    'crescentes e ajusta os expoentes de tempo ~ n^k.')
+    parser.add_argument('-p', '--problem', action='append',
+                        choices=sorted(suite.problem_types()),
+                        help='problema (pode repetir; padrao: todos)')
+    parser.add_argument('-a', '--algorithm', action='append',
+                        help='so este algoritmo, como problema/modulo.Funcao '
+                             '(pode repetir; padrao: todos)')
+    parser.add_argument('-g', '--generator', action='append',
+                        choices=sorted(GENERATORS),
+                        help='gerador (pode repetir; padrao: todos)')
+    parser.add_argument('--min', type=int, default=128, help='menor tamanho')
+    parser.add_argument('--max', type=int, default=16384, help='maior tamanho')
+    parser.add_argument('--factor', type=float, default=2,
+                        help='razao entre tamanhos consecutivos')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--reps', type=int, default=3)
+    parser.add_argument('--max-time', type=float, default=10.0,
+                        help='para de crescer depois de uma rodada mais lenta que isso (s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='grava as medidas e os ajustes em JSON')
+    parser.add_argument('--csv', help='grava as medidas e os ajustes em CSV')
+    args = parser.parse_args(argv)
+
+    ns = suite.sizes(args.min, args.max, args.factor)
+    records = suite.run(args.problem, args.generator, ns, args.warmup,
+                        args.reps, args.max_time, args.seed, log=print_record,
+                        only=args.algorithm)
+    fits = suite.fit(records)
+    print_fits(fits)
+
+    if args.json:
+        suite.write_json(args.json, records, fits, sizes=ns,
+                         warmup=args.warmup, reps=args.reps, seed=args.seed)
+    if args.csv:
+        suite.write_csv(args.csv, records, fits)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Geradores de pontos aleatorios
+
+Sao os geradores de utils/ (que agora so chamam estas funcoes), com um
+parametro a mais, rng: um random.Random, para que as entradas possam
+ser reproduzidas a partir de uma semente. Todos devolvem uma lista de
+pares (x, y).
+"""
+
+import random
+from math import pi, sqrt, sin, cos, exp
+
+
+def randdisc(num_pts, radius, rng=random):
+    "num_pts pontos uniformes num disco de raio radius"
+    if radius < 0: radius = -radius
+    if radius == 0: radius = 10000
+    l = []
+    for i in range(num_pts):
+        r = sqrt(rng.uniform(0, radius * radius))
+        theta = rng.uniform(0, 2 * pi)
+        l.append((float(r * cos(theta)), float(r * sin(theta))))
+    return l
+
+
+def randcirc(num_pts, radius, rng=random):
+    "num_pts pontos aleatorios num circulo de raio radius"
+    if radius < 0: radius = -radius
+    if radius == 0: radius = 15000
+    l = []
+    for i in range(num_pts):
+        theta = rng.uniform(0, 2 * pi)
+        l.append((float(radius * cos(theta)), float(radius * sin(theta))))
+    return l
+
+
+def randbox(num_pts, side_length, rng=random):
+    "num_pts pontos uniformes num quadrado de lado side_length"
+    l = []
+    for i in range(num_pts):
+        x = float(rng.uniform(0, side_length))
+        y = float(rng.uniform(0, side_length))
+        l.append((x, y))
+    return l
+
+
+SPIRAL_RADIUS = 100
+
+def randspiral(num_pts, num_turns):
+    "num_pts pontos igualmente espacados (no angulo) numa espiral"
+    l = []
+    for i in range(num_pts):
+        theta = i * (num_turns * 2 * pi) / num_pts
+        radius = SPIRAL_RADIUS * exp(3.32614159909e-2 * theta)
+        l.append((radius * cos(theta), radius * sin(theta)))
+    return l
+
+
+def uniform_circ(num_pts, radius):
+    "num_pts pontos igualmente espacados num circulo de raio radius"
+    l = []
+    for i in range(num_pts):
+        theta = (2 * pi * i) / num_pts
+        l.append((float(radius * cos(theta)), float(radius * sin(theta))))
+    return l
+
+
+def rand_n_vertices(num_pts, num_vertices, radius, rng=random):
+    """num_pts pontos cujo fecho convexo tem num_vertices vertices:
+    num_vertices num circulo de raio radius e o resto num disco de raio
+    0.7 * radius, em ordem aleatoria"""
+    if radius < 0: radius = -radius
+    if radius == 0: radius = 10000
+    if num_vertices < 4: num_vertices = 4
+    if num_vertices > num_pts:
+        num_vertices, num_pts = num_pts, num_vertices
+
+    l = randdisc(num_pts - num_vertices, 0.7 * radius, rng)
+    l.extend(uniform_circ(num_vertices, radius))
+    rng.shuffle(l)
+    return l
+
+
+GRAHAM_WORST_RADIUS = 10000
+
+def graham_worst(num_pts, rng=random):
+    """Pior caso do Graham: num_pts - 3 pontos (de coordenadas inteiras)
+    num arco de circulo, mais tres pontos, em ordem aleatoria"""
+    if num_pts < 0: num_pts = -num_pts
+    if num_pts < 4:
+        raise ValueError("graham_worst needs at least 4 points")
+    R = GRAHAM_WORST_RADIUS
+    l = [(0, 0), (-2 * R, 0), (0, R)]
+    delta = (pi * 5. / 40) / (num_pts - 3)
+    theta = 35 * pi / 40
+    for i in range(num_pts - 3):
+        l.append((int(R * cos(theta)), int(R * sin(theta))))
+        theta = theta + delta
+    rng.shuffle(l)
+    return l
+
+
+# nome -> funcao (num_pts, rng) com os parametros usados pelo bench
+GENERATORS = {
+    'disc': lambda n, rng: randdisc(n, 10000, rng),
+    'circ': lambda n, rng: randcirc(n, 15000, rng),
+    'box': lambda n, rng: randbox(n, 10000, rng),
+    'spiral': lambda n, rng: randspiral(n, 5),
+    'n_vertices': lambda n, rng: rand_n_vertices(n, int(sqrt(n)), 10000, rng),
+    'graham_worst': lambda n, rng: graham_worst(n, rng),
+}
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""Curvas de escala dos algoritmos
+
+Roda cada algoritmo registrado nos children de cada problema sobre as
+entradas dos geradores, em tamanhos que crescem geometricamente, e
+ajusta, para cada (algoritmo, gerador), o expoente k de tempo ~ n^k
+(e de primitivas ~ n^k) por minimos quadrados em escala log-log.
+
+Cada medida e' o menor tempo de algumas repeticoes, depois de algumas
+rodadas de aquecimento, sempre com a interface grafica dummy e com a
+saida dos algoritmos descartada. Um (algoritmo, gerador) para de crescer
+quando uma rodada passa de max_time segundos ou quando o algoritmo
+falha.
+"""
+
+import os
+import csv
+import json
+import random
+import contextlib
+from math import sqrt
+
+import numpy as np
+
+import geocomp
+from geocomp.gui import dummy
+from geocomp.common import guicontrol
+from geocomp.common import registry
+from geocomp.common.point import Point
+from geocomp.common.segment import Segment
+from geocomp.bench.generators import GENERATORS
+
+
+def problem_types():
+    """Dicionario problema -> tipo da entrada ('points' ou 'segments'),
+    com os problemas do registro que tem input_type"""
+    ret = {}
+    for a in registry.algorithms():
+        if a.input_type is not None:
+            ret.setdefault(a.problem, a.input_type)
+    return ret
+
+# medidas mais rapidas do que isso sao ignoradas no ajuste (se sobrarem
+#   pelo menos duas), porque sao dominadas pelo custo fixo
+MIN_FIT_TIME = 1e-3
+
+
+def algorithms(problem):
+    "Pares (nome, funcao) dos algoritmos nos children de problem"
+    return [(a.name, a.load()) for a in registry.algorithms(problem)]
+
+
+def sizes(start, stop, factor=2):
+    "Tamanhos start, start * factor, ... ate stop"
+    ret = []
+    n = start
+    while n <= stop:
+        ret.append(int(n))
+        n *= factor
+    return ret
+
+
+def make_input(kind, coords, rng):
+    """Entrada de um problema a partir dos pontos de um gerador
+
+    Para segmentos, cada ponto p vira um segmento de p a p + d, com d
+    aleatorio de tamanho proporcional a (tamanho da regiao) / sqrt(n),
+    para que o numero de intersecoes seja proporcional a n."""
+    if kind == 'points':
+        return [Point(x, y) for x, y in coords]
+    xs = [x for x, y in coords]
+    ys = [y for x, y in coords]
+    size = max(max(xs) - min(xs), max(ys) - min(ys), 1)
+    length = size / sqrt(len(coords))
+    ret = []
+    for x, y in coords:
+        dx = rng.uniform(-length, length)
+        dy = rng.uniform(-length, length)
+        ret.append(Segment(Point(x, y), Point(x + dx, y + dy)))
+    return ret
+
+
+def measure(func, make, warmup=1, reps=3):
+    """Roda func sobre make() warmup + reps vezes (uma entrada nova a
+    cada vez) e devolve os tempos das reps ultimas e o numero de
+    primitivas da ultima
+
+    O tempo e' o Result.wall_time de run_algorithm: so a chamada do
+    algoritmo, sem o desenho da entrada nem a preparacao da tela."""
+    times = []
+    count = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for r in range(warmup + reps):
+            result = geocomp.run_algorithm(func, make())
+            count = result.count
+            if r >= warmup:
+                times.append(result.wall_time)
+    return times, count
+
+
+def run(problems=None, generators=None, ns=None, warmup=1, reps=3,
+        max_time=10.0, seed=0, log=None, only=None):
+    """Mede os algoritmos de problems (todos os de problem_types(), por padrao)
+    sobre as entradas de generators (todos de GENERATORS) nos tamanhos
+    ns (sizes(128, 16384))
+
+    Se only for dado, so os algoritmos com esses nomes (como em
+    registry.get) sao medidos: assim um algoritmo rapido pode ir ate
+    tamanhos em que a forca bruta nao cabe no tempo.
+
+    Devolve uma lista de medidas: dicionarios com problem, algorithm,
+    generator, n, time (o menor), median, times, count (primitivas) e
+    error (None, ou a descricao da falha). Se log for uma funcao, ela e'
+    chamada com cada medida logo depois de feita."""
+    kinds = problem_types()
+    if problems is None: problems = list(kinds)
+    if only is not None:
+        only = set(registry.get(name).name for name in only)
+    if generators is None: generators = list(GENERATORS)
+    if ns is None: ns = sizes(128, 16384)
+
+    if guicontrol.gui is None:
+        geocomp.init_display(dummy, None)
+
+    records = []
+    for problem in problems:
+        kind = kinds[problem]
+        for name, func in algorithms(problem):
+            if only is not None and name not in only:
+                continue
+            for gen in generators:
+                for n in ns:
+                    rng = random.Random('%s %d %d' % (gen, n, seed))
+                    coords = GENERATORS[gen](n, rng)
+                    state = rng.getstate()
+
+                    def make():
+                        rng.setstate(state)
+                        return make_input(kind, coords, rng)
+
+                    record = {'problem': problem, 'algorithm': name,
+                              'generator': gen, 'n': n, 'time': None,
+                              'median': None, 'times': [], 'count': None,
+                              'error': None}
+                    try:
+                        times, count = measure(func, make, warmup, reps)
+                        record.update(time=min(times),
+                                      median=float(np.median(times)),
+                                      times=times, count=count)
+                    except Exception as e:
+                        record['error'] = '%s: %s' % (type(e).__name__, e)
+                    records.append(record)
+                    if log is not None:
+                        log(record)
+                    if record['error'] or record['time'] > max_time:
+                        break
+    return records
+
+
+def _slope(ns, values):
+    "Inclinacao da reta de minimos quadrados de log(values) x log(ns)"
+    if len(ns) < 2:
+        return None
+    k, c = np.polyfit(np.log(ns), np.log(values), 1)
+    return float(k)
+
+
+def fit(records):
+    """Expoentes empiricos de cada (problema, algoritmo, gerador)
+
+    Devolve uma lista de dicionarios com problem, algorithm, generator,
+    time_exponent, count_exponent e sizes (os tamanhos usados no ajuste
+    do tempo)."""
+    series = {}
+    for r in records:
+        if r['error'] is None:
+            key = (r['problem'], r['algorithm'], r['generator'])
+            series.setdefault(key, []).append(r)
+
+    ret = []
+    for (problem, algorithm, generator), rs in series.items():
+        timed = [r for r in rs if r['time'] >= MIN_FIT_TIME]
+        if len(timed) < 2:
+            timed = rs
+        timed = [r for r in timed if r['time'] > 0]
+        counted = [r for r in rs if r['count']]
+        ret.append({
+            'problem': problem, 'algorithm': algorithm,
+            'generator': generator,
+            'time_exponent': _slope([r['n'] for r in timed],
+                                    [r['time'] for r in timed]),
+            'count_exponent': _slope([r['n'] for r in counted],
+                                     [r['count'] for r in counted]),
+            'sizes': [r['n'] for r in timed],
+        })
+    return ret
+
+
+def write_json(filename, records, fits, **info):
+    "Grava as medidas, os ajustes e info (parametros do bench) em JSON"
+    with open(filename, 'w') as file:
+        json.dump({'info': info, 'results': records, 'fits': fits},
+                  file, indent=1)
+
+
+CSV_FIELDS = ['problem', 'algorithm', 'generator', 'n', 'time', 'median',
+              'count', 'error', 'time_exponent', 'count_exponent']
+
+def write_csv(filename, records, fits):
+    """Grava as medidas em CSV, uma por linha, com os expoentes ajustados
+    da serie de cada uma"""
+    exponents = {(f['problem'], f['algorithm'], f['generator']): f
+                 for f in fits}
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for r in records:
+            row = dict(r)
+            f = exponents.get((r['problem'], r['algorithm'], r['generator']), {})
+            row['time_exponent'] = f.get('time_exponent')
+            row['count_exponent'] = f.get('count_exponent')
+            writer.writerow(row)
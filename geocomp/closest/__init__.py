@@ -5,13 +5,29 @@ Dado um conjunto de pontos S, determinar dois cuja distancia entre eles seja min
 
 Algoritmos disponveis:
 - Forca bruta
+- Divisao e conquista
+- Aleatorizado com grade (Rabin / Khuller-Matias)
+
+E tambem o vizinho mais proximo de cada ponto (neighbors), com uma
+arvore k-d.
 """
-from . import brute
-from . import divide
+from geocomp.common import registry
 
 children = [
 	[ 'brute', 'Brute', 'Forca Bruta' ],
-	[ 'divide', 'Divide', 'Divide & Conquer']
+	[ 'divide', 'Divide', 'Divide & Conquer'],
+	[ 'grid', 'Grid', 'Grade Aleatorizada' ],
+	[ 'neighbors', 'AllNearest', 'Vizinhos Mais Proximos' ]
 ]
 
+# tipo da entrada e complexidade de cada algoritmo (veja geocomp.common.registry)
+input_type = 'points'
+complexity = {
+	'Brute': 'O(n^2)',
+	'Divide': 'O(n log n)',
+	'Grid': 'O(n) esperado',
+	'AllNearest': 'O(n log n)',
+}
+
 __all__ = [a[0] for a in children]
+__getattr__ = registry.lazy (__name__, __all__)
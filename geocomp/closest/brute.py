@@ -3,13 +3,17 @@
 
 from geocomp.common.segment import Segment
 from geocomp.common import control
-from geocomp.common.guiprim import *
+from geocomp.common import guiprim
+from geocomp.common.pointset import point_list
 import math
+from geocomp import config
 
 
 def Brute (l):
 	"Algoritmo forca bruta para encontrar o par de pontos mais proximo"
 
+	l = point_list (l)
+
 	if len (l) < 2: return None
 	
 	closest = float("inf")
@@ -18,7 +22,7 @@ def Brute (l):
 
 	for i in range (len(l)):
 		for j in range (i + 1, len (l)):
-			dist = dist2 (l[i], l[j])
+			dist = guiprim.dist2 (l[i], l[j])
 			if dist < closest:
 				control.freeze_update ()
 				if a != None: a.unhilight (hia)
@@ -38,7 +42,8 @@ def Brute (l):
 	a.hilight('green')
 	b.hilight('green')
 	ret = Segment (a, b)
-	ret.extra_info = 'distancia: %.2f'%math.sqrt (dist2 (a, b))
-	print(math.sqrt (dist2 (a, b)))
+	ret.extra_info = 'distancia: %.2f'%math.sqrt (guiprim.dist2 (a, b))
+	if config.VERBOSE:
+		print(math.sqrt (guiprim.dist2 (a, b)))
 	return ret
 
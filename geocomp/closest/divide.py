@@ -1,53 +1,37 @@
 #!/usr/bin/env python
-"""Algoritmo por divisão e conquista"""
+"""Algoritmo por divisao e conquista
 
+Os pontos nao sao copiados nem reordenados: o algoritmo trabalha sobre
+uma lista v de indices, ordenada por x antes de comecar, e as listas x e
+y das coordenadas. Cada chamada recursiva deixa o seu trecho de v em
+ordem de y (mergesort), e a intercalacao e a faixa de candidatos em
+volta da mediana usam o mesmo trecho de uma unica lista auxiliar buf,
+alocada uma vez. A memoria extra e' O(n), e nenhuma lista e' criada
+durante a recursao.
+
+Sem interface grafica (control.headless), as distancias sao calculadas
+direto e contadas com prim.add_count; com ela, cada comparacao e'
+desenhada com guiprim.dist2, como antes.
+"""
+
+import math
+import numpy as np
+
+from geocomp import config
 from geocomp.common.segment import Segment
 from geocomp.common import control
 from geocomp.common import prim
 from geocomp.common import guiprim
-import math
-
-#   COMPATING FUNCTIONS
-def compareX(p1, p2):
-    if (p1.x == p2.x): return p1.y - p2.y
-    return p1.x - p2.x
-
-def compareY(p1, p2):
-    if (p1.y == p2.y): return p1.x - p2.x
-    return p1.y - p2.y
+from geocomp.common.pointset import point_list, coordinates
 
-
-# SORTING FUNCTIONS
-def swap(v, i , j):
-    v[i], v[j] = v[j], v[i]
-
-def partition(v, l, r, compare):
-    k = v[r-1]
-    j = l-1
-    for i in range(l, r-1):
-        comp = compare(v[i], k)
-        if (comp <= 0):
-            j += 1
-            swap(v, i, j)
-    j += 1
-    swap(v, r-1, j)
-    return j
-
-def sort_rec(v, l, r, compare):
-    if (r > l + 1):
-        q = partition(v, l, r, compare)
-        sort_rec(v, l, q, compare)
-        sort_rec(v, q, r, compare)
-
-def sort(v, compare):
-    n = len(v)
-    sort_rec(v, 0, n, compare)
+# lista de pontos (para desenhar), ou None se nada e' desenhado
+points = None
 
 #   PLOTING FUNCTIONS
-def plot_vertical_lines(pm, dmin):
-    vl1 = control.plot_vert_line(pm.x, "orange", 2)
-    vl2 = control.plot_vert_line(pm.x - dmin, "orange", 2)
-    vl3 = control.plot_vert_line(pm.x + dmin, "orange", 2)
+def plot_vertical_lines(xm, dmin):
+    vl1 = control.plot_vert_line(xm, "orange", 2)
+    vl2 = control.plot_vert_line(xm - dmin, "orange", 2)
+    vl3 = control.plot_vert_line(xm + dmin, "orange", 2)
     return vl1, vl2, vl3
 
 def delete_vertical_lines(vl1, vl2, vl3):
@@ -55,141 +39,160 @@ def delete_vertical_lines(vl1, vl2, vl3):
     control.plot_delete(vl2)
     control.plot_delete(vl3)
 
-def plot_horizontal_lines(p, dmin):
-    hl1 = control.plot_horiz_line(p.y, "blue", 2)
-    hl2 = control.plot_horiz_line(p.y + dmin, "blue", 2)
+def plot_horizontal_lines(y, dmin):
+    hl1 = control.plot_horiz_line(y, "blue", 2)
+    hl2 = control.plot_horiz_line(y + dmin, "blue", 2)
     return hl1, hl2
 
 def delete_horizontal_lines(hl1, hl2):
     control.plot_delete(hl1)
     control.plot_delete(hl2)
 
-def hilight_candidates(f):
-    hi = []
-    for p in f:
-        hi.append(p.hilight("cyan"))
-    return hi
+def hilight_candidates(f, l, r):
+    return [points[f[k]].hilight("cyan") for k in range(l, r)]
 
-def unhilight_candidates(f, hi):
-    for i in  range(len(f)):
-        f[i].unhilight(hi[i])
+def unhilight_candidates(f, l, r, hi):
+    for k in range(l, r):
+        points[f[k]].unhilight(hi[k - l])
 
 #   CLOSEST PAIR FUNCTIONS
-def merge(v, l, q, r, compare):
-    v1, v2 = [], []
-    for i in range(l, q):
-        v1.append(v[i])
-    for i in range(q, r):
-        v2.append(v[i])
-    n1, n2 = len(v1), len(v2)
-
-    i, j, k = 0, 0, l
-
-    while (i < n1 and j < n2):
-        comp = compare(v1[i], v2[j])
-        if (comp <= 0):
-            v[k] = v1[i]
+def dist2(x, y, i, j):
+    "Quadrado da distancia entre os pontos i e j (desenhada, se for o caso)"
+    if points is not None:
+        return guiprim.dist2(points[i], points[j])
+    prim.add_count('dist2')
+    dx = x[i] - x[j]
+    dy = y[i] - y[j]
+    return dx*dx + dy*dy
+
+def merge(y, v, buf, l, q, r):
+    """Intercala v[l:q] e v[q:r], ja em ordem de y, usando buf[l:q]"""
+    for k in range(l, q):
+        buf[k] = v[k]
+    i, j, k = l, q, l
+    while i < q and j < r:
+        if y[buf[i]] <= y[v[j]]:
+            v[k] = buf[i]
             i += 1
         else:
-            v[k] = v2[j]
+            v[k] = v[j]
             j += 1
         k += 1
-    
-    while (i < n1):
-        v[k] = v1[i]
+    # o que sobrar de v[q:r] ja esta no lugar
+    while i < q:
+        v[k] = buf[i]
         i += 1
         k += 1
-    while (j < n2):
-        v[k] = v2[j]
-        j += 1
-        k += 1
 
-    
-def update_points(p1, p2):
-    global a, b, id, hia, hib
-    if (a != None and b != None):
-        if (prim.dist2(p1, p2) >= prim.dist2(a, b)): return
+def update_points(d, i, j):
+    global best, a, b, id, hia, hib
+    if d >= best: return
+    best = d
+    if points is None:
+        a, b = i, j
+        return
     control.freeze_update()
-    if a != None: a.unhilight(hia)
-    if b != None: b.unhilight(hib)
+    if a != None: points[a].unhilight(hia)
+    if b != None: points[b].unhilight(hib)
     if id != None: control.plot_delete(id)
-    a = p1
-    b = p2
-    hia = a.hilight()
-    hib = b.hilight()
-    id = a.lineto(b)
-    control.thaw_update() 
+    a = i
+    b = j
+    hia = points[a].hilight()
+    hib = points[b].hilight()
+    id = points[a].lineto(points[b])
+    control.thaw_update()
     control.update()
 
-def candidates(p, l, r, dmin, pm):
-    f = []
-    for i in range(l, r):
-        if (abs(p[i].x - pm.x) < dmin):
-            f.append(p[i])
-    return f
-
-def combine(p, l, r, p1, p2, pm):
-    dmin2 = guiprim.dist2(p1, p2)
+def candidates(x, v, buf, l, r, dmin, xm):
+    """Copia para buf[l:] os indices de v[l:r] a menos de dmin da reta
+    x = xm, na mesma ordem (de y); devolve o fim deles em buf"""
+    t = l
+    for k in range(l, r):
+        if abs(x[v[k]] - xm) < dmin:
+            buf[t] = v[k]
+            t += 1
+    return t
+
+def combine(x, y, v, buf, l, r, pair, xm):
+    dmin2, p1, p2 = pair
     dmin = math.sqrt(dmin2)
-    f = candidates(p, l, r, dmin, pm)
-    t = len(f)
-    vl1, vl2, vl3 = plot_vertical_lines(pm, dmin)
-    hi = hilight_candidates(f)
-    for i in range(t):
-        hl1, hl2 = plot_horizontal_lines(f[i], dmin)
+    t = candidates(x, v, buf, l, r, dmin, xm)
+    if points is not None:
+        vl1, vl2, vl3 = plot_vertical_lines(xm, dmin)
+        hi = hilight_candidates(buf, l, t)
+    for i in range(l, t):
+        fi = buf[i]
+        if points is not None:
+            hl1, hl2 = plot_horizontal_lines(y[fi], dmin)
         j = i + 1
-        while j < t and (f[j].y - f[i].y) < dmin:
-            d = guiprim.dist2(f[i], f[j])
+        while j < t and (y[buf[j]] - y[fi]) < dmin:
+            d = dist2(x, y, fi, buf[j])
             if (d < dmin2):
-                p1, p2, dmin2 = f[i], f[j], d
-                update_points(p1, p2)
+                p1, p2, dmin2 = fi, buf[j], d
+                dmin = math.sqrt(dmin2)
+                update_points(d, p1, p2)
             j += 1
-        delete_horizontal_lines(hl1, hl2)
-    delete_vertical_lines(vl1, vl2, vl3)
-    unhilight_candidates(f, hi)
-    return p1, p2
+        if points is not None:
+            delete_horizontal_lines(hl1, hl2)
+    if points is not None:
+        delete_vertical_lines(vl1, vl2, vl3)
+        unhilight_candidates(buf, l, t, hi)
+    return dmin2, p1, p2
 
 
-def divide_rec(p, l, r, compare):
+def divide_rec(x, y, v, buf, l, r):
+    """Par mais proximo dos pontos v[l:r] (em ordem de x): devolve
+    (d2, i, j) e deixa v[l:r] em ordem de y"""
     #base
-    if r - l == 2:
-        sort_rec(p, l, r, compare)
-        guiprim.dist2(p[l], p[l+1])
-        update_points(p[l], p[l+1])
-        return p[l], p[l+1]
-    if r - l == 3:
-        sort_rec(p, l, r, compare)
-        d1 = guiprim.dist2(p[l], p[l+1])
-        d2 = guiprim.dist2(p[l], p[l+2])
-        d3 = guiprim.dist2(p[l+1], p[l+2])
-        if (d1 <= d2 and d1 <= d3): 
-            update_points(p[l], p[l+1])
-            return p[l], p[l+1]
-        if (d2 <= d1 and d2 <= d3):
-            update_points(p[l], p[l+2])
-            return p[l], p[l+2]
-        if (d3 <= d1 and d3 <= d2):
-            update_points(p[l+1], p[l+2])
-            return p[l+1], p[l+2]
+    if r - l <= 3:
+        # insercao por y
+        for k in range(l + 1, r):
+            i = v[k]
+            j = k
+            while j > l and y[v[j-1]] > y[i]:
+                v[j] = v[j-1]
+                j -= 1
+            v[j] = i
+        pair = None
+        for i in range(l, r):
+            for j in range(i + 1, r):
+                d = dist2(x, y, v[i], v[j])
+                if pair is None or d < pair[0]:
+                    pair = d, v[i], v[j]
+        update_points(*pair)
+        return pair
     # 4 points or more
     q = (l+r)//2
-    pm = p[q] #median point
-    p1, p2 = divide_rec(p, l, q, compare)
-    de = prim.dist2(p1, p2)
-    p3, p4 = divide_rec(p, q, r, compare)
-    dr = prim.dist2(p3, p4)
-    p1, p2 = (p1, p2) if (de <= dr) else (p3, p4)
-    update_points(p1, p2)
-    merge(p, l, q, r, compare)
-    return combine(p, l, r, p1, p2, pm)
+    xm = x[v[q]] #median point
+    left = divide_rec(x, y, v, buf, l, q)
+    right = divide_rec(x, y, v, buf, q, r)
+    pair = left if (left[0] <= right[0]) else right
+    update_points(*pair)
+    merge(y, v, buf, l, q, r)
+    return combine(x, y, v, buf, l, r, pair, xm)
 
 def Divide (p):
-    global a, b, id, hia, hib
-    a, b, id, hia, hib = None, None, None, None, None
-    sort(p, compareX)
+    global points, best, a, b, id, hia, hib
+    best, a, b, id, hia, hib = float('inf'), None, None, None, None, None
     n = len(p)
-    if n == 1: return
-    p1, p2 = divide_rec(p, 0, n, compareY)
+    if n < 2: return
+    x, y = coordinates(p)
+    # indices em ordem de x (e de y, no empate)
+    v = np.lexsort((y, x)).tolist()
+    x, y = x.tolist(), y.tolist()
+    buf = [0] * n
+    if not control.headless:
+        p = point_list(p)
+        points = p
+    try:
+        d, i, j = divide_rec(x, y, v, buf, 0, n)
+    finally:
+        points = None
+    p1, p2 = p[i], p[j]
     p1.hilight()
     p2.hilight()
-    return p1, p2
+    ret = Segment(p1, p2)
+    ret.extra_info = 'distancia: %.2f' % math.sqrt(d)
+    if config.VERBOSE:
+        print(math.sqrt(d))
+    return ret
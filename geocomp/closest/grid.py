@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""Algoritmo aleatorizado com grade (Rabin / Khuller-Matias)
+
+O crivo de Khuller e Matias escolhe um ponto x ao acaso, calcula a
+distancia d de x ao ponto mais proximo dele, e joga fora todo ponto
+isolado numa grade de lado d/3 (nenhum outro ponto na sua celula nem
+nas 8 vizinhas). Todo ponto cujo vizinho mais proximo esta a distancia
+>= d e' descartado, e o proprio x sempre e', entao em media metade dos
+pontos some a cada rodada. Quando nao sobra ninguem, a ultima d e' uma
+cota superior para a menor distancia, e o par mais proximo esta em
+celulas vizinhas de uma grade de lado d, que tem O(1) pontos por celula.
+
+Cada rodada e a busca final sao feitas sobre arrays do NumPy. Os pares
+(ix, iy) das celulas vao para uma tabela de hashing (CellTable), montada
+e consultada com operacoes vetorizadas: cada celula ocupada ganha um
+indice limitado pelo tamanho da tabela (O(n)), e a partir dai as
+contagens e os baldes saem de um bincount e de um counting sort sobre
+esses indices. Nada e' ordenado: o tempo esperado de cada rodada e'
+O(n), qualquer que seja o numero de celulas da grade.
+
+A escolha aleatoria do crivo usa a semente seed de Grid ou, se ela nao
+for dada, config.SEED (None: uma semente diferente a cada execucao).
+"""
+
+import math
+import numpy as np
+
+from geocomp import config
+from geocomp.common.segment import Segment
+from geocomp.common.pointset import coordinates
+from geocomp.common import prim
+
+# maior indice de celula num eixo: ate' ai, o floor em ponto flutuante
+# e' um inteiro exato
+MAX_INDEX = 2 ** 52
+
+# vizinhanca 3 x 3 de uma celula, como deslocamentos (dx, dy)
+NEIGHBORS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+# metade da vizinhanca (sem a propria celula): cada par de celulas
+# vizinhas distintas e' visitado uma unica vez
+HALF_NEIGHBORS = [(1, -1), (1, 0), (1, 1), (0, 1)]
+
+# constantes do hashing multiplicativo (a primeira e' a parte fracionaria
+# da razao aurea; a segunda mistura iy antes de combina-lo com ix)
+HASH_MULT = np.uint64 (0x9E3779B97F4A7C15)
+HASH_MIX = np.uint64 (0xC2B2AE3D27D4EB4F)
+
+
+def cell_index (x, y, size):
+    """Celula (ix, iy) de cada ponto numa grade de lado size
+
+    Devolve (ix, iy, side). Os indices comecam em 1, para que as celulas
+    vizinhas tambem tenham indices >= 0. side e' o lado usado: size, ou
+    um lado maior, se com size algum indice passaria de MAX_INDEX (os
+    pontos se espalham por mais de 2^52 celulas num eixo)."""
+    x0 = x.min ()
+    y0 = y.min ()
+    side = max (size, (x.max () - x0) / MAX_INDEX, (y.max () - y0) / MAX_INDEX)
+    ix = np.floor ((x - x0) / side).astype (np.int64) + 1
+    iy = np.floor ((y - y0) / side).astype (np.int64) + 1
+    return ix, iy, side
+
+class CellTable:
+    """Tabela de hashing (enderecamento aberto, sondagem linear) com as
+    celulas (ix, iy) de cell_index
+
+    A chave e' o par: o hash mistura os dois int64, e a tabela guarda ix
+    e iy em dois arrays. A tabela tem size >= 4 len(ix) posicoes;
+    slots[i] e' a posicao da celula (ix[i], iy[i]), e counts[s] o numero
+    de pontos na posicao s (com uma posicao extra, size, sempre vazia).
+    As insercoes e as buscas sao feitas para todas as chaves de uma vez:
+    a cada passo, as chaves que ainda nao acharam a sua posicao avancam
+    uma posicao, e o numero esperado de passos por chave e' O(1)."""
+
+    def __init__ (self, ix, iy):
+        bits = max (len (ix).bit_length () + 2, 4)
+        self.size = 1 << bits
+        self.shift = np.uint64 (64 - bits)
+        # indices sao >= 0; -1 marca uma posicao vazia
+        self.tx = np.full (self.size, -1, dtype = np.int64)
+        self.ty = np.full (self.size, -1, dtype = np.int64)
+        self.slots = self._insert (ix, iy)
+        self.counts = np.bincount (self.slots, minlength = self.size + 1)
+
+    def _hash (self, ix, iy):
+        h = ix.astype (np.uint64) * HASH_MULT
+        h ^= iy.astype (np.uint64) * HASH_MIX
+        h ^= h >> np.uint64 (29)
+        h *= HASH_MULT
+        return (h >> self.shift).astype (np.int64)
+
+    def _insert (self, ix, iy):
+        tx, ty = self.tx, self.ty
+        mask = self.size - 1
+        slot = self._hash (ix, iy)
+        # das chaves que disputam uma posicao livre, uma fica com ela (a
+        #   mesma nos dois arrays: a ultima escrita de cada posicao)
+        tx[slot] = ix
+        ty[slot] = iy
+        todo = np.flatnonzero ((tx[slot] != ix) | (ty[slot] != iy))
+        while len (todo):
+            s = (slot[todo] + 1) & mask
+            slot[todo] = s
+            kx = ix[todo]
+            ky = iy[todo]
+            free = tx[s] == -1
+            tx[s[free]] = kx[free]
+            ty[s[free]] = ky[free]
+            todo = todo[(tx[s] != kx) | (ty[s] != ky)]
+        return slot
+
+    def find (self, ix, iy):
+        "Posicao de cada celula (ix, iy) na tabela (size, se nao estiver)"
+        tx, ty = self.tx, self.ty
+        mask = self.size - 1
+        slot = self._hash (ix, iy)
+        t = tx[slot]
+        empty = t == -1
+        todo = np.flatnonzero (((t != ix) | (ty[slot] != iy)) & ~empty)
+        slot[empty] = self.size
+        while len (todo):
+            s = (slot[todo] + 1) & mask
+            slot[todo] = s
+            t = tx[s]
+            missing = t == -1
+            slot[todo[missing]] = self.size
+            todo = todo[((t != ix[todo]) | (ty[s] != iy[todo])) & ~missing]
+        return slot
+
+    def buckets (self):
+        """Counting sort das chaves pela posicao na tabela
+
+        Devolve (order, start): os indices das chaves da posicao s sao
+        order[start[s]:start[s] + counts[s]]."""
+        slots = self.slots
+        start = np.cumsum (self.counts) - self.counts
+        order = np.empty (len (slots), dtype = np.int64)
+        # as chaves sozinhas na sua posicao vao direto para o lugar
+        alone = self.counts[slots] == 1
+        order[start[slots[alone]]] = np.flatnonzero (alone)
+        todo = np.flatnonzero (~alone)
+        fill = start.copy ()
+        claim = np.empty (self.size, dtype = np.int64)
+        # a cada passo, cada posicao recebe uma das chaves que faltam
+        while len (todo):
+            s = slots[todo]
+            claim[s] = todo
+            won = claim[s] == todo
+            w = s[won]
+            pos = fill[w]
+            order[pos] = todo[won]
+            fill[w] = pos + 1
+            todo = todo[~won]
+        return order, start
+
+def sieve (x, y, rng):
+    """Crivo de Khuller-Matias
+
+    Devolve (d2, i, j): i e j sao os pontos que definiram a ultima
+    distancia d (d2 = d * d) do crivo, uma cota superior para a menor
+    distancia entre dois pontos."""
+    alive = np.arange (len (x))
+    best = None
+    while len (alive) > 1:
+        k = rng.integers (len (alive))
+        i = alive[k]
+        dx = x[alive] - x[i]
+        dy = y[alive] - y[i]
+        d2 = dx * dx + dy * dy
+        prim.add_count ('dist2', len (alive) - 1)
+        d2[k] = np.inf
+        m = int (d2.argmin ())
+        best = (float (d2[m]), int (i), int (alive[m]))
+        if best[0] == 0:
+            break
+
+        size = math.sqrt (best[0]) / 3
+        ix, iy, side = cell_index (x[alive], y[alive], size)
+        if side > size:
+            # grade fina demais para indices exatos: d ja' e' uma cota
+            break
+        cells = CellTable (ix, iy)
+        neighbors = cells.counts[cells.slots]
+        for dx, dy in NEIGHBORS:
+            if dx or dy:
+                neighbors += cells.counts[cells.find (ix + dx, iy + dy)]
+        alive = alive[neighbors > 1]
+    return best
+
+def closest_in_grid (x, y, best):
+    """Par mais proximo, dado um par (d2, i, j) cuja distancia e' uma cota
+    superior para a distancia minima
+
+    Compara cada ponto so com os pontos da sua celula e das celulas
+    vizinhas numa grade de lado sqrt(d2) (ou maior, veja cell_index)."""
+    ix, iy, side = cell_index (x, y, math.sqrt (best[0]))
+    cells = CellTable (ix, iy)
+    order, start = cells.buckets ()
+    sorted_slots = cells.slots[order]
+
+    def check (a, b, best):
+        if len (a) == 0:
+            return best
+        dx = x[a] - x[b]
+        dy = y[a] - y[b]
+        d2 = dx * dx + dy * dy
+        prim.add_count ('dist2', len (a))
+        m = int (d2.argmin ())
+        if d2[m] < best[0]:
+            return (float (d2[m]), int (a[m]), int (b[m]))
+        return best
+
+    # pares dentro da mesma celula: posicoes p e p + t dos baldes
+    t = 1
+    while t < len (order):
+        same = sorted_slots[:-t] == sorted_slots[t:]
+        if not same.any ():
+            break
+        best = check (order[:-t][same], order[t:][same], best)
+        t += 1
+
+    # pares em celulas vizinhas: o t-esimo ponto do balde da vizinha
+    lo = start[:-1]
+    for dx, dy in HALF_NEIGHBORS:
+        s = cells.find (ix + dx, iy + dy)
+        first = lo[np.minimum (s, cells.size - 1)]
+        count = cells.counts[s]
+        t = 0
+        while True:
+            has = count > t
+            if not has.any ():
+                break
+            best = check (np.flatnonzero (has), order[first[has] + t], best)
+            t += 1
+    return best
+
+def Grid (l, seed = None):
+    """Algoritmo aleatorizado com grade para encontrar o par de pontos mais proximo
+
+    seed e' a semente do crivo (config.SEED, se nao for dada)."""
+
+    if len (l) < 2: return None
+
+    if seed is None: seed = config.SEED
+    x, y = coordinates (l)
+    best = sieve (x, y, np.random.default_rng (seed))
+    if best[0] > 0:
+        best = closest_in_grid (x, y, best)
+
+    d2, i, j = best
+    a = l[i]
+    b = l[j]
+    a.hilight ()
+    b.hilight ()
+    a.lineto (b)
+    ret = Segment (a, b)
+    ret.extra_info = 'distancia: %.2f'%math.sqrt (d2)
+    return ret
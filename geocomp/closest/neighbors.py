@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Vizinho mais proximo de todos os pontos (all nearest neighbors)
+
+Para cada ponto, o ponto mais proximo dele entre os outros. all_nearest
+monta uma arvore k-d (geocomp.common.kdtree) com os pontos e consulta
+cada um deles nela: O(n log n) no total. k_nearest faz o mesmo para os
+k vizinhos mais proximos. all_nearest_brute e' a versao O(n^2), que
+compara cada ponto com todos os outros; serve de referencia para
+utils/bench_neighbors.py.
+
+Pontos repetidos sao vizinhos uns dos outros (a distancia 0), e, se
+varios pontos estao a mesma distancia, qualquer um deles pode ser o
+vizinho devolvido.
+"""
+
+import numpy as np
+
+from geocomp.common.kdtree import KDTree
+from geocomp.common.pointset import point_list, coordinates
+from geocomp.common import prim
+from geocomp.common import control
+from geocomp import config
+
+
+def all_nearest (l):
+    """Array nn de indices: nn[i] e' o vizinho mais proximo de l[i] (-1
+    se l tem menos de dois pontos)"""
+    return KDTree (l).all_nearest ()[0]
+
+def k_nearest (l, k):
+    """Array n x k de indices: a linha i tem os k vizinhos mais proximos
+    de l[i], do mais proximo ao mais distante (completada com -1 se l tem
+    k pontos ou menos)"""
+    return KDTree (l).all_k_nearest (k)
+
+def all_nearest_brute (l):
+    "O mesmo que all_nearest, comparando cada ponto com todos os outros"
+    x, y = coordinates (l)
+    n = len (x)
+    nn = np.full (n, -1, dtype=np.int64)
+    for i in range (n if n > 1 else 0):
+        dx = x - x[i]
+        dy = y - y[i]
+        d2 = dx * dx + dy * dy
+        d2[i] = np.inf
+        nn[i] = d2.argmin ()
+    prim.add_count ('dist2', n * (n - 1))
+    return nn
+
+def AllNearest (l):
+    """Vizinho mais proximo de cada ponto
+
+    Desenha um segmento de cada ponto ate o seu vizinho e devolve o
+    array de indices de all_nearest."""
+    nn = all_nearest (l)
+    if len (nn) > 0 and nn[0] >= 0:
+        l = point_list (l)
+        control.freeze_update ()
+        for i, j in enumerate (nn.tolist ()):
+            l[i].lineto (l[j], config.COLOR_ALT1)
+        control.thaw_update ()
+    return nn
@@ -5,10 +5,16 @@ Sub-modulos:
 - control:    funcoes para que um algoritmo controle sua saida grafica
 - guicontrol: funcoes para que um front-end controle a saida grafica
 - io:         funcoes para leitura de arquivos de dados
+- binary:     formato binario (mapeado na memoria) para os arquivos de dados
+- cache:      cache em disco dos arquivos de dados ja lidos
+- registry:   registro dos algoritmos, importados so quando usados
 
 - prim:       primitivas geometricas (left, area2,...)
 - guiprim:    as mesmas primitivas do modulo prim, mas desenhando na tela
 
+- kdtree:     arvore k-d para buscas de proximidade (vizinho mais proximo,
+              k vizinhos, raio e retangulo)
+
 - point:      classe que define um ponto
 - polygon:    classe que define um poligono
 - segment:    classe que define um segmento de reta
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""Formato binario para os arquivos de dados
+
+Um arquivo binario tem um cabecalho e secoes tipadas, cada uma um array
+little-endian alinhado em 64 bytes:
+
+    cabecalho:  MAGIC (8 bytes), versao (uint32), numero de secoes (uint32)
+    tabela:     para cada secao, tag (4 bytes), dtype (4 bytes, ex. '<f8'),
+                numero de linhas (uint64) e posicao no arquivo (uint64)
+
+As secoes sao (todas opcionais):
+
+    PTSX, PTSY  coordenadas x e y dos pontos (em colunas, como num PointSet)
+    SEGS        segmentos, n x 4 (x0, y0, x1, y1)
+    DSCS        discos, n x 3 (x, y, r)
+    POFF, PVTX  poligonos: os vertices do i-esimo sao PVTX[POFF[i]:POFF[i+1]]
+    ORDR        tipo de cada registro na ordem do arquivo de texto (indice
+                em io.KINDS), so quando ha mais de um tipo
+
+load mapeia o arquivo na memoria (mmap) e devolve visoes dos arrays sem
+copiar nada: carregar um arquivo de qualquer tamanho custa so a leitura
+do cabecalho, e processos diferentes que abrem o mesmo arquivo
+compartilham as paginas.
+"""
+
+import struct
+
+import numpy as np
+
+from geocomp.common import io
+from geocomp.common.point import Point
+from geocomp.common.segment import Segment
+from geocomp.common.polygon import Polygon
+from geocomp.common.disc import Disc
+from geocomp.common.pointset import PointSet
+
+MAGIC = b'GEOCOMPB'
+VERSION = 1
+
+HEADER = struct.Struct('<8sII')
+ENTRY = struct.Struct('<4s4sQQ')
+ALIGN = 64
+
+# tag -> (dtype, colunas)
+SECTIONS = {
+    b'PTSX': ('<f8', 1),
+    b'PTSY': ('<f8', 1),
+    b'SEGS': ('<f8', 4),
+    b'DSCS': ('<f8', 3),
+    b'POFF': ('<i8', 1),
+    b'PVTX': ('<f8', 2),
+    b'ORDR': ('u1', 1),
+}
+
+
+def is_binary(filename):
+    "Verdadeiro se filename comeca com MAGIC"
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write_arrays(filename, points=None, segments=None, discs=None,
+                 polygon_offsets=None, polygon_vertices=None, order=None):
+    """Grava um arquivo binario a partir de arrays
+
+    points e' um PointSet ou um array n x 2; segments, discs e
+    polygon_vertices sao arrays n x 4, n x 3 e n x 2; polygon_offsets tem
+    um elemento a mais que o numero de poligonos; order e' a secao ORDR."""
+    sections = []
+    if points is not None:
+        if not isinstance(points, PointSet):
+            points = PointSet.from_array(points)
+        sections.append((b'PTSX', points.x))
+        sections.append((b'PTSY', points.y))
+    if segments is not None:
+        sections.append((b'SEGS', segments))
+    if discs is not None:
+        sections.append((b'DSCS', discs))
+    if polygon_offsets is not None:
+        sections.append((b'POFF', polygon_offsets))
+        sections.append((b'PVTX', polygon_vertices))
+    if order is not None:
+        sections.append((b'ORDR', order))
+
+    arrays = []
+    offset = HEADER.size + ENTRY.size * len(sections)
+    table = []
+    for tag, data in sections:
+        dtype, columns = SECTIONS[tag]
+        data = np.ascontiguousarray(data, dtype=dtype)
+        if columns > 1:
+            data = data.reshape(-1, columns)
+        offset = -(-offset // ALIGN) * ALIGN
+        table.append(ENTRY.pack(tag, dtype.encode().ljust(4, b'\0'),
+                                len(data), offset))
+        arrays.append((offset, data))
+        offset += data.nbytes
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(sections)))
+        for entry in table:
+            file.write(entry)
+        for offset, data in arrays:
+            file.write(b'\0' * (offset - file.tell()))
+            file.write(data.tobytes())
+
+
+def write(filename, data):
+    """Grava um arquivo binario com os primitivos de data (uma lista de
+    Point, Segment, Polygon e Disc, como a devolvida por io.read)"""
+    _write_blocks(filename, _object_blocks(data))
+
+
+def convert(textname, filename):
+    """Converte o arquivo de texto textname (no formato de io.read) para
+    o arquivo binario filename
+
+    O texto e' lido em pedacos pelo mesmo leitor em bloco de io.read
+    (io._iter_blocks): cada trecho sem marcadores vira um array de uma
+    vez, com numpy.loadtxt, sem criar nenhum objeto por ponto."""
+    _write_blocks(filename, io._iter_blocks(textname))
+
+
+def _object_blocks(data):
+    "Blocos (tipo, array) dos objetos de data, como os de io._iter_blocks"
+    kind, rows = None, []
+    for d in data:
+        if isinstance(d, Point):
+            k, row = 'point', [d.x, d.y]
+        elif isinstance(d, Segment):
+            k, row = 'segment', [d.init.x, d.init.y, d.to.x, d.to.y]
+        elif isinstance(d, Disc):
+            k, row = 'disc', [d.center.x, d.center.y, d.r]
+        elif isinstance(d, Polygon):
+            k, row = 'polygon', None
+        else:
+            raise ValueError("Cannot write {} to a binary file".format(type(d)))
+        if k != kind and rows:
+            yield kind, np.array(rows, dtype=np.float64)
+            rows = []
+        kind = k
+        if row is not None:
+            rows.append(row)
+        else:
+            yield 'polygon', np.array([(p.x, p.y) for p in d.vertices()],
+                                      dtype=np.float64).reshape(-1, 2)
+    if rows:
+        yield kind, np.array(rows, dtype=np.float64)
+
+
+def _write_blocks(filename, blocks):
+    """Grava os blocos (tipo, array) de blocks, na ordem: uma sequencia
+    de pontos, segmentos ou discos, ou os vertices de um poligono"""
+    kinds = io.KINDS
+    arrays = {kind: [] for kind in kinds}
+    offsets = [0]
+    order = []
+    for kind, block in blocks:
+        arrays[kind].append(block)
+        if kind == 'polygon':
+            offsets.append(offsets[-1] + len(block))
+            order.append(np.full(1, kinds.index(kind), dtype=np.uint8))
+        elif len(block):
+            order.append(np.full(len(block), kinds.index(kind), dtype=np.uint8))
+
+    def section(kind):
+        if not arrays[kind]:
+            return None
+        return np.concatenate(arrays[kind])
+
+    polygon_offsets = None
+    if len(offsets) > 1:
+        polygon_offsets = np.array(offsets, dtype=np.int64)
+    kind_order = None
+    if order:
+        kind_order = np.concatenate(order)
+        if (kind_order == kind_order[0]).all():
+            kind_order = None
+    write_arrays(filename,
+                 points=section('point'),
+                 segments=section('segment'),
+                 discs=section('disc'),
+                 polygon_offsets=polygon_offsets,
+                 polygon_vertices=section('polygon'),
+                 order=kind_order)
+
+
+class GeometryFile:
+    """Arquivo binario mapeado na memoria
+
+    Os atributos points (um PointSet), segments, discs, polygon_offsets,
+    polygon_vertices e order sao visoes (somente leitura) do arquivo, ou
+    None se a secao nao existe."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.buffer = np.memmap(filename, dtype=np.uint8, mode='r')
+        magic, version, nsections = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a binary geocomp file: {}".format(filename))
+        if version != VERSION:
+            raise ValueError("Unsupported binary file version: {}".format(version))
+
+        sections = {}
+        for i in range(nsections):
+            tag, dtype, count, offset = \
+                ENTRY.unpack_from(self.buffer, HEADER.size + i * ENTRY.size)
+            dtype = dtype.rstrip(b'\0').decode()
+            columns = SECTIONS[tag][1] if tag in SECTIONS else 1
+            data = np.frombuffer(self.buffer, dtype=dtype,
+                                 count=count * columns, offset=offset)
+            sections[tag] = data.reshape(-1, columns) if columns > 1 else data
+
+        self.points = None
+        if b'PTSX' in sections:
+            self.points = PointSet(sections[b'PTSX'], sections[b'PTSY'])
+        self.segments = sections.get(b'SEGS')
+        self.discs = sections.get(b'DSCS')
+        self.polygon_offsets = sections.get(b'POFF')
+        self.polygon_vertices = sections.get(b'PVTX')
+        self.order = sections.get(b'ORDR')
+
+    def __len__(self):
+        "Numero de registros"
+        if self.order is not None:
+            return len(self.order)
+        n = 0
+        if self.points is not None: n += len(self.points)
+        if self.segments is not None: n += len(self.segments)
+        if self.discs is not None: n += len(self.discs)
+        if self.polygon_offsets is not None: n += len(self.polygon_offsets) - 1
+        return n
+
+    def polygon(self, i):
+        "Vertices do i-esimo poligono (um array n x 2)"
+        return self.polygon_vertices[self.polygon_offsets[i]:self.polygon_offsets[i + 1]]
+
+    def objects(self):
+        """Lista de objetos (Point, Segment, Polygon, Disc) na ordem do
+        arquivo de texto original, como a devolvida por io.read"""
+        def points():
+            for x, y in zip(self.points.x.tolist(), self.points.y.tolist()):
+                yield Point(x, y)
+
+        def segments():
+            for x0, y0, x1, y1 in self.segments.tolist():
+                yield Segment(Point(x0, y0), Point(x1, y1))
+
+        def polygons():
+            for i in range(len(self.polygon_offsets) - 1):
+                yield Polygon([Point(x, y) for x, y in self.polygon(i).tolist()])
+
+        def discs():
+            for x, y, r in self.discs.tolist():
+                yield Disc(x, y, r)
+
+        iters = [points() if self.points is not None else iter(()),
+                 segments() if self.segments is not None else iter(()),
+                 polygons() if self.polygon_offsets is not None else iter(()),
+                 discs() if self.discs is not None else iter(())]
+        if self.order is None:
+            return [d for it in iters for d in it]
+        return [next(iters[k]) for k in self.order.tolist()]
+
+
+def load(filename):
+    "Mapeia o arquivo binario filename na memoria (veja GeometryFile)"
+    return GeometryFile(filename)
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) != 3:
+        print(sys.argv[0], '<arquivo de texto> <arquivo binario>')
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""Cache em disco dos arquivos de entrada ja lidos
+
+read le um arquivo como io.read e, se config.CACHE estiver ligado
+(cligeocomp.py -c; por padrao esta desligado), guarda o resultado no
+formato de geocomp.common.binary em config.CACHEDIR, com o nome dado pelo hash do
+conteudo do arquivo. Na proxima leitura de um arquivo com o mesmo
+conteudo (ou do mesmo arquivo, se o mtime e o tamanho nao mudaram, e
+entao nem o hash e' recalculado) o texto nao e' analisado de novo.
+
+O mtime e o tamanho sao a chave rapida: o arquivo so e' lido para o hash
+(BLAKE2) quando o caminho e' novo ou quando um dos dois mudou. Isso le o
+arquivo inteiro uma vez a mais, mas custa bem menos que analisar o
+texto, o que nesse caso e' feito de qualquer jeito se o conteudo for
+novo (50 MB: 0.2 s de hash contra 4.5 s de io.read); em troca, uma copia
+de um arquivo ja lido, ou um arquivo so tocado, usa a mesma entrada.
+
+Com arrays=True, um arquivo so de pontos e' devolvido como o PointSet
+mapeado (somente leitura) da entrada do cache: nenhum Point e' criado.
+
+O cache e' limitado a config.CACHE_SIZE bytes: quando passa disso, as
+entradas usadas ha mais tempo sao apagadas (e saem do indice). clear apaga o cache todo
+(ou so as entradas de alguns arquivos); pela linha de comando:
+
+    cligeocomp.py --clear-cache [arquivo]...
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+from geocomp import config
+from geocomp.common import io
+from geocomp.common import binary
+
+# extensao das entradas do cache
+EXT = '.gcb'
+
+# arquivo com o hash, o mtime e o tamanho de cada arquivo ja lido
+INDEX = 'index.json'
+
+
+def read(filename, arrays=False):
+    """Le filename (como io.read), usando o cache se config.CACHE
+
+    Se arrays for verdadeiro e o arquivo so tiver pontos, devolve o
+    PointSet do arquivo binario mapeado na memoria no lugar da lista de
+    Points (para os algoritmos que aceitam um PointSet). Se o diretorio
+    do cache nao puder ser usado, le o arquivo diretamente."""
+    if binary.is_binary(filename):
+        return _data(binary.load(filename), arrays)
+    if not config.CACHE:
+        return io.read(filename)
+    try:
+        entry = _entry(filename)
+    except OSError:
+        return io.read(filename)
+
+    if os.path.exists(entry):
+        try:
+            data = _data(binary.load(entry), arrays)
+        except (OSError, ValueError):
+            data = None
+        if data is not None:
+            _touch(entry)
+            return data
+
+    tmp = None
+    try:
+        tmp = _temporary()
+        binary.convert(filename, tmp)
+        os.replace(tmp, entry)
+        data = _data(binary.load(entry), arrays)
+    except (OSError, ValueError):
+        _discard(tmp)
+        return io.read(filename)
+    _evict(config.CACHE_SIZE)
+    return data
+
+
+def _data(geometry, arrays):
+    "O conteudo do GeometryFile geometry, como read devolve"
+    if arrays and geometry.points is not None and len(geometry.points) == len(geometry):
+        return geometry.points
+    return geometry.objects()
+
+
+def clear(filenames=None):
+    """Apaga as entradas do cache dos arquivos filenames, ou todas se
+    filenames e' None. Devolve o numero de entradas apagadas."""
+    index = _load_index()
+    if filenames is None:
+        hashes = None
+    else:
+        hashes = set()
+        for filename in filenames:
+            path = os.path.abspath(filename)
+            if path in index:
+                hashes.add(index[path][2])
+            elif os.path.exists(filename):
+                hashes.add(_hash(filename))
+
+    removed = 0
+    for name in _entries():
+        if hashes is None or name[:-len(EXT)] in hashes:
+            if _remove(name):
+                removed += 1
+    if hashes is None:
+        index = {}
+    else:
+        index = {p: v for p, v in index.items() if v[2] not in hashes}
+    _save_index(index)
+    return removed
+
+
+def _hash(filename):
+    """Hash do conteudo de filename (e da versao do formato binario)
+
+    Le o arquivo inteiro: so e' chamado quando o indice nao tem o mtime
+    e o tamanho atuais do arquivo (veja _entry)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b'%d\0' % binary.VERSION)
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _entry(filename):
+    """Caminho da entrada do cache de filename
+
+    O hash so e' recalculado se o mtime ou o tamanho do arquivo mudaram
+    desde a ultima leitura."""
+    os.makedirs(config.CACHEDIR, exist_ok=True)
+    st = os.stat(filename)
+    path = os.path.abspath(filename)
+    index = _load_index()
+    known = index.get(path)
+    if known is not None and known[:2] == [st.st_mtime_ns, st.st_size]:
+        key = known[2]
+    else:
+        key = _hash(filename)
+        index[path] = [st.st_mtime_ns, st.st_size, key]
+        _save_index(index)
+    return os.path.join(config.CACHEDIR, key + EXT)
+
+
+def _load_index():
+    try:
+        with open(os.path.join(config.CACHEDIR, INDEX)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index):
+    # varios processos (cligeocomp -j) podem gravar o indice ao mesmo
+    # tempo: no pior caso, uma atualizacao se perde e o hash e'
+    # recalculado na proxima leitura
+    name = os.path.join(config.CACHEDIR, INDEX)
+    tmp = None
+    try:
+        tmp = _temporary()
+        with open(tmp, 'w') as file:
+            json.dump(index, file)
+        os.replace(tmp, name)
+    except OSError:
+        _discard(tmp)
+
+
+def _temporary():
+    """Cria um arquivo temporario vazio em CACHEDIR (no mesmo sistema de
+    arquivos, para o os.replace) e devolve o seu nome"""
+    fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=config.CACHEDIR)
+    os.close(fd)
+    return tmp
+
+
+def _discard(tmp):
+    if tmp is not None:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _entries():
+    try:
+        return [name for name in os.listdir(config.CACHEDIR)
+                if name.endswith(EXT)]
+    except OSError:
+        return []
+
+
+def _touch(entry):
+    "Marca entry como usada agora (o LRU usa o mtime das entradas)"
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+
+def _remove(name):
+    try:
+        os.remove(os.path.join(config.CACHEDIR, name))
+        return True
+    except OSError:
+        return False
+
+
+def _evict(size):
+    """Apaga as entradas usadas ha mais tempo ate o cache ter no maximo
+    size bytes, e tira do indice os arquivos dessas entradas"""
+    entries = []
+    total = 0
+    for name in _entries():
+        try:
+            st = os.stat(os.path.join(config.CACHEDIR, name))
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, name))
+        total += st.st_size
+    entries.sort()
+    removed = set()
+    for mtime, entry_size, name in entries:
+        if total <= size:
+            break
+        if _remove(name):
+            total -= entry_size
+            removed.add(name[:-len(EXT)])
+    if removed:
+        index = _load_index()
+        _save_index({p: v for p, v in index.items() if v[2] not in removed})
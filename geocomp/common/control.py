@@ -120,6 +120,22 @@ def plot_parabola(y,px,py,startx,endx,steps=50,color=config.COLOR_ALT2,linewidth
 	update ()
 	return plot_id
 
+def plot_points (x, y, color=config.COLOR_POINT, r=config.RADIUS):
+	"""desenha de uma vez os pontos (x[i], y[i]) como discos de raio r
+
+	Se o toolkit sabe desenhar um conjunto de pontos (gui.plot_points),
+	devolve o id do desenho; senao, desenha um disco por ponto e devolve
+	0 (os pontos nao podem ser apagados um a um)"""
+	if skip: return 0
+	if hasattr (gui, 'plot_points'):
+		plot_id = gui.plot_points (x, y, color, r)
+	else:
+		plot_id = 0
+		for i in range (len (x)):
+			gui.plot_disc (x[i], y[i], color, r)
+	update ()
+	return plot_id
+
 def plot_delete (id):
 	"""apaga da tela o elemento com identificador id"""
 	if skip: return 0
@@ -180,3 +196,35 @@ def plot_horiz_ray (x0, y0, increasing = True, color=config.COLOR_LINE, linewidt
 	update ()
 	return plot_id
 ########################################################
+
+
+################### MODO SEM INTERFACE GRAFICA ####################
+
+headless = 0
+
+# funcoes de desenho trocadas por set_headless
+_drawing = ('freeze_update', 'thaw_update', 'update', 'freeze_sleep',
+	'thaw_sleep', 'sleep', 'plot_disc', 'plot_segment', 'plot_ray',
+	'plot_line', 'plot_vert_line', 'plot_horiz_line', 'plot_parabola',
+	'plot_points', 'plot_delete', 'plot_curve', 'plot_circle', 'plot_disc_grande',
+	'plot_vert_ray', 'plot_horiz_ray')
+_drawn = {}
+
+def _nothing (*args, **kwargs):
+	return 0
+
+def set_headless (on):
+	"""Liga ou desliga o modo sem interface grafica
+
+	Ligado, as funcoes de desenho (plot_*, update, sleep, ...) viram
+	funcoes vazias, sem nem o teste de skip. Modulos que usam este modulo
+	devem acessar as funcoes como control.plot_disc (e nao importar o
+	nome), para enxergar a troca."""
+	global headless
+	if not _drawn:
+		_drawn.update ({ name: globals ()[name] for name in _drawing })
+	headless = bool (on)
+	if headless:
+		globals ().update ({ name: _nothing for name in _drawing })
+	else:
+		globals ().update (_drawn)
@@ -5,21 +5,44 @@
 skip = 0
 gui = None
 
+import time
+import tracemalloc
+
 from . import prim
 from . import control
+from . import guiprim
+from . import point
+from . import segment
+from geocomp import config
 
 from geocomp.common.point   import Point
+from geocomp.common.pointset import PointSet
 from geocomp.common.polygon import Polygon
 from geocomp.common.segment import Segment
 from geocomp.common.disc import Disc
 
 
 def init_display (toolkit, master):
-    "Inicializa o toolkit (Tk, GNOME,...) especificado"
+    """Inicializa o toolkit (Tk, GNOME,...) especificado
+
+    Se o toolkit nao desenha nada (toolkit.HEADLESS, como o dummy), liga
+    o modo sem interface grafica (veja set_headless)."""
     global gui
     gui = toolkit
     gui.init_display (master)
     control.set_gui (gui)
+    set_headless (getattr (toolkit, 'HEADLESS', False))
+
+def set_headless (on):
+    """Liga ou desliga o modo sem interface grafica
+
+    Nele, as funcoes de desenho de control, as primitivas de guiprim e os
+    metodos de desenho de Point e Segment viram funcoes vazias (ou so fazem a
+    conta), e os algoritmos rodam sem nenhum custo de visualizacao."""
+    control.set_headless (on)
+    guiprim.set_headless (on)
+    point.set_headless (on)
+    segment.set_headless (on)
 
 def hide_all ():
     """Impede que mudancas sejas desenhadas, e passa a ignorar ordens para dormir
@@ -47,13 +70,19 @@ def plot_input(input):
     if len(input) == 0:
         return
 
+    if isinstance(input, PointSet):
+        minx, maxx = float(input.x.min()), float(input.x.max())
+        miny, maxy = float(input.y.min()), float(input.y.max())
+        _config_and_plot(input, minx, maxx, miny, maxy)
+        return
+
     points = []
     for i in input:
         if type(i) is Polygon:
             points += i.vertices()
         elif type(i) is Segment:
             points += i.endpoints()
-        elif type(i) is Point:
+        elif isinstance(i, Point):
             points.append(i)
         elif type(i) is Disc:
             points.extend(i.extremes())
@@ -77,6 +106,11 @@ def plot_input(input):
         if i.y > maxy:
             maxy = i.y
 
+    _config_and_plot(input, minx, maxx, miny, maxy)
+
+
+def _config_and_plot(input, minx, maxx, miny, maxy):
+    "Configura o canvas para a regiao dada e desenha a entrada"
     if minx == maxx:
         if minx == 0:
             minx = -1
@@ -96,19 +130,105 @@ def plot_input(input):
     control.freeze_update()
     gui.config_canvas(minx, maxx, miny, maxy)
 
-    for i in input:
-        i.plot()
+    xy = _dense_points(input)
+    if xy is not None:
+        control.plot_points(*xy)
+    else:
+        for i in input:
+            i.plot()
 
     # para "garantir" que os updates nao estao congelados
     control.thaw_update(10000000)
 
 
-def run_algorithm(alg, input):
+def _dense_points(input):
+    """Coordenadas (x, y) dos pontos de input, se ele deve ser desenhado
+    de uma vez com control.plot_points (veja config.LOD_POINTS), ou None"""
+    if not config.LOD_POINTS or len(input) < config.LOD_POINTS:
+        return None
+    if not hasattr(gui, 'plot_points'):
+        return None
+    if isinstance(input, PointSet):
+        return input.x, input.y
+    if not all(isinstance(i, Point) for i in input):
+        return None
+    return [p.x for p in input], [p.y for p in input]
+
+
+class Result:
+    """Resultado de run_algorithm
+
+    Atributos:
+    - algorithm:   nome do algoritmo
+    - output:      o que o algoritmo devolveu
+    - count:       total de operacoes primitivas
+    - counts:      dicionario primitiva -> numero de chamadas
+    - extra_info:  string opcionalmente devolvida pelo algoritmo
+    - wall_time:   tempo do algoritmo (em segundos, perf_counter)
+    - cpu_time:    tempo de processador do algoritmo (process_time)
+    - peak_memory: pico de memoria alocada pelo algoritmo, em bytes, ou
+                   None se run_algorithm nao foi chamado com memory=True
+
+    Para compatibilidade, pode ser desempacotado como (count, extra_info)."""
+
+    def __init__(self, algorithm, output, count, counts, extra_info,
+                 wall_time, cpu_time, peak_memory=None):
+        self.algorithm = algorithm
+        self.output = output
+        self.count = count
+        self.counts = counts
+        self.extra_info = extra_info
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_memory = peak_memory
+
+    def __iter__(self):
+        return iter((self.count, self.extra_info))
+
+    def __repr__(self):
+        return 'Result(%s: %d primitivas, %.4fs)' % (self.algorithm, self.count,
+                                                    self.wall_time)
+
+    def as_dict(self, output=True):
+        """Dicionario com os atributos, com output convertido para JSON
+        (ou sem output, se output for falso)"""
+        ret = {'algorithm': self.algorithm, 'count': self.count,
+               'counts': self.counts, 'extra_info': self.extra_info,
+               'wall_time': self.wall_time, 'cpu_time': self.cpu_time,
+               'peak_memory': self.peak_memory}
+        if output:
+            ret['output'] = to_json(self.output)
+        return ret
+
+def to_json(obj):
+    """Converte uma saida de algoritmo (numeros, Points, Segments,
+    Polygons, Discs, e listas e tuplas deles) para tipos do JSON"""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, Point):
+        return [obj.x, obj.y]
+    if isinstance(obj, Segment):
+        return [to_json(obj.init), to_json(obj.to)]
+    if isinstance(obj, Polygon):
+        return [to_json(p) for p in obj.vertices()]
+    if isinstance(obj, Disc):
+        return [obj.center.x, obj.center.y, obj.r]
+    if isinstance(obj, (list, tuple)):
+        return [to_json(o) for o in obj]
+    if hasattr(obj, 'tolist'):
+        # arrays e escalares do NumPy
+        return obj.tolist()
+    return repr(obj)
+
+def run_algorithm(alg, input, memory=False):
     """roda o algoritmo alg, usando input como entrada
 
-    Retorna uma lista contendo o total de operacoes primitivas executadas
-    e uma string opcionalmente retornada pelo algoritmo"""
-    if len(input) > 0:
+    Retorna um Result, com o total de operacoes primitivas executadas, a
+    string opcionalmente retornada pelo algoritmo, os tempos e o que o
+    algoritmo devolveu. Com memory=True, mede tambem o pico de memoria
+    (com tracemalloc, o que deixa o algoritmo bem mais lento)."""
+    # sem interface grafica, nem a caixa da entrada e' calculada
+    if len(input) > 0 and not control.headless:
         plot_input(input)
 
     show = 1
@@ -118,7 +238,23 @@ def run_algorithm(alg, input):
 
     input_dup = input[:]
 
-    ret = alg (input_dup)
+    name = getattr (alg, '__name__', repr (alg))
+    prim.set_algorithm (name)
+    # uma execucao anterior que levantou excecao nao zerou os contadores
+    prim.reset_count ()
+    peak = None
+    if memory:
+        tracemalloc.start ()
+    wall = time.perf_counter ()
+    cpu = time.process_time ()
+    try:
+        ret = alg (input_dup)
+    finally:
+        cpu = time.process_time () - cpu
+        wall = time.perf_counter () - wall
+        if memory:
+            peak = tracemalloc.get_traced_memory ()[1]
+            tracemalloc.stop ()
 
     if not show:
         unhide_all()
@@ -134,6 +270,7 @@ def run_algorithm(alg, input):
         extra_info = ret.extra_info
 
     cont = prim.get_count ()
+    counts = prim.get_counts ()
     prim.reset_count ()
 
-    return cont, extra_info
+    return Result (name, ret, cont, counts, extra_info, wall, cpu, peak)
@@ -88,3 +88,21 @@ def float_left_on (a, b, c):
 
 ######################
 
+
+def _triang (a, b, c, color=config.COLOR_PRIM):
+	pass
+
+def _dist2 (a, b, color=config.COLOR_PRIM):
+	return prim.dist2 (a, b)
+
+_drawing = { 'triang': triang, 'dist2': dist2 }
+_headless = { 'triang': _triang, 'dist2': _dist2 }
+
+def set_headless (on):
+	"""Liga ou desliga o modo sem interface grafica (veja control.set_headless)
+
+	Ligado, as primitivas so fazem a conta (e a contagem) de prim, sem
+	desenhar nada. Quem usa este modulo deve acessar as primitivas como
+	guiprim.dist2, para enxergar a troca."""
+	globals ().update (_headless if on else _drawing)
+
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 """Modulo para leitura de um arquivo de dados"""
 
+import numpy as np
+
 from geocomp.common.point   import Point
 from geocomp.common.polygon import Polygon
 from geocomp.common.segment import Segment
@@ -55,6 +57,9 @@ def read(filename):
             0 1 2
             10 100 50
 
+    Files in the binary format of geocomp.common.binary are also
+    accepted (they are recognized by their first bytes).
+
     :param filename: (str) The name of the file that will be read
 
     :return: (list) A list of geometric primitive data structures
@@ -69,10 +74,74 @@ def read(filename):
                     required patterns
 
     """
+    # binary importa este modulo
+    from geocomp.common import binary
+    if binary.is_binary(filename):
+        return binary.load(filename).objects()
+    data = []
+    for kind, block in _iter_blocks(filename):
+        data.extend(_objects(kind, block))
+    return data
+
+
+KINDS = ('point', 'segment', 'polygon', 'disc')
+
+# number of columns of each kind in chunked mode
+COLUMNS = {'point': 2, 'disc': 3, 'segment': 4}
+_KIND_OF_COLUMNS = {2: 'point', 3: 'disc', 4: 'segment'}
+
+# characters read at a time by the bulk parser
+PIECE = 1 << 22
+
+
+def iter_read(filename, kind=None, chunk=None):
+    """Reads the geometric primitives of a file lazily, a piece of
+    about PIECE characters at a time, so that the whole file is never
+    held in memory.
+
+    The file format is the same of read(): '#' comments, polygons
+    enclosed by '[' and ']', and points, discs and segments with 2, 3
+    and 4 coordinates per line.
+
+    :param filename: (str) The name of the file that will be read
+
+    :param kind: (str) If given, one of KINDS ('point', 'segment',
+                 'polygon', 'disc'): only primitives of this kind are
+                 yielded, the others are parsed and skipped
+
+    :param chunk: (int) If given, yields NumPy arrays (float64) with up
+                  to chunk records each, one record per row, instead of
+                  objects: (n, 2) for points, (n, 3) for discs and
+                  (n, 4) for segments. Requires kind to be 'point',
+                  'disc' or 'segment'.
+
+    :return: (generator) The primitives (or arrays) in file order
+
+    Raises:
+        FileNotFoundError: if file could not be found
+
+        ValueError: if some input from the file does not follow the
+                    required patterns, or if kind or chunk are invalid
+
+    """
+    if kind is not None and kind not in KINDS:
+        raise ValueError("Invalid kind: {}".format(kind))
+    if chunk is not None:
+        if kind not in COLUMNS:
+            raise ValueError("Chunked reading needs kind 'point', 'disc' or 'segment'")
+        if chunk < 1:
+            raise ValueError("Invalid chunk size: {}".format(chunk))
+        return _iter_chunks(filename, kind, chunk)
+    return _iter_objects(filename, kind)
+
+
+def _iter_records(filename):
+    """Yields (kind, values) for each primitive of the file, parsing it
+    line by line: values is a list of floats, or a list of (x, y) tuples
+    for a polygon"""
     with open(filename) as file:
         i = 0
         vertices = []
-        data = []
         expecting_polygon = False
         for line in file:
             i += 1
@@ -83,26 +152,173 @@ def read(filename):
                 expecting_polygon = True
             elif line[0] == "]":
                 expecting_polygon = False
-                data.append(Polygon(vertices))
+                yield 'polygon', vertices
                 vertices = []
             elif len(line) == 3:
-                data.append(Disc(float(line[0]), float(line[1]), float(line[2])))
+                yield 'disc', [float(line[0]), float(line[1]), float(line[2])]
             elif len(line) == 4:
-                data.append(
-                    Segment(
-                        Point(float(line[0]), float(line[1])),
-                        Point(float(line[2]), float(line[3]))
-                    )
-                )
+                yield 'segment', [float(line[0]), float(line[1]),
+                                  float(line[2]), float(line[3])]
             elif len(line) == 2:
                 if expecting_polygon:
-                    vertices.append(Point(float(line[0]), float(line[1])))
+                    vertices.append((float(line[0]), float(line[1])))
                 else:
-                    data.append(Point(float(line[0]), float(line[1])))
+                    yield 'point', [float(line[0]), float(line[1])]
             else:
                 raise ValueError(
                     "Invalid input from file: {}: line: {}: {}".format(filename, i, line))
-        return data
+
+
+def _markers(text):
+    "Positions of the characters '#', '[' and ']' in text, in order"
+    positions = []
+    for c in '#[]':
+        pos = text.find(c)
+        while pos >= 0:
+            positions.append(pos)
+            pos = text.find(c, pos + 1)
+    positions.sort()
+    return positions
+
+
+def _iter_blocks(filename):
+    """Yields (kind, array) for the primitives of the file, in file
+    order: array is (n, 2), (n, 3) or (n, 4) for a run of points, discs
+    or segments, and (n, 2) with the vertices of a single polygon.
+
+    The file is read in pieces of about PIECE characters (cut at line
+    ends). The text between marker lines (whose first token is '#', '['
+    or ']') is parsed in bulk by numpy.loadtxt when all its lines have
+    the same number of columns; only regions where that fails (mixed
+    kinds or bad input) are parsed line by line, which also reports the
+    errors with their line numbers."""
+    state = {'polygon': False, 'vertices': []}
+    line = 1
+    rest = ''
+    with open(filename) as file:
+        while True:
+            piece = file.read(PIECE)
+            text = rest + piece
+            cut = text.rfind('\n') + 1
+            if piece and cut == 0:
+                rest = text
+                continue
+            if piece:
+                text, rest = text[:cut], text[cut:]
+            yield from _text_blocks(filename, text, line, state)
+            if not piece:
+                return
+            line += text.count('\n')
+
+
+def _text_blocks(filename, text, line, state):
+    "Blocks of text, whose first line is the line-th of the file"
+    start = 0
+    for pos in _markers(text):
+        if pos < start:
+            continue
+        begin = text.rfind('\n', 0, pos) + 1
+        if (text[begin:pos] and not text[begin:pos].isspace()) or \
+           not (pos + 1 == len(text) or text[pos + 1].isspace()):
+            continue
+        end = text.find('\n', pos)
+        if end < 0:
+            end = len(text)
+
+        yield from _region_blocks(filename, text[start:begin], line, state)
+        line += text.count('\n', start, end)
+        start = end
+
+        marker = text[pos]
+        if marker == '[':
+            state['polygon'] = True
+        elif marker == ']':
+            state['polygon'] = False
+            vertices = state['vertices']
+            state['vertices'] = []
+            yield 'polygon', (np.concatenate(vertices) if vertices
+                              else np.empty((0, 2)))
+    yield from _region_blocks(filename, text[start:], line, state)
+
+
+def _region_blocks(filename, region, line, state):
+    """Blocks of a region of text without markers, starting at line
+    number line; state holds whether a polygon is open and its vertices"""
+    if not region or region.isspace():
+        return
+    try:
+        block = np.loadtxt(region.split('\n'), dtype=np.float64,
+                           comments=None, ndmin=2)
+    except ValueError:
+        block = None
+    if block is not None:
+        columns = block.shape[1]
+        if columns == 2 and state['polygon']:
+            state['vertices'].append(block)
+            return
+        if columns in (2, 3, 4):
+            yield _KIND_OF_COLUMNS[columns], block
+            return
+
+    # mixed region: line by line, grouping consecutive records of a kind
+    kind, rows = None, []
+    for i, tokens in enumerate(region.split('\n'), line):
+        tokens = tokens.split()
+        if len(tokens) == 0:
+            continue
+        if len(tokens) == 2 and state['polygon']:
+            state['vertices'].append(
+                np.array([[float(tokens[0]), float(tokens[1])]]))
+            continue
+        if len(tokens) not in _KIND_OF_COLUMNS:
+            raise ValueError(
+                "Invalid input from file: {}: line: {}: {}".format(filename, i, tokens))
+        k = _KIND_OF_COLUMNS[len(tokens)]
+        if k != kind and rows:
+            yield kind, np.array(rows, dtype=np.float64)
+            rows = []
+        kind = k
+        rows.append([float(t) for t in tokens])
+    if rows:
+        yield kind, np.array(rows, dtype=np.float64)
+
+
+def _objects(kind, block):
+    "The objects of a block from _iter_blocks"
+    if kind == 'point':
+        return [Point(x, y) for x, y in block.tolist()]
+    if kind == 'segment':
+        return [Segment(Point(x0, y0), Point(x1, y1))
+                for x0, y0, x1, y1 in block.tolist()]
+    if kind == 'disc':
+        return [Disc(x, y, r) for x, y, r in block.tolist()]
+    return [Polygon([Point(x, y) for x, y in block.tolist()])]
+
+
+def _iter_objects(filename, kind):
+    for k, block in _iter_blocks(filename):
+        if kind is None or k == kind:
+            yield from _objects(k, block)
+
+
+def _iter_chunks(filename, kind, chunk):
+    pending = []
+    size = 0
+    for k, block in _iter_blocks(filename):
+        if k != kind:
+            continue
+        pending.append(block)
+        size += len(block)
+        if size < chunk:
+            continue
+        block = np.concatenate(pending)
+        full = len(block) - len(block) % chunk
+        for i in range(0, full, chunk):
+            yield block[i:i + chunk]
+        pending = [block[full:]]
+        size = len(pending[0])
+    if size:
+        yield np.concatenate(pending)
 
 # if __name__ == '__main__':
 #     import sys
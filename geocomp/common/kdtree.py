@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""Arvore k-d (k = 2) para buscas de proximidade num conjunto fixo de pontos
+
+A arvore nao tem objetos por no': e' guardada implicitamente numa
+permutacao dos pontos. O no' do intervalo [lo, hi) da permutacao e' o
+ponto do meio, mid = (lo + hi) // 2, que divide o intervalo pela
+coordenada axis[mid] (0: x, 1: y): os pontos de [lo, mid) estao antes
+dele nessa coordenada, e os de [mid + 1, hi), depois. Intervalos com
+ate leaf_size pontos sao folhas, percorridas direto. A construcao
+(balanceada, em O(n log n)) escolhe em cada no' a coordenada de maior
+espalhamento e acha a mediana com numpy.argpartition.
+
+Consultas (p e' um Point; os resultados sao indices na entrada):
+- nearest (p):          o ponto mais proximo de p
+- k_nearest (p, k):     os k pontos mais proximos de p
+- in_radius (p, r):     os pontos a distancia <= r de p
+- in_box (x0, x1, y0, y1): os pontos do retangulo [x0, x1] x [y0, y1]
+- all_nearest (), all_k_nearest (k): os vizinhos de cada ponto da arvore
+
+Cada distancia calculada conta como uma chamada de prim.dist2 (veja
+prim.add_count), e uma consulta a um conjunto fixo de n pontos calcula
+O(log n) distancias em media.
+"""
+
+import heapq
+
+import numpy as np
+
+from .pointset import PointSet
+from . import prim
+
+# maior numero de pontos numa folha
+LEAF_SIZE = 8
+
+
+class KDTree:
+    "Arvore k-d de um PointSet ou de uma lista de pontos"
+
+    def __init__ (self, points, leaf_size=LEAF_SIZE):
+        if not isinstance (points, PointSet):
+            points = PointSet.from_points (points)
+        if leaf_size < 1:
+            raise ValueError ("leaf_size must be at least 1")
+        self.leaf_size = leaf_size
+
+        x, y = points.x, points.y
+        n = len (x)
+        index = np.arange (n)
+        axis = np.zeros (n, dtype=np.int8)
+        stack = [(0, n)]
+        while stack:
+            lo, hi = stack.pop ()
+            if hi - lo <= leaf_size:
+                continue
+            sub = index[lo:hi]
+            sx, sy = x[sub], y[sub]
+            a = 0 if np.ptp (sx) >= np.ptp (sy) else 1
+            mid = (hi - lo) // 2
+            sub[:] = sub[np.argpartition (sy if a else sx, mid)]
+            axis[lo + mid] = a
+            stack.append ((lo, lo + mid))
+            stack.append ((lo + mid + 1, hi))
+
+        # permutacao, coordenadas em ordem de arvore e eixos, como listas
+        #   (que o Python percorre bem mais rapido do que arrays)
+        self.index = index
+        self._index = index.tolist ()
+        self._x = x[index].tolist ()
+        self._y = y[index].tolist ()
+        self._axis = axis.tolist ()
+
+    def __len__ (self):
+        return len (self._index)
+
+    def nearest (self, p, exclude=None):
+        """Ponto mais proximo de p: devolve (i, d2), com d2 o quadrado da
+        distancia, ou (None, inf) se a arvore esta vazia
+
+        Se exclude e' um indice, esse ponto e' ignorado (para achar o
+        vizinho mais proximo de um ponto da propria arvore)."""
+        return self._nearest (p.x, p.y, exclude)
+
+    def _nearest (self, qx, qy, exclude):
+        X, Y, I, A = self._x, self._y, self._index, self._axis
+        leaf = self.leaf_size
+        best, best_d2 = None, float ('inf')
+        count = 0
+        stack = [(0, len (I), 0.0)]
+        while stack:
+            lo, hi, bound = stack.pop ()
+            if bound >= best_d2:
+                continue
+            if hi - lo <= leaf:
+                count += hi - lo
+                for k in range (lo, hi):
+                    dx = X[k] - qx
+                    dy = Y[k] - qy
+                    d2 = dx*dx + dy*dy
+                    if d2 < best_d2 and I[k] != exclude:
+                        best, best_d2 = I[k], d2
+                continue
+            mid = (lo + hi) // 2
+            dx = X[mid] - qx
+            dy = Y[mid] - qy
+            d2 = dx*dx + dy*dy
+            count += 1
+            if d2 < best_d2 and I[mid] != exclude:
+                best, best_d2 = I[mid], d2
+            diff = -dy if A[mid] else -dx
+            far = max (bound, diff*diff)
+            if diff < 0:
+                stack.append ((mid + 1, hi, far))
+                stack.append ((lo, mid, bound))
+            else:
+                stack.append ((lo, mid, far))
+                stack.append ((mid + 1, hi, bound))
+        prim.add_count ('dist2', count)
+        return best, best_d2
+
+    def k_nearest (self, p, k, exclude=None):
+        """Os k pontos mais proximos de p, do mais proximo ao mais
+        distante: lista de pares (i, d2) (menos de k, se a arvore tem
+        menos pontos). exclude e' como em nearest."""
+        return self._k_nearest (p.x, p.y, k, exclude)
+
+    def _k_nearest (self, qx, qy, k, exclude):
+        X, Y, I, A = self._x, self._y, self._index, self._axis
+        leaf = self.leaf_size
+        if k <= 0:
+            return []
+        # heap de maximo (com -d2) dos k melhores ate agora
+        heap = []
+        worst = float ('inf')
+        count = 0
+        stack = [(0, len (I), 0.0)]
+        while stack:
+            lo, hi, bound = stack.pop ()
+            if bound >= worst:
+                continue
+            if hi - lo <= leaf:
+                first, last = lo, hi
+            else:
+                mid = (lo + hi) // 2
+                first, last = mid, mid + 1
+            count += last - first
+            for j in range (first, last):
+                dx = X[j] - qx
+                dy = Y[j] - qy
+                d2 = dx*dx + dy*dy
+                if d2 < worst and I[j] != exclude:
+                    if len (heap) < k:
+                        heapq.heappush (heap, (-d2, I[j]))
+                    else:
+                        heapq.heapreplace (heap, (-d2, I[j]))
+                    if len (heap) == k:
+                        worst = -heap[0][0]
+            if hi - lo <= leaf:
+                continue
+            diff = (qy - Y[mid]) if A[mid] else (qx - X[mid])
+            far = max (bound, diff*diff)
+            if diff < 0:
+                stack.append ((mid + 1, hi, far))
+                stack.append ((lo, mid, bound))
+            else:
+                stack.append ((lo, mid, far))
+                stack.append ((mid + 1, hi, bound))
+        prim.add_count ('dist2', count)
+        return sorted (((i, -d2) for d2, i in heap), key=lambda t: t[1])
+
+    def all_nearest (self):
+        """Vizinho mais proximo de cada ponto da arvore (entre os outros
+        pontos): devolve arrays nn e d2, com nn[i] o indice do vizinho do
+        ponto i (-1 se a arvore tem um ponto so) e d2[i] o quadrado da
+        distancia ate ele
+
+        Os pontos sao consultados na ordem da arvore, em que pontos
+        consecutivos estao perto um do outro."""
+        n = len (self._index)
+        if n < 2:
+            return np.full (n, -1, dtype=np.int64), np.full (n, np.inf)
+        found = [ self._nearest (x, y, i)
+                  for x, y, i in zip (self._x, self._y, self._index) ]
+        nn = np.empty (n, dtype=np.int64)
+        d2 = np.empty (n)
+        nn[self.index] = [ f[0] for f in found ]
+        d2[self.index] = [ f[1] for f in found ]
+        return nn, d2
+
+    def all_k_nearest (self, k):
+        """Os k vizinhos mais proximos de cada ponto da arvore: array n x k
+        de indices, do mais proximo ao mais distante (completado com -1
+        se a arvore tem k pontos ou menos)"""
+        n = len (self._index)
+        ret = np.full ((n, k), -1, dtype=np.int64)
+        for j in range (n):
+            i = self._index[j]
+            found = self._k_nearest (self._x[j], self._y[j], k, i)
+            ret[i, :len (found)] = [ t[0] for t in found ]
+        return ret
+
+    def in_radius (self, p, r):
+        "Indices dos pontos a distancia no maximo r de p"
+        X, Y, I, A = self._x, self._y, self._index, self._axis
+        leaf = self.leaf_size
+        qx, qy = p.x, p.y
+        r2 = r * r
+        ret = []
+        count = 0
+        stack = [(0, len (I))]
+        while stack:
+            lo, hi = stack.pop ()
+            if hi - lo <= leaf:
+                first, last = lo, hi
+            else:
+                mid = (lo + hi) // 2
+                first, last = mid, mid + 1
+            count += last - first
+            for j in range (first, last):
+                dx = X[j] - qx
+                dy = Y[j] - qy
+                if dx*dx + dy*dy <= r2:
+                    ret.append (I[j])
+            if hi - lo <= leaf:
+                continue
+            diff = (qy - Y[mid]) if A[mid] else (qx - X[mid])
+            if diff <= r:
+                stack.append ((lo, mid))
+            if diff >= -r:
+                stack.append ((mid + 1, hi))
+        prim.add_count ('dist2', count)
+        return ret
+
+    def in_box (self, x0, x1, y0, y1):
+        "Indices dos pontos do retangulo [x0, x1] x [y0, y1]"
+        X, Y, I, A = self._x, self._y, self._index, self._axis
+        leaf = self.leaf_size
+        ret = []
+        stack = [(0, len (I))]
+        while stack:
+            lo, hi = stack.pop ()
+            if hi - lo <= leaf:
+                first, last = lo, hi
+            else:
+                mid = (lo + hi) // 2
+                first, last = mid, mid + 1
+            for j in range (first, last):
+                if x0 <= X[j] <= x1 and y0 <= Y[j] <= y1:
+                    ret.append (I[j])
+            if hi - lo <= leaf:
+                continue
+            if A[mid]:
+                low, high, v = y0, y1, Y[mid]
+            else:
+                low, high, v = x0, x1, X[mid]
+            if low <= v:
+                stack.append ((lo, mid))
+            if v <= high:
+                stack.append ((mid + 1, hi))
+        return ret
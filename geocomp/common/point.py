@@ -3,23 +3,43 @@
 from . import control
 from geocomp import config
 from .vector import Vector
-from .prim import dist2
+from . import prim
 
 class Point:
-    "Um ponto representado por suas coordenadas cartesianas"
+    """Um ponto representado por suas coordenadas cartesianas
+
+    x e y sao slots (o acesso e' o de um atributo comum); as coordenadas
+    a partir da terceira ficam na tupla _more. Os atributos da interface
+    grafica (plot_id, hi e lineto_id) tambem sao slots, que so ocupam
+    memoria quando o ponto e' desenhado. O resto (os ponteiros next e
+    prev dos vertices de um Polygon, e o que mais um algoritmo pendurar
+    no ponto) vai para o __dict__, criado so quando o primeiro deles e'
+    atribuido."""
+
+    __slots__ = ('x', 'y', '_more', 'polygon_id', 'plot_id', 'hi',
+                 'lineto_id', '__dict__')
 
     def __init__ (self, *args):
         "Para criar um ponto, passe suas coordenadas."
         if len(args) == 0:
             raise ValueError("Point must have at least one coordinate")
-        self.__coord = list(args)
+        self.x = args[0]
+        if len(args) == 1:
+            self._more = None
+        else:
+            self.y = args[1]
+            self._more = args[2:]
         self.polygon_id = -1
-        self.lineto_id = {}
+
+    def _coords (self):
+        if self._more is None:
+            return [self.x]
+        return [self.x, self.y] + list(self._more)
 
     def __repr__ (self):
         "Retorna uma string da forma '( x1 x2 x3 ... xn )'"
         res = "("
-        for i in self.__coord:
+        for i in self._coords():
             res += " " + repr(i) + ","
         return res[:-1] + " )"
 
@@ -37,7 +57,7 @@ class Point:
     def __eq__(self, other):
         if self is other:
             return True
-        if type(self) != type(other):
+        if not isinstance(other, Point):
             return False
         return self.x == other.x and self.y == other.y
 
@@ -47,51 +67,44 @@ class Point:
 
     @property
     def dimension(self):
-        return len(self.__coord)
-    
-    @property
-    def x(self):
-        return self.__coord[0]
-
-    @x.setter
-    def x(self, x):
-        self.__coord[0] = x
-
-    @property
-    def y(self):
-        if len(self.__coord) < 2:
-            raise ValueError("Point has dimension 1")
-        return self.__coord[1]
-
-    @y.setter
-    def y(self, y):
-        if len(self.__coord) < 2:
-            raise ValueError("Point has dimension 1")
-        self.__coord[1] = y
+        if self._more is None:
+            return 1
+        return 2 + len(self._more)
 
     @property
     def z(self):
-        if len(self.__coord) < 3:
+        if not self._more:
             raise ValueError("Point does not have dimension 3")
-        return self.__coord[2]
+        return self._more[0]
 
     @z.setter
     def z(self, z):
-        if len(self.__coord) < 3:
+        if not self._more:
             raise ValueError("Point does not have dimension 3")
-        self.__coord[2] = z
+        self._more = (z,) + self._more[1:]
 
     def __getitem__(self, i):
         if i < 0:
             raise ValueError("Negative dimension value")
-        if i >= len(self.__coord):
+        if i >= self.dimension:
             return 0
-        return self.__coord[i]
+        if i == 0:
+            return self.x
+        if i == 1:
+            return self.y
+        return self._more[i - 2]
 
     def __setitem__(self, key, value):
-        if key < 0 or key >= len(self.__coord):
+        if key < 0 or key >= self.dimension:
             raise ValueError("Illegal dimension value")
-        self.__coord[key] = value
+        if key == 0:
+            self.x = value
+        elif key == 1:
+            self.y = value
+        else:
+            more = list(self._more)
+            more[key - 2] = value
+            self._more = tuple(more)
 
     def plot (self, color=config.COLOR_POINT, radius=config.RADIUS):
         "Desenha o ponto na cor especificada"
@@ -120,24 +133,37 @@ class Point:
         control.plot_delete (id)
 
     def lineto (self, p, color=config.COLOR_LINE):
-        "Desenha uma linha ate um ponto p na cor especificada"
-        self.lineto_id[p] = control.plot_segment (self.x, self.y, p.x, p.y, color)
-        return self.lineto_id[p]
+        """Desenha uma linha ate um ponto p na cor especificada
+
+        O id da linha so e' guardado (para remove_lineto) se ela foi
+        mesmo desenhada."""
+        plot_id = control.plot_segment (self.x, self.y, p.x, p.y, color)
+        if plot_id:
+            try:
+                ids = self.lineto_id
+            except AttributeError:
+                ids = self.lineto_id = {}
+            ids[p] = plot_id
+        return plot_id
 
     def remove_lineto (self, p, id = None):
         "Apaga a linha ate o ponto p"
-        if id == None: id = self.lineto_id[p]
+        if id == None:
+            try:
+                id = self.lineto_id[p]
+            except (AttributeError, KeyError):
+                return
         control.plot_delete (id)
 
     def distance_to(self, other):
-        return dist2(self, other) ** 0.5
+        return prim.dist2(self, other) ** 0.5
 
     def is_inside(self, segment):
         ''' returns if point is inside the segment. '''
         return segment.has_inside(self)
 
     def approx_equals(self, other, precision=1e-7):
-        for i in range(len(self.__coord)):
+        for i in range(self.dimension):
             if abs(self[i] - other[i]) >= precision:
                 return False
         return True
@@ -151,7 +177,7 @@ class Point:
     def __lt__(self, other):
         if self is other:
             return True
-        if type(self) != type(other):
+        if not isinstance(other, Point):
             return False
         if self.y < other.y:
             return True
@@ -164,7 +190,7 @@ class Point:
     def __le__(self, other):
         if self is other:
             return True
-        if type(self) != type(other):
+        if not isinstance(other, Point):
             return False
         if self.y < other.y:
             return True
@@ -177,6 +203,21 @@ class Point:
         return True
 
 
+def _nothing (self, *args, **kwargs):
+    return None
+
+# metodos de desenho trocados por set_headless
+_drawing = { name: Point.__dict__[name] for name in
+             ('plot', 'unplot', 'hilight', 'unhilight', 'lineto', 'remove_lineto') }
+
+def set_headless (on):
+    """Liga ou desliga o modo sem interface grafica (veja control.set_headless)
+
+    Ligado, os metodos de desenho de Point nao fazem nada."""
+    for name, method in _drawing.items ():
+        setattr (Point, name, _nothing if on else method)
+
+
 #### Bruna & Renan ########
 
 class Edge:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""Conjunto de pontos guardado em colunas
+
+Um PointSet guarda as coordenadas de n pontos em dois arrays float64
+contiguos (x e y), em vez de n objetos Point. Indexar (ou percorrer) um
+PointSet devolve PointViews: pontos leves que leem e escrevem as
+coordenadas direto nos arrays do conjunto, e que podem ser usados em
+qualquer lugar onde um Point e' esperado.
+"""
+
+import numpy as np
+
+from .point import Point
+
+
+class PointView(Point):
+    """O i-esimo ponto de um PointSet
+
+    As coordenadas sao lidas com ndarray.item, que devolve direto um
+    float do Python (sem criar um escalar do NumPy); assim a view sempre
+    ve o valor atual dos arrays."""
+
+    __slots__ = ('pointset', 'index')
+
+    def __init__ (self, pointset, index):
+        self.pointset = pointset
+        self.index = index
+        self.polygon_id = -1
+
+    def __repr__ (self):
+        return "( " + repr(self.x) + ", " + repr(self.y) + " )"
+
+    @property
+    def dimension(self):
+        return 2
+
+    @property
+    def x(self):
+        return self.pointset.x.item(self.index)
+
+    @x.setter
+    def x(self, x):
+        self.pointset.x[self.index] = x
+
+    @property
+    def y(self):
+        return self.pointset.y.item(self.index)
+
+    @y.setter
+    def y(self, y):
+        self.pointset.y[self.index] = y
+
+    @property
+    def z(self):
+        raise ValueError("Point does not have dimension 3")
+
+    def __getitem__(self, i):
+        if i < 0:
+            raise ValueError("Negative dimension value")
+        if i == 0:
+            return self.x
+        if i == 1:
+            return self.y
+        return 0
+
+    def __setitem__(self, key, value):
+        if key == 0:
+            self.x = value
+        elif key == 1:
+            self.y = value
+        else:
+            raise ValueError("Illegal dimension value")
+
+
+class PointSet:
+    """Um conjunto de pontos do plano, em colunas
+
+    Os atributos x e y sao arrays do NumPy (float64, contiguos) e podem
+    ser passados diretamente para as primitivas vetorizadas de
+    geocomp.common.prim (veja o atributo xy)."""
+
+    def __init__ (self, x, y):
+        "Para criar, passe as sequencias de coordenadas x e y"
+        self.x = np.ascontiguousarray (x, dtype=np.float64)
+        self.y = np.ascontiguousarray (y, dtype=np.float64)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError("x and y must be 1-d arrays of the same length")
+
+    @classmethod
+    def from_points (cls, points):
+        "Cria um PointSet com as coordenadas de uma lista de pontos"
+        n = len (points)
+        x = np.fromiter ((p.x for p in points), dtype=np.float64, count=n)
+        y = np.fromiter ((p.y for p in points), dtype=np.float64, count=n)
+        return cls (x, y)
+
+    @classmethod
+    def from_array (cls, xy):
+        "Cria um PointSet a partir de um array n x 2"
+        xy = np.asarray (xy, dtype=np.float64)
+        return cls (xy[:, 0], xy[:, 1])
+
+    @property
+    def xy (self):
+        "Array n x 2 com as coordenadas (uma copia)"
+        return np.column_stack ((self.x, self.y))
+
+    def __len__ (self):
+        return len (self.x)
+
+    def __getitem__ (self, i):
+        if isinstance (i, slice):
+            return PointSet (self.x[i].copy (), self.y[i].copy ())
+        n = len (self.x)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError ("PointSet index out of range")
+        return PointView (self, i)
+
+    def __iter__ (self):
+        for i in range (len (self.x)):
+            yield PointView (self, i)
+
+    def __repr__ (self):
+        return "PointSet(" + repr (len (self)) + " pontos)"
+
+
+def point_list (points):
+    """Devolve points como uma lista de pontos
+
+    Um PointSet vira uma lista das suas PointViews (criadas uma unica vez,
+    para que cada ponto guarde seus ids de desenho); listas sao devolvidas
+    sem mudanca."""
+    if isinstance (points, PointSet):
+        return list (points)
+    return points
+
+
+def coordinates (points):
+    """Arrays x e y das coordenadas de points (um PointSet ou uma lista
+    de pontos); os de um PointSet sao devolvidos sem copia"""
+    if not isinstance (points, PointSet):
+        points = PointSet.from_points (points)
+    return points.x, points.y
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import math
+from fractions import Fraction
+from geocomp import config
 
 """Primitivas geometricas usadas nos algoritmos
 
@@ -9,6 +11,10 @@ Use o modulo geocomp.common.guiprim para que essas primitivas sejam
 desenhadas na tela  medida que elas so usadas. Tambm  possvel
 desenh-las de um jeito especfico para um determinado algoritmo.
 Veja geocomp.convexhull.quickhull para um exemplo.
+
+As versoes *_many (area2_many, left_many, ...) testam de uma so vez
+um conjunto de pontos c (um PointSet ou um array do NumPy n x 2) contra
+o segmento ab, e contam como n operacoes primitivas.
 """
 
 ######## MORETTO #########
@@ -21,40 +27,112 @@ INFINITY     = 100000
 
 ############################
 
-# Numero de vezes que a funcao area2 foi chamada
-num_area2 = 0
-# Numero de vezes que a funcao dist2 foi chamada
-num_dist = 0
+class Counter:
+    """Contadores de operacoes primitivas, separados por algoritmo
+
+    counts[alg][primitiva] guarda quantas vezes cada primitiva foi usada
+    enquanto o algoritmo alg estava selecionado (veja set_algorithm)."""
+
+    PRIMITIVES = ('area2', 'dist2')
+
+    def __init__ (self):
+        self.counts = {}
+        self.select (None)
+
+    def select (self, algorithm):
+        "Passa a contar as primitivas usadas pelo algoritmo dado"
+        self.algorithm = algorithm
+        if algorithm not in self.counts:
+            self.counts[algorithm] = dict.fromkeys (self.PRIMITIVES, 0)
+        self.current = self.counts[algorithm]
+
+    def total (self):
+        "Total de operacoes primitivas do algoritmo selecionado"
+        return sum (self.current.values ())
+
+    def reset (self):
+        "Zera os contadores do algoritmo selecionado"
+        for name in self.current:
+            self.current[name] = 0
+
+counter = Counter ()
+# atalho para counter.current, usado pelas primitivas contadas
+_current = counter.current
+
+# Falso quando as primitivas estao ligadas as versoes sem contagem
+counting = True
+
+def add_count (primitive, amount = 1):
+    "Soma amount ao contador da primitiva (usado por codigo vetorizado)"
+    _current[primitive] += amount
 
 def count_area2():
-    global num_area2
-    num_area2 = num_area2 + 1
+    _current['area2'] += 1
 
 def area2 (a, b, c):
     "Retorna duas vezes a area do tringulo determinado por a, b, c"
-    global num_area2
-    num_area2 = num_area2 + 1
+    _current['area2'] += 1
     return (b.x - a.x)*(c.y - a.y) - (b.y - a.y)*(c.x - a.x)
 
-def area_sign(a, b, c):
-    area = area2(a, b, c)
-    if area > 0:
+def _area2 (a, b, c):
+    return (b.x - a.x)*(c.y - a.y) - (b.y - a.y)*(c.x - a.x)
+
+# Limite estatico do erro relativo de area2 calculada em ponto flutuante
+# (ccwerrboundA de Shewchuk): se |det| for maior que CCW_ERRBOUND vezes
+# a soma dos modulos das duas parcelas, o sinal de det esta correto.
+EPSILON = 2.0 ** -53
+CCW_ERRBOUND = (3.0 + 16.0 * EPSILON) * EPSILON
+
+def _orient2d_exact (a, b, c):
+    "Sinal de area2 (a, b, c) calculado com aritmetica racional exata"
+    ax, ay = Fraction (a.x), Fraction (a.y)
+    det = (Fraction (b.x) - ax)*(Fraction (c.y) - ay) - \
+          (Fraction (b.y) - ay)*(Fraction (c.x) - ax)
+    return (det > 0) - (det < 0)
+
+def orient2d (a, b, c):
+    """Retorna 1, -1 ou 0 se c esta a esquerda, a direita ou sobre ab
+
+    O sinal e' exato: area2 e' calculada em ponto flutuante e, so quando
+    o resultado esta dentro do limite de erro, recalculada com Fraction.
+    Conta como uma chamada de area2."""
+    _current['area2'] += 1
+    return _orient2d (a, b, c)
+
+def _orient2d (a, b, c):
+    detleft = (b.x - a.x)*(c.y - a.y)
+    detright = (b.y - a.y)*(c.x - a.x)
+    det = detleft - detright
+    if detleft > 0:
+        if detright <= 0:
+            return (det > 0) - (det < 0)
+        detsum = detleft + detright
+    elif detleft < 0:
+        if detright >= 0:
+            return (det > 0) - (det < 0)
+        detsum = -detleft - detright
+    else:
+        return (det > 0) - (det < 0)
+    if det > CCW_ERRBOUND * detsum:
         return 1
-    if area < 0:
+    if -det > CCW_ERRBOUND * detsum:
         return -1
-    return 0
+    return _orient2d_exact (a, b, c)
+
+def area_sign(a, b, c):
+    return orient2d (a, b, c)
 
 def left (a, b, c):
     "Verdadeiro se c est  esquerda do segmento orientado ab"
-    return area2 (a, b, c) > 0
+    return orient2d (a, b, c) > 0
 
 def left_on (a, b, c):
     "Verdadeiro se c est  esquerda ou sobre o segmento orientado ab"
-    return area2 (a, b, c) >= 0
+    return orient2d (a, b, c) >= 0
 
 def collinear (a, b, c):
     "Verdadeiro se a, b, c sao colineares"
-    return area2 (a, b, c) == 0
+    return orient2d (a, b, c) == 0
 
 def right (a, b, c):
     "Verdadeiro se c est  direita do segmento orientado ab"
@@ -64,24 +142,135 @@ def right_on (a, b, c):
     "Verdadeiro se c est  direita ou sobre o segmento orientado ab"
     return not (left (a, b, c))
 
+def area2_many (a, b, c):
+    """Retorna duas vezes a area dos triangulos a, b, c[i] para cada c[i]
+
+    c e' um PointSet ou um array do NumPy de formato (n, 2), uma linha
+    por ponto. Conta como n chamadas de area2."""
+    _current['area2'] += len (c)
+    return _area2_many (a, b, c)
+
+def _area2_many (a, b, c):
+    cx, cy = _columns (c)
+    return (b.x - a.x)*(cy - a.y) - (b.y - a.y)*(cx - a.x)
+
+def _columns (c):
+    "Arrays de coordenadas x e y de c (um PointSet ou um array n x 2)"
+    if hasattr (c, 'xy'):
+        return c.x, c.y
+    return c[:, 0], c[:, 1]
+
+class _Coords:
+    "Ponto minimo (so x e y), usado para passar uma linha de array a _orient2d_exact"
+    __slots__ = ('x', 'y')
+
+    def __init__ (self, x, y):
+        self.x = x
+        self.y = y
+
+def orient2d_many (a, b, c):
+    """Versao de orient2d para um array c (n x 2) de pontos
+
+    O filtro de ponto flutuante e' aplicado ao array todo; so as linhas
+    em que ele e' inconclusivo sao recalculadas exatamente."""
+    _current['area2'] += len (c)
+    return _orient2d_many (a, b, c)
+
+def _orient2d_many (a, b, c):
+    cx, cy = _columns (c)
+    detleft = (b.x - a.x)*(cy - a.y)
+    detright = (b.y - a.y)*(cx - a.x)
+    det = detleft - detright
+    sign = (det > 0).astype ('i1') - (det < 0)
+    doubt = abs (det) <= CCW_ERRBOUND * (abs (detleft) + abs (detright))
+    doubt &= (detleft != 0) | (detright != 0)
+    for i in doubt.nonzero ()[0]:
+        sign[i] = _orient2d_exact (a, b, _Coords (cx[i], cy[i]))
+    return sign
+
+def left_many (a, b, c):
+    "Array de booleanos: c[i] esta a esquerda do segmento orientado ab"
+    return orient2d_many (a, b, c) > 0
+
+def left_on_many (a, b, c):
+    "Array de booleanos: c[i] esta a esquerda ou sobre o segmento orientado ab"
+    return orient2d_many (a, b, c) >= 0
+
+def collinear_many (a, b, c):
+    "Array de booleanos: a, b, c[i] sao colineares"
+    return orient2d_many (a, b, c) == 0
+
+def right_many (a, b, c):
+    "Array de booleanos: c[i] esta a direita do segmento orientado ab"
+    return orient2d_many (a, b, c) < 0
+
+def right_on_many (a, b, c):
+    "Array de booleanos: c[i] esta a direita ou sobre o segmento orientado ab"
+    return orient2d_many (a, b, c) <= 0
+
 def dist2 (a, b):
     "Retorna o quadrado da distancia entre os pontos a e b"
-    global num_dist
-    num_dist = num_dist + 1
+    _current['dist2'] += 1
+    dy = b.y - a.y
+    dx = b.x - a.x
+
+    return dy*dy + dx*dx
+
+def _dist2 (a, b):
     dy = b.y - a.y
     dx = b.x - a.x
 
     return dy*dy + dx*dx
 
+def _no_count (primitive, amount = 1):
+    pass
+
+# versoes com e sem contagem das primitivas trocadas por set_counting
+_counted = {
+    'add_count': add_count,
+    'area2': area2,
+    'area2_many': area2_many,
+    'orient2d': orient2d,
+    'orient2d_many': orient2d_many,
+    'dist2': dist2,
+}
+_uncounted = {
+    'add_count': _no_count,
+    'area2': _area2,
+    'area2_many': _area2_many,
+    'orient2d': _orient2d,
+    'orient2d_many': _orient2d_many,
+    'dist2': _dist2,
+}
+
+def set_counting (on):
+    """Liga ou desliga a contagem de operacoes primitivas
+
+    Desligada, area2, dist2, orient2d, ... passam a ser as versoes sem
+    contagem, e nao custam nada alem da propria conta. Modulos que usam
+    as primitivas devem acessa-las como prim.area2 (e nao importar o
+    nome), para enxergar a troca."""
+    global counting
+    counting = bool (on)
+    globals ().update (_counted if counting else _uncounted)
+
+def set_algorithm (name):
+    "Passa a contar as primitivas como sendo do algoritmo name"
+    global _current
+    counter.select (name)
+    _current = counter.current
+
+def get_counts ():
+    "Retorna um dicionario primitiva -> numero de chamadas do algoritmo atual"
+    return dict (_current)
+
 def get_count ():
     "Retorna o numero total de operacoes primitivas realizadas"
-    return num_area2 + num_dist
+    return counter.total ()
 
 def reset_count ():
     "Zera os contadores de operacoes primitivas"
-    global num_area2, num_dist
-    num_area2 = 0
-    num_dist = 0
+    counter.reset ()
 
 def ccw_angle(u, v):
     if u is None or v is None:
@@ -180,9 +369,58 @@ def on_segment(a, b, c):
         return \
             a.x <= c.x <= b.x or \
             b.x <= c.x <= a.x
-    return \
+    # ab vertical (ou um ponto, quando a == b): c tambem tem que ter o mesmo x
+    return c.x == a.x and (
         a.y <= c.y <= b.y or \
-        b.y <= c.y <= a.y
+        b.y <= c.y <= a.y)
+
+def crossing(a, b, c, d):
+    """Ponto (x, y) do cruzamento proprio de ab e cd, ou None
+
+    Proprio: os segmentos se cruzam num ponto fora das quatro pontas (se
+    eles so se tocam, ou se sobrepoem, a intersecao contem uma das
+    pontas). x e y sao exatos (Fraction)."""
+    if orient2d(a, b, c) * orient2d(a, b, d) >= 0:
+        return None
+    if orient2d(c, d, a) * orient2d(c, d, b) >= 0:
+        return None
+    # a conta e' feita com inteiros, sobre um denominador comum, e so' o
+    #   resultado vira Fraction
+    (ax, ay, bx, by, cx, cy, dx, dy), den = \
+        _scaled(a.x, a.y, b.x, b.y, c.x, c.y, d.x, d.y)
+    num = (cx - ax) * (dy - cy) - (cy - ay) * (dx - cx)
+    dnm = (bx - ax) * (dy - cy) - (by - ay) * (dx - cx)
+    return (Fraction(ax * dnm + num * (bx - ax), dnm * den),
+            Fraction(ay * dnm + num * (by - ay), dnm * den))
+
+def _scaled(*values):
+    """Os valores (int, float ou Fraction) como inteiros sobre um
+    denominador comum: devolve (lista dos inteiros, denominador)"""
+    ratios = []
+    for v in values:
+        if isinstance(v, float):
+            ratios.append(v.as_integer_ratio())
+        else:
+            v = Fraction(v)
+            ratios.append((v.numerator, v.denominator))
+    den = 1
+    for p, q in ratios:
+        den = den * q // math.gcd(den, q)
+    return [p * (den // q) for p, q in ratios], den
+
+def meeting_points(a, b, c, d):
+    """Os pontos (x, y) exatos em que ab e cd se encontram: o cruzamento
+    proprio, ou as pontas de um que estao sobre o outro
+
+    Quando ab e cd se sobrepoem, sao as duas pontas do trecho comum."""
+    q = crossing(a, b, c, d)
+    if q is not None:
+        return [q]
+    ret = []
+    for p, (e, f) in ((a, (c, d)), (b, (c, d)), (c, (a, b)), (d, (a, b))):
+        if on_segment(e, f, p) and (p.x, p.y) not in ret:
+            ret.append((p.x, p.y))
+    return ret
 
 
 
@@ -208,22 +446,27 @@ def cmpFloat(a, b):
 		return 1
 	return -1
 
+# float_left e float_left_on usavam cmpFloat com ERR fixo, o que erra
+# quando as coordenadas sao grandes; agora usam o predicado exato orient2d.
 def float_left (a, b, c):
 	"Verdadeiro se c est  esquerda do segmento orientado ab utilizando comparacao de float"
-	if(cmpFloat(area2 (a, b, c), 0) == 1):
-		return True
-	return False
+	return orient2d (a, b, c) > 0
 
 def float_left_on (a, b, c):
 	"Verdadeiro se c est  esquerda ou sobre o segmento orientado ab utilizando comparacao de float"
-	if(cmpFloat(area2 (a, b, c), 0) == 0):
-		return True
-	return False
+	return orient2d (a, b, c) == 0
 ############
 
 
 ############ Moretto ##############
 def intersection_point(a, b, c, d):
+    """Ponto de intersecao dos segmentos ab e cd
+
+    Devolve None se eles nao se intersectam, e um Segment se eles sao
+    colineares e se sobrepoem."""
+    # point e segment importam este modulo
+    from geocomp.common.point import Point
+    from geocomp.common.segment import Segment
     if a is None or \
        b is None or \
        c is None or \
@@ -232,9 +475,9 @@ def intersection_point(a, b, c, d):
     u = b - a
     v = d - c
     w = a - c
-    d = perp(u, v)
+    den = perp(u, v)
 
-    if abs(d) < SMALLEST_NUM:
+    if abs(den) < SMALLEST_NUM:
         if perp(u, w) != 0 or perp(v, w) != 0:
             return None
 
@@ -281,11 +524,11 @@ def intersection_point(a, b, c, d):
         p1 = c + Point(t1 * v[0], t1 * v[1])
         return Segment(p0, p1)
 
-    si = perp(v, w) / d
+    si = perp(v, w) / den
     if si < 0 or si > 1:
         return None
 
-    ti = perp(u, w) / d
+    ti = perp(u, w) / den
     if ti < 0 or ti > 1:
         return None
     return a + Point(si * u[0], si * u[1])
@@ -362,3 +605,5 @@ def intersection_dist2(p1, p2, edge):
 
 #################################3
 
+set_counting (config.COUNT_PRIMITIVES)
+
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""Registro dos algoritmos
+
+Cada problema (um pacote, como geocomp.closest) declara os seus
+algoritmos na tabela children, como antes, e mais:
+
+- input_type: o tipo da entrada ('points' ou 'segments')
+- complexity: dicionario funcao -> complexidade do algoritmo (string)
+
+Os modulos dos algoritmos nao sao importados junto com o pacote: o
+pacote usa lazy (veja abaixo) como __getattr__, e um modulo so e'
+importado no primeiro acesso (geocomp.closest.divide, get_func, ...).
+
+get e get_func acham um algoritmo pelo nome em O(1), com um dicionario
+montado (so lendo os children) no primeiro uso. Os nomes aceitos sao
+os de cligeocomp: problema/modulo (o primeiro algoritmo do modulo) ou
+problema/modulo.Funcao, com ou sem 'geocomp/' antes e '.py' depois do
+modulo.
+"""
+
+import importlib
+
+
+class Algorithm:
+    "Um algoritmo registrado nos children de um problema"
+
+    __slots__ = ('problem', 'module', 'func', 'title', 'input_type',
+                 'complexity', '_loaded')
+
+    def __init__(self, problem, module, func, title, input_type=None,
+                 complexity=None):
+        self.problem = problem
+        self.module = module
+        self.func = func
+        self.title = title
+        self.input_type = input_type
+        self.complexity = complexity
+        self._loaded = None
+
+    @property
+    def name(self):
+        "problema/modulo.Funcao"
+        return '%s/%s.%s' % (self.problem, self.module, self.func)
+
+    def load(self):
+        "A funcao do algoritmo (importa o modulo, se preciso)"
+        if self._loaded is None:
+            mod = importlib.import_module(
+                'geocomp.%s.%s' % (self.problem.replace('/', '.'), self.module))
+            self._loaded = getattr(mod, self.func)
+        return self._loaded
+
+    def __repr__(self):
+        return 'Algorithm(%s)' % self.name
+
+
+def lazy(package, names):
+    """__getattr__ para o pacote package que importa os sub-modulos (ou
+    sub-pacotes) names so quando eles sao usados pela primeira vez"""
+    names = frozenset(names)
+
+    def __getattr__(name):
+        if name in names:
+            return importlib.import_module('%s.%s' % (package, name))
+        raise AttributeError("module %r has no attribute %r" % (package, name))
+
+    return __getattr__
+
+
+_algorithms = None
+_by_name = None
+
+
+def _load():
+    "Monta o registro a partir dos children de geocomp e dos sub-pacotes"
+    global _algorithms, _by_name
+    import geocomp
+
+    algorithms = []
+    by_name = {}
+    pending = [('', geocomp)]
+    while pending:
+        prefix, package = pending.pop(0)
+        for row in package.children:
+            module, func, title = row[0], row[1], row[-1]
+            if func is None:
+                sub = importlib.import_module('%s.%s' % (package.__name__,
+                                                         module))
+                pending.append((prefix + module + '/', sub))
+                continue
+            problem = prefix[:-1]
+            alg = Algorithm(problem, module, func, title,
+                            getattr(package, 'input_type', None),
+                            getattr(package, 'complexity', {}).get(func))
+            algorithms.append(alg)
+            by_name[alg.name] = alg
+            by_name.setdefault('%s/%s' % (problem, module), alg)
+    _algorithms, _by_name = algorithms, by_name
+
+
+def algorithms(problem=None):
+    "Os algoritmos registrados (so os de problem, se dado), em ordem"
+    if _algorithms is None:
+        _load()
+    if problem is None:
+        return list(_algorithms)
+    return [a for a in _algorithms if a.problem == problem]
+
+
+def get(name):
+    """O Algorithm de nome name (veja acima)
+
+    Levanta KeyError se nao ha um algoritmo com esse nome."""
+    if _by_name is None:
+        _load()
+    key = name
+    if key.startswith('geocomp/'):
+        key = key[len('geocomp/'):]
+    if key.endswith('.py'):
+        key = key[:-3]
+    try:
+        return _by_name[key]
+    except KeyError:
+        raise KeyError("Unknown algorithm: {}".format(name)) from None
+
+
+def get_func(name):
+    "A funcao do algoritmo de nome name (importa o modulo, se preciso)"
+    return get(name).load()
@@ -2,7 +2,7 @@
 
 from . import control
 from geocomp import config
-from .prim import area2, left, left_on
+from .prim import collinear, left, left_on
 
 
 class Segment:
@@ -69,7 +69,7 @@ class Segment:
 
     def colinear_with(self, point):
         ''' returns if point is colinear with the segment. '''
-        return area2(self.init, self.to, point) == 0
+        return collinear(self.init, self.to, point)
 
     def has_inside(self, point):
         ''' returns if point is inside the segment. '''
@@ -153,3 +153,18 @@ class Segment:
     @p1.setter
     def p2(self, p2):
         self.init = p2
+
+
+def _nothing(self, *args, **kwargs):
+    return None
+
+# metodos de desenho trocados por set_headless
+_drawing = { name: Segment.__dict__[name] for name in
+             ('hilight', 'unhilight', 'plot', 'hide') }
+
+def set_headless(on):
+    """Liga ou desliga o modo sem interface grafica (veja control.set_headless)
+
+    Ligado, os metodos de desenho de Segment nao fazem nada."""
+    for name, method in _drawing.items():
+        setattr(Segment, name, _nothing if on else method)
@@ -1,8 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
+
 DEBUG = True
 
+# deixa os algoritmos imprimirem os pontos da entrada e os resultados
+#   (para entradas grandes, imprimir custa mais do que o algoritmo)
+VERBOSE = False
+
 # tamanho da area de desenho
 # WIDTH = 500
 WIDTH = 600
@@ -18,6 +24,21 @@ MAX_DELAY = 1000
 # diretorio onde estao os arquivos de entrada
 DATADIR = 'dados'
 
+# guarda os arquivos de entrada ja lidos, no formato binario, em CACHEDIR
+#   (veja geocomp.common.cache); CACHE_SIZE e' o tamanho maximo do cache,
+#   em bytes. Desligado por padrao: ligue aqui ou com cligeocomp.py -c
+CACHE = False
+CACHEDIR = os.path.join(os.path.expanduser('~'), '.cache', 'geocomp')
+CACHE_SIZE = 256 * 2**20
+
+# conta as operacoes primitivas (area2, dist2, ...) feitas pelos algoritmos
+#   desligue para rodar sem o custo da contagem (veja prim.set_counting)
+COUNT_PRIMITIVES = True
+
+# semente dos algoritmos aleatorizados (como closest.grid); None usa uma
+#   semente diferente a cada execucao
+SEED = None
+
 # largura de uma linha
 LINEWIDTH = 2
 # largura de uma linha vertical/horizontal (linha de varredura,
@@ -31,6 +52,11 @@ LINEWIDTH_SPECIAL = 1
 RADIUS = 3
 RADIUS_HILIGHT = 4
 
+# entradas so de pontos com pelo menos LOD_POINTS pontos sao desenhadas
+#   de uma vez, como uma imagem (se o toolkit souber: veja
+#   control.plot_points); com 0, os pontos sao sempre desenhados um a um
+LOD_POINTS = 20000
+
 # cores usadas
 
 # cor de um ponto normal e em destaque
@@ -91,3 +117,5 @@ if DELAY > MAX_DELAY: DELAY = MAX_DELAY
 if LINEWIDTH <= 0: LINEWIDTH = 1
 if RADIUS <= 0: RADIUS = 2
 if RADIUS_HILIGHT <= 0: RADIUS_HILIGHT = 5
+if CACHE_SIZE < 0: CACHE_SIZE = 0
+if LOD_POINTS < 0: LOD_POINTS = 0
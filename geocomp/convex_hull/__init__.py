@@ -1,9 +1,29 @@
-from . import embrulho
-from . import graham
+from geocomp.common import registry
 
 children = [
 	[ 'embrulho', 'Embrulho', 'Embrulho de Presente' ],
-	[ 'graham', 'Graham', 'Graham' ]
+	[ 'graham', 'Graham', 'Graham' ],
+	[ 'monotone', 'Monotone', 'Cadeia Monotona' ],
+	[ 'chan', 'Chan', 'Chan' ],
+	[ 'akl_toussaint', 'GrahamFiltrado', 'Graham + Akl-Toussaint' ],
+	[ 'akl_toussaint', 'EmbrulhoFiltrado', 'Embrulho + Akl-Toussaint' ],
+	[ 'akl_toussaint', 'MonotoneFiltrado', 'Cadeia Monotona + Akl-Toussaint' ],
+	[ 'akl_toussaint', 'ChanFiltrado', 'Chan + Akl-Toussaint' ]
 ]
 
+# tipo da entrada e complexidade de cada algoritmo (veja geocomp.common.registry)
+#   h: numero de vertices do fecho
+input_type = 'points'
+complexity = {
+	'Embrulho': 'O(nh)',
+	'Graham': 'O(n log n)',
+	'Monotone': 'O(n log n)',
+	'Chan': 'O(n log h)',
+	'GrahamFiltrado': 'O(n log n)',
+	'EmbrulhoFiltrado': 'O(nh)',
+	'MonotoneFiltrado': 'O(n log n)',
+	'ChanFiltrado': 'O(n log h)',
+}
+
 __all__ = [a[0] for a in children]
+__getattr__ = registry.lazy (__name__, __all__)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Filtro de Akl-Toussaint
+
+Antes de calcular o fecho, acha os pontos extremos em algumas direcoes
+igualmente espacadas e descarta os pontos estritamente dentro do
+poligono formado por eles, que nao podem ser vertices do fecho. O teste
+e' feito de uma vez sobre todos os pontos, com prim.left_many (exato).
+Qualquer algoritmo de fecho pode usar o filtro, via prefiltro.
+
+Com 8 direcoes (min/max de x, y, x+y e x-y) o poligono e' o octogono
+original de Akl e Toussaint, mas ele cobre no maximo 90% da area de um
+disco; com 16 direcoes (o padrao) sobram so uns 3% dos pontos de um
+disco uniforme.
+"""
+
+import numpy as np
+
+from geocomp.common import control
+from geocomp.common import prim
+from geocomp.common.pointset import PointSet, point_list
+from geocomp.convex_hull import graham
+from geocomp.convex_hull import embrulho
+from geocomp.convex_hull import monotone
+from geocomp.convex_hull import chan
+
+# numero de direcoes usadas (8 da' o octogono)
+DIRECOES = 16
+
+class Fecho(list):
+    """Lista de indices dos vertices do fecho, com o numero de pontos
+    descartados pelo filtro"""
+
+    def __init__(self, indices, descartados, total):
+        list.__init__(self, indices)
+        self.descartados = descartados
+        self.extra_info = 'descartados: %d de %d pontos' % (descartados, total)
+
+def poligonoExtremo(x, y, direcoes=DIRECOES):
+    """Indices dos pontos extremos nas direcoes dadas, em sentido
+    anti-horario a partir do de menor y, sem pontos repetidos"""
+    ret = []
+    for a in np.arange(direcoes) * (2 * np.pi / direcoes) - np.pi / 2:
+        i = int(np.argmax(x * np.cos(a) + y * np.sin(a)))
+        if not ret or (x[i], y[i]) != (x[ret[-1]], y[ret[-1]]):
+            ret.append(i)
+    if len(ret) > 1 and (x[ret[0]], y[ret[0]]) == (x[ret[-1]], y[ret[-1]]):
+        ret.pop()
+    return ret
+
+def filtra(points, direcoes=DIRECOES):
+    """Indices (em ordem) dos pontos de points que nao estao estritamente
+    dentro do poligono extremo"""
+    pointset = points if isinstance(points, PointSet) else PointSet.from_points(points)
+    poly = poligonoExtremo(pointset.x, pointset.y, direcoes)
+    if len(poly) < 3:
+        return np.arange(len(pointset))
+
+    vertices = [pointset[i] for i in poly]
+    plotIds = []
+    for i in range(len(vertices)):
+        a, b = vertices[i - 1], vertices[i]
+        plotIds.append(control.plot_segment(a.x, a.y, b.x, b.y, 'yellow'))
+    control.sleep()
+
+    dentro = np.ones(len(pointset), dtype=bool)
+    for i in range(len(vertices)):
+        dentro &= prim.left_many(vertices[i - 1], vertices[i], pointset)
+
+    for plotId in plotIds:
+        control.plot_delete(plotId)
+    return np.flatnonzero(~dentro)
+
+def prefiltro(alg, direcoes=DIRECOES):
+    """Devolve uma versao de alg que so roda sobre os pontos que passam
+    pelo filtro
+
+    alg deve devolver uma lista de indices na lista que recebeu. A nova
+    versao devolve um Fecho, com os indices na entrada original."""
+    def filtrado(points):
+        n = len(points)
+        if n < 3: return alg(points)
+        restantes = filtra(points, direcoes)
+        points = point_list(points)
+        sub = [points[i] for i in restantes]
+        Hull = alg(sub)
+        if Hull is None: return None
+        return Fecho([int(restantes[j]) for j in Hull], n - len(sub), n)
+
+    filtrado.__name__ = alg.__name__ + 'Filtrado'
+    filtrado.__doc__ = alg.__doc__
+    return filtrado
+
+GrahamFiltrado = prefiltro(graham.Graham)
+EmbrulhoFiltrado = prefiltro(embrulho.Embrulho)
+MonotoneFiltrado = prefiltro(monotone.Monotone)
+ChanFiltrado = prefiltro(chan.Chan)
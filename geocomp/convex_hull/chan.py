@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Algoritmo de Chan
+
+Para um palpite m do tamanho h do fecho, divide os pontos em grupos de
+m pontos, calcula o fecho de cada grupo com o Graham e faz o embrulho de
+presente sobre os fechos dos grupos: a partir de cada vertice, o
+proximo e' o melhor entre as tangentes aos fechos dos grupos, cada uma
+achada por busca binaria. Se o embrulho nao fechar em m passos, o
+palpite e' trocado por m^2. Consome tempo O(n lg h).
+"""
+
+from geocomp.common import control
+from geocomp.common import prim
+from geocomp.common.pointset import point_list
+from geocomp.convex_hull import graham
+
+def insereSegmento(p, q, color='red'):
+    return control.plot_segment(p.x, p.y, q.x, q.y, color)
+
+def pontoExtremo(points, indices):
+    "Indice do ponto de menor y (desempatando pelo menor x)"
+    k = indices[0]
+    for i in indices:
+        p, q = points[i], points[k]
+        if p.y < q.y or (p.y == q.y and p.x < q.x):
+            k = i
+    return k
+
+def distintos(points):
+    "Indices de points, sem os pontos repetidos"
+    vistos = {}
+    for i in range(len(points)):
+        vistos.setdefault((points[i].x, points[i].y), i)
+    return sorted(vistos.values())
+
+def limpaFecho(hull):
+    """Tira os vertices que nao sao extremos (colineares com os vizinhos)
+    de um fecho em sentido anti-horario"""
+    k = len(hull)
+    if k < 3: return hull
+    ret = [hull[i] for i in range(k)
+           if prim.orient2d(hull[i - 1], hull[i], hull[(i + 1) % k]) > 0]
+    if len(ret) < 3:
+        # todos os pontos sao colineares: ficam so os dois extremos
+        ret = [min(hull, key=lambda p: (p.x, p.y)),
+               max(hull, key=lambda p: (p.x, p.y))]
+    return ret
+
+def fechoGrupo(group, plotIds):
+    """Fecho de um grupo de pontos pelo Graham, como lista de pontos em
+    sentido anti-horario sem vertices colineares
+
+    Os ids dos segmentos desenhados sao acrescentados a plotIds."""
+    group = list(group)
+    if len(group) < 3:
+        return limpaFecho(group)
+    graham.preprocessa(group)
+    Hull, ids = graham.varredura(group)
+    plotIds.extend(ids)
+    for i in Hull:
+        group[i].unhilight()
+    return limpaFecho([group[i] for i in Hull])
+
+def tangente(hull, p):
+    """Posicao em hull (convexo, anti-horario, sem colineares, p fora
+    dele) do vertice q tal que todo hull esta a esquerda de pq, ou sobre
+    pq e mais perto de p do que q
+
+    Seja g(i) o sinal de orient2d(p, hull[i], hull[i+1]); q e' o vertice
+    j com g(j-1) <= 0 < g(j). A busca binaria usa tambem o lado de
+    hull[c] em relacao a reta p hull[0]."""
+    k = len(hull)
+    if k <= 2:
+        j = 0
+        for i in range(1, k):
+            o = prim.orient2d(p, hull[j], hull[i])
+            if o < 0 or (o == 0 and prim.dist2(p, hull[i]) > prim.dist2(p, hull[j])):
+                j = i
+        return j
+
+    def g(i):
+        return prim.orient2d(p, hull[i], hull[(i + 1) % k])
+
+    sobe = g(0) > 0
+    if sobe and g(k - 1) <= 0:
+        return 0
+
+    lo, hi = 1, k - 1
+    while lo < hi:
+        c = (lo + hi) // 2
+        lado = prim.orient2d(p, hull[0], hull[c])
+        if sobe:
+            antes = lado <= 0 and g(c) > 0
+        else:
+            antes = lado > 0 or g(c) > 0
+        if antes:
+            hi = c
+        else:
+            lo = c + 1
+    return lo
+
+def embrulho(points, indices, m):
+    """Tenta achar o fecho de points[indices] com grupos de m pontos
+
+    Devolve None se o fecho tiver mais do que m vertices."""
+    plotIds = []
+    hulls = []
+    for s in range(0, len(indices), m):
+        hulls.append(fechoGrupo([points[i] for i in indices[s:s+m]], plotIds))
+    control.sleep()
+
+    # grupo e posicao de cada ponto que e' vertice do fecho do seu grupo
+    onde = {}
+    for g in range(len(hulls)):
+        for v in range(len(hulls[g])):
+            onde[id(hulls[g][v])] = (g, v)
+
+    inicio = points[pontoExtremo(points, indices)]
+    inicio.hilight('cyan')
+    Hull = [inicio]
+    wrapIds = []
+    g, v = onde[id(inicio)]
+    fechou = False
+    for passo in range(m):
+        p = hulls[g][v]
+        candidatos = []
+        for h in range(len(hulls)):
+            if h == g:
+                if len(hulls[h]) > 1:
+                    candidatos.append((h, (v + 1) % len(hulls[h])))
+            else:
+                candidatos.append((h, tangente(hulls[h], p)))
+
+        g, v = candidatos[0]
+        for h, w in candidatos[1:]:
+            q, r = hulls[h][w], hulls[g][v]
+            o = prim.orient2d(p, r, q)
+            if o < 0 or (o == 0 and prim.dist2(p, q) > prim.dist2(p, r)):
+                g, v = h, w
+        q = hulls[g][v]
+        wrapIds.append(insereSegmento(p, q))
+        control.sleep()
+        if q is inicio:
+            fechou = True
+            break
+        q.hilight('cyan')
+        Hull.append(q)
+
+    for plotId in plotIds + wrapIds:
+        control.plot_delete(plotId)
+    if not fechou:
+        for p in Hull:
+            p.unhilight()
+        return None
+    for i in range(len(Hull)):
+        insereSegmento(Hull[i - 1], Hull[i])
+    control.sleep()
+    return Hull
+
+def Chan(points):
+    """Fecho convexo pelo algoritmo de Chan
+
+    Devolve a lista de indices (em points) dos vertices do fecho, em
+    sentido anti-horario, a partir do ponto de menor y (desempatando
+    pelo menor x), como o Embrulho."""
+    points = point_list(points)
+    n = len(points)
+    if n < 3: return None
+
+    indices = distintos(points)
+    if len(indices) < 2: return indices
+
+    t = 1
+    while True:
+        m = min(2 ** (2 ** t), len(indices))
+        Hull = embrulho(points, indices, m)
+        if Hull is not None: break
+        t += 1
+
+    posicao = {id(points[i]): i for i in indices}
+    return [posicao[id(p)] for p in Hull]
@@ -5,6 +5,8 @@ from geocomp.common.segment import Segment
 from geocomp.common import control
 from geocomp.common import prim
 from geocomp.common import guiprim
+from geocomp.common.pointset import point_list
+from geocomp import config
 
 def comparePoint(p1, p2):
 	if (p1.y == p2.y): return p1.x - p2.x
@@ -48,7 +50,9 @@ def imprimePontos(points):
 		print(i, "º: ", points[i], sep="")
 
 def Embrulho(points):
-	imprimePontos(points)
+	points = point_list(points)
+	if config.VERBOSE:
+		imprimePontos(points)
 	Hull = []
 	k = pontoExtremo(points)
 	Hull.append(k)
@@ -63,7 +67,8 @@ def Embrulho(points):
 		# points[i].unhilight(id)
 
 	insereSegmento(Hull[-1], Hull[-0], points)
-	print("Fecho convexo:", Hull, "\n")
+	if config.VERBOSE:
+		print("Fecho convexo:", Hull, "\n")
 	return Hull
 	
 		
@@ -5,6 +5,8 @@ from geocomp.common.segment import Segment
 from geocomp.common import control
 from geocomp.common import prim
 from geocomp.common import guiprim
+from geocomp.common.pointset import point_list
+from geocomp import config
 
 # Algoritmo de ordenação
 def swap(v, i , j):
@@ -110,16 +112,12 @@ def atualizaHull(Hull, points, plotIds, k):
     plotIds[-2] = insereSegmento(points, Hull[-2], Hull[-1])
     control.sleep()
 
-def Graham(points):
-    print("Coleção de pontos:")
-    imprimePontos(points)
-    preprocessa(points)
-    print("\nApós ordenação:")
-    imprimePontos(points)
+def varredura(points):
+    """Varredura de Graham sobre points ja preprocessados (n >= 3)
 
+    Devolve o fecho (indices em points) e os ids dos segmentos dele que
+    ficaram desenhados."""
     n = len(points)
-    if n < 3: return None
-
     Hull = [0,1,2]
     plotIds = plotHull(points)
     for k in range(3,n):
@@ -127,5 +125,31 @@ def Graham(points):
     control.plot_delete(plotIds[-1])
     plotIds[-1] = insereSegmento(points, -1, 0)
     control.sleep()
-    print(Hull)
+    return Hull, plotIds
+
+def Graham(points):
+    """Fecho convexo pelo algoritmo de Graham
+
+    Devolve a lista de indices (em points) dos vertices do fecho, em
+    sentido anti-horario, a partir do ponto de menor y (desempatando
+    pelo menor x), como o Embrulho. A ordenacao e' feita numa copia:
+    a lista recebida nao e' alterada."""
+    original = point_list(points)
+    posicao = {id(p): i for i, p in enumerate(original)}
+    points = list(original)
+    if config.VERBOSE:
+        print("Coleção de pontos:")
+        imprimePontos(points)
+    preprocessa(points)
+    if config.VERBOSE:
+        print("\nApós ordenação:")
+        imprimePontos(points)
+
+    n = len(points)
+    if n < 3: return None
+
+    Hull, plotIds = varredura(points)
+    Hull = [posicao[id(points[i])] for i in Hull]
+    if config.VERBOSE:
+        print(Hull)
     return Hull
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Algoritmo da cadeia monotona (Andrew)
+
+Ordena os pontos lexicograficamente (x, depois y) uma unica vez, com o
+sort do Python, e constroi as cadeias inferior e superior do fecho com
+uma pilha. Consome tempo O(n lg n) no pior caso, inclusive quando a
+entrada ja esta ordenada ou tem muitos pontos colineares.
+"""
+
+from geocomp.common import control
+from geocomp.common import prim
+from geocomp.common.pointset import point_list
+
+def insereSegmento(points, i, j, color='red'):
+    return control.plot_segment(points[i].x, points[i].y, points[j].x, points[j].y, color)
+
+def pontoExtremo(points, hull):
+    "Posicao em hull do ponto de menor y (desempatando pelo menor x)"
+    k = 0
+    for i in range(1, len(hull)):
+        p, q = points[hull[i]], points[hull[k]]
+        if p.y < q.y or (p.y == q.y and p.x < q.x):
+            k = i
+    return k
+
+def cadeia(points, order, plotIds):
+    """Cadeia convexa dos pontos na ordem dada
+
+    Os pontos que fazem uma curva para a direita (ou ficam sobre a
+    cadeia) sao desempilhados."""
+    chain = []
+    for k in order:
+        while len(chain) >= 2 and\
+              prim.right_on(points[chain[-2]], points[chain[-1]], points[k]):
+            chain.pop()
+            control.plot_delete(plotIds.pop())
+            control.sleep()
+        if len(chain) >= 1:
+            plotIds.append(insereSegmento(points, chain[-1], k, 'blue'))
+            control.sleep()
+        chain.append(k)
+    return chain
+
+def Monotone(points):
+    """Fecho convexo pela cadeia monotona
+
+    Devolve a lista de indices (em points) dos vertices do fecho, em
+    sentido anti-horario, a partir do ponto de menor y (desempatando
+    pelo menor x), como o Embrulho."""
+    points = point_list(points)
+    n = len(points)
+    if n < 3: return None
+
+    order = sorted(range(n), key=lambda i: (points[i].x, points[i].y))
+
+    plotIds = []
+    lower = cadeia(points, order, plotIds)
+    upper = cadeia(points, order[::-1], plotIds)
+    Hull = lower[:-1] + upper[:-1]
+    first, last = points[order[0]], points[order[-1]]
+    if (first.x, first.y) == (last.x, last.y):
+        # todos os pontos coincidem
+        Hull = Hull[:1]
+
+    for plotId in plotIds:
+        control.plot_delete(plotId)
+    for i in range(len(Hull)):
+        insereSegmento(points, Hull[i - 1], Hull[i])
+        points[Hull[i]].hilight('cyan')
+    control.sleep()
+
+    k = pontoExtremo(points, Hull)
+    return Hull[k:] + Hull[:k]
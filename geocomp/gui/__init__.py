@@ -2,6 +2,10 @@
 """Implementacoes das operacoes graficas usadas nos algoritmos
 
 Sub-modulos:
-tk:    implementacao usando Tk
-gnome: implementacao usando GNOME
+tk:       implementacao usando Tk
+threaded: implementacao usando Tk, com o algoritmo numa thread separada
+gnome:    implementacao usando GNOME
+dummy:    implementacao que nao desenha nada
+recorder: implementacao que grava um trace da visualizacao
+replay:   anima em Tk um trace gravado pelo recorder
 """
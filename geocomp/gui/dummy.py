@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 """Implementacao "dummy" das operacoes graficas"""
 
+# nao desenha nada: init_display liga o modo sem interface grafica
+HEADLESS = True
+
 def init_display (app):
 	pass
 
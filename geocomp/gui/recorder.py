@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""Implementacao das operacoes graficas que grava um trace
+
+Em vez de desenhar, cada operacao (desenho, apagamento, sleep) e'
+gravada num arquivo binario compacto, e o algoritmo roda sem esperar
+pela interface. O trace pode depois ser animado por geocomp.gui.replay.
+Para usar, passe o nome do arquivo como master:
+
+    geocomp.init_display (recorder, 'saida.trace')
+    geocomp.run_algorithm (alg, input)
+    recorder.close ()
+
+Formato: MAGIC, versao (uint32) e uma sequencia de registros, cada um
+com um byte de codigo seguido dos argumentos, little-endian (veja OPS).
+As cores sao gravadas uma vez (registro COLOR) e depois referidas pelo
+indice.
+"""
+
+import struct
+
+MAGIC = b'GEOTRACE'
+VERSION = 1
+HEADER = struct.Struct('<8sI')
+
+# codigo -> (nome da funcao grafica, formato dos argumentos)
+#   I: id, d: coordenada, H: cor, f: raio ou largura, B: booleano
+CONFIG = 1
+COLOR = 2
+SLEEP = 3
+DELETE = 4
+CURVE = 16
+OPS = {
+	CONFIG: ('config_canvas', '<dddd'),
+	COLOR: (None, '<HH'),
+	SLEEP: ('sleep', ''),
+	DELETE: ('plot_delete', '<I'),
+	5: ('plot_disc', '<IddHf'),
+	6: ('plot_circle', '<IddHd'),
+	7: ('plot_disc_grande', '<IddHd'),
+	8: ('plot_segment', '<IddddHf'),
+	9: ('plot_line', '<IddddHf'),
+	10: ('plot_ray', '<IddddHf'),
+	11: ('plot_vert_line', '<IdHf'),
+	12: ('plot_horiz_line', '<IdHf'),
+	13: ('plot_vert_ray', '<IddBHf'),
+	14: ('plot_horiz_ray', '<IddBHf'),
+	15: ('plot_parabola', '<IdddddIHf'),
+	CURVE: ('plot_curve', '<IIHf'),
+}
+STRUCTS = {code: struct.Struct(fmt) for code, (name, fmt) in OPS.items()}
+# registros completos (codigo e argumentos), para gravar com um so pack
+RECORDS = {code: struct.Struct('<B' + fmt[1:]).pack
+           for code, (name, fmt) in OPS.items()}
+
+file = None
+colors = {}
+last_id = 0
+
+
+def init_display (master):
+	"Comeca a gravar no arquivo master"
+	global file, colors, last_id
+	close()
+	file = open(master, 'wb')
+	file.write(HEADER.pack(MAGIC, VERSION))
+	colors = {}
+	last_id = 0
+
+def close ():
+	"Termina o trace"
+	global file
+	if file is not None:
+		file.close()
+		file = None
+
+def _color (color):
+	index = colors.get(color)
+	if index is None:
+		index = colors[color] = len(colors)
+		data = color.encode()
+		file.write(RECORDS[COLOR](COLOR, index, len(data)) + data)
+	return index
+
+def _write (code, *args):
+	file.write(RECORDS[code](code, *args))
+
+def _new_id ():
+	global last_id
+	last_id += 1
+	return last_id
+
+def get_canvas ():
+	pass
+
+def update ():
+	pass
+
+def sleep ():
+	file.write(RECORDS[SLEEP](SLEEP))
+
+def hide_algorithm ():
+	return 0
+
+def config_canvas (minx, maxx, miny, maxy):
+	_write(CONFIG, minx, maxx, miny, maxy)
+
+def plot_delete (id):
+	if id:
+		_write(DELETE, id)
+
+def plot_disc (x, y, color, r):
+	i = _new_id()
+	_write(5, i, x, y, _color(color), r)
+	return i
+
+def plot_circle (x, y, color, r):
+	i = _new_id()
+	_write(6, i, x, y, _color(color), r)
+	return i
+
+def plot_disc_grande (x, y, color, r):
+	i = _new_id()
+	_write(7, i, x, y, _color(color), r)
+	return i
+
+def plot_segment (x0, y0, x1, y1, color, linewidth):
+	i = _new_id()
+	_write(8, i, x0, y0, x1, y1, _color(color), linewidth)
+	return i
+
+def plot_line (x0, y0, x1, y1, color, linewidth):
+	i = _new_id()
+	_write(9, i, x0, y0, x1, y1, _color(color), linewidth)
+	return i
+
+def plot_ray (x0, y0, x1, y1, color, linewidth):
+	i = _new_id()
+	_write(10, i, x0, y0, x1, y1, _color(color), linewidth)
+	return i
+
+def plot_vert_line (x, color, linewidth):
+	i = _new_id()
+	_write(11, i, x, _color(color), linewidth)
+	return i
+
+def plot_horiz_line (y, color, linewidth):
+	i = _new_id()
+	_write(12, i, y, _color(color), linewidth)
+	return i
+
+def plot_vert_ray (x0, y0, increasing, color, linewidth):
+	i = _new_id()
+	_write(13, i, x0, y0, bool(increasing), _color(color), linewidth)
+	return i
+
+def plot_horiz_ray (x0, y0, increasing, color, linewidth):
+	i = _new_id()
+	_write(14, i, x0, y0, bool(increasing), _color(color), linewidth)
+	return i
+
+def plot_parabola (y, px, py, startx, endx, steps, color, linewidth):
+	i = _new_id()
+	_write(15, i, y, px, py, startx, endx, steps, _color(color), linewidth)
+	return i
+
+def plot_curve (xy, color, linewidth):
+	i = _new_id()
+	_write(CURVE, i, len(xy), _color(color), linewidth)
+	file.write(struct.pack('<%dd' % len(xy), *xy))
+	return i
+
+
+def read (filename):
+	"""Le um trace
+
+	Devolve uma lista de operacoes (nome da funcao grafica, id, argumentos
+	da funcao): id e' None para config_canvas e sleep, e, para
+	plot_delete, e' o id apagado (e argumentos e' vazio)."""
+	with open(filename, 'rb') as f:
+		data = f.read()
+	magic, version = HEADER.unpack_from(data, 0)
+	if magic != MAGIC:
+		raise ValueError("Not a geocomp trace: {}".format(filename))
+	if version != VERSION:
+		raise ValueError("Unsupported trace version: {}".format(version))
+
+	ops = []
+	names = []
+	pos = HEADER.size
+	while pos < len(data):
+		code = data[pos]
+		pos += 1
+		if code not in OPS:
+			raise ValueError("Invalid trace record at byte {}".format(pos - 1))
+		name, fmt = OPS[code]
+		s = STRUCTS[code]
+		args = s.unpack_from(data, pos)
+		pos += s.size
+		if code == COLOR:
+			index, length = args
+			names.append(data[pos:pos + length].decode())
+			pos += length
+		elif code == CONFIG:
+			ops.append((name, None, args))
+		elif code == SLEEP:
+			ops.append((name, None, ()))
+		elif code == DELETE:
+			ops.append((name, args[0], ()))
+		elif code == CURVE:
+			i, n, color, linewidth = args
+			xy = list(struct.unpack_from('<%dd' % n, data, pos))
+			pos += 8 * n
+			ops.append((name, i, (xy, names[color], linewidth)))
+		else:
+			i, args = args[0], list(args[1:])
+			# troca o indice da cor pelo nome
+			k = fmt.index('H') - 2
+			args[k] = names[args[k]]
+			ops.append((name, i, tuple(args)))
+	return ops
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""Anima em Tk um trace gravado por geocomp.gui.recorder
+
+    python -m geocomp.gui.replay arquivo.trace
+
+Cada passo da animacao vai ate o proximo sleep do algoritmo. Da para
+pausar, andar um passo para frente ou para tras, pular para qualquer
+passo (pela barra de posicao) e mudar a velocidade (em passos por
+segundo) sem rodar o algoritmo de novo.
+
+Para pular rapido, Trace guarda o estado da tela (os objetos desenhados
+e ainda nao apagados) em CHECKPOINTS pontos do trace: para chegar num
+passo, parte do ultimo checkpoint antes dele e aplica so as operacoes
+que faltam.
+"""
+
+import sys
+
+from geocomp import config
+from geocomp.gui import tk
+from geocomp.gui import recorder
+
+# numero de estados guardados por Trace
+CHECKPOINTS = 64
+
+# maior numero de atualizacoes da tela por segundo durante a animacao
+MAX_FPS = 60
+
+
+class Trace:
+    "As operacoes de um trace, divididas em passos"
+
+    def __init__ (self, ops):
+        self.ops = ops
+        # steps[k]: indice da primeira operacao depois do k-esimo sleep
+        self.steps = [0]
+        for i, (name, id, args) in enumerate (ops):
+            if name == 'sleep':
+                self.steps.append (i + 1)
+        if self.steps[-1] != len (ops):
+            self.steps.append (len (ops))
+
+        self.checkpoints = []
+        every = max (1, len (ops) // CHECKPOINTS)
+        canvas, live = None, {}
+        for i, op in enumerate (ops):
+            if i % every == 0:
+                self.checkpoints.append ((i, canvas, dict (live)))
+            canvas = apply (op, canvas, live)
+
+    def __len__ (self):
+        "Numero de passos"
+        return len (self.steps)
+
+    def state (self, step):
+        """Estado da tela no passo step: os argumentos do ultimo
+        config_canvas (ou None) e um dicionario id -> (funcao, argumentos)
+        dos objetos desenhados, na ordem em que foram desenhados"""
+        end = self.steps[step]
+        start, canvas, live = 0, None, {}
+        for i, c, l in self.checkpoints:
+            if i > end:
+                break
+            start, canvas, live = i, c, l
+        live = dict (live)
+        for op in self.ops[start:end]:
+            canvas = apply (op, canvas, live)
+        return canvas, live
+
+
+def apply (op, canvas, live):
+    """Aplica op ao estado (canvas, live) (veja Trace.state); live e'
+    modificado e o novo canvas, devolvido"""
+    name, id, args = op
+    if name == 'config_canvas':
+        live.clear ()
+        return args
+    if name == 'plot_delete':
+        live.pop (id, None)
+    elif name != 'sleep':
+        live[id] = (name, args)
+    return canvas
+
+
+class Player:
+    "Janela que anima um Trace"
+
+    def __init__ (self, trace, title = 'Geocomp'):
+        from tkinter import Tk, Frame, Canvas, Button, Scale, Label
+        from tkinter import IntVar, BOTH, X, LEFT, RIGHT, HORIZONTAL
+
+        self.trace = trace
+        self.step = 0
+        self.playing = False
+        self.after_id = None
+        # id no trace -> id no canvas
+        self.ids = {}
+
+        self.tk = Tk ()
+        self.tk.title (title)
+        self.tk.bind ('<Control-q>', lambda event: self.tk.destroy ())
+        self.tk.bind ('<space>', lambda event: self.toggle ())
+        self.tk.bind ('<Left>', lambda event: self.seek (self.step - 1))
+        self.tk.bind ('<Right>', lambda event: self.seek (self.step + 1))
+
+        self.canvas = Canvas (self.tk,
+                      width = config.WIDTH,
+                      height = config.HEIGHT,
+                      bg = 'black')
+        self.canvas.pack (fill = BOTH, expand = 1)
+
+        controls = Frame (self.tk)
+        controls.pack (fill = X)
+        Button (controls, text = '<', width = 3,
+                command = lambda: self.seek (self.step - 1)).pack (side = LEFT)
+        self.play_button = Button (controls, text = 'Play', width = 6,
+                                   command = self.toggle)
+        self.play_button.pack (side = LEFT)
+        Button (controls, text = '>', width = 3,
+                command = lambda: self.seek (self.step + 1)).pack (side = LEFT)
+
+        self.speed = IntVar ()
+        self.speed.set (config.DELAY and 1000 // config.DELAY or MAX_FPS)
+        Scale (controls, from_ = 1, to = 1000, orient = HORIZONTAL,
+               label = 'Passos/s', variable = self.speed).pack (side = RIGHT)
+
+        self.position = IntVar ()
+        self.scale = Scale (controls, from_ = 0, to = len (trace) - 1,
+                            orient = HORIZONTAL, showvalue = 0,
+                            variable = self.position,
+                            command = lambda value: self.seek (int (value)))
+        self.scale.pack (side = LEFT, fill = X, expand = 1)
+        self.label = Label (controls, width = 16)
+        self.label.pack (side = LEFT)
+
+        tk.init_display (self)
+        self.tk.update_idletasks ()
+        self.redraw ()
+
+    def seek (self, step):
+        "Mostra o passo step"
+        step = max (0, min (step, len (self.trace) - 1))
+        ops = self.trace.ops
+        start, end = self.trace.steps[self.step], self.trace.steps[step]
+        if start <= end <= start + len (ops) // CHECKPOINTS + 1:
+            for op in ops[start:end]:
+                self.draw (op)
+            tk.flush ()
+            self.step = step
+        else:
+            self.step = step
+            self.redraw ()
+        self.show_position ()
+
+    def redraw (self):
+        "Redesenha o passo atual a partir do estado guardado no Trace"
+        canvas, live = self.trace.state (self.step)
+        tk.flush ()
+        self.canvas.delete ('all')
+        self.ids = {}
+        if canvas is not None:
+            tk.config_canvas (*canvas)
+        for id, (name, args) in live.items ():
+            self.ids[id] = getattr (tk, name) (*args)
+        tk.flush ()
+        self.show_position ()
+
+    def draw (self, op):
+        "Aplica op na tela"
+        name, id, args = op
+        if name == 'config_canvas':
+            tk.config_canvas (*args)
+            self.ids = {}
+        elif name == 'plot_delete':
+            if id in self.ids:
+                tk.plot_delete (self.ids.pop (id))
+        elif name != 'sleep':
+            self.ids[id] = getattr (tk, name) (*args)
+
+    def show_position (self):
+        self.position.set (self.step)
+        self.label['text'] = '%d / %d' % (self.step, len (self.trace) - 1)
+
+    def toggle (self):
+        "Comeca ou pausa a animacao"
+        self.playing = not self.playing
+        self.play_button['text'] = self.playing and 'Pause' or 'Play'
+        if self.after_id is not None:
+            self.tk.after_cancel (self.after_id)
+            self.after_id = None
+        if self.playing:
+            if self.step == len (self.trace) - 1:
+                self.seek (0)
+            self.tick ()
+
+    def tick (self):
+        # acima de MAX_FPS passos por segundo, anda varios passos de cada vez
+        speed = max (1, self.speed.get ())
+        steps = max (1, speed // MAX_FPS)
+        self.seek (self.step + steps)
+        if self.step == len (self.trace) - 1:
+            self.toggle ()
+            return
+        self.after_id = self.tk.after (max (1, 1000 * steps // speed), self.tick)
+
+    def mainloop (self):
+        self.tk.mainloop ()
+
+
+def main (argv):
+    if len (argv) != 2:
+        print ('uso: python -m geocomp.gui.replay arquivo.trace', file = sys.stderr)
+        return 2
+    trace = Trace (recorder.read (argv[1]))
+    Player (trace, argv[1]).mainloop ()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit (main (sys.argv))
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+"""Implementacao das operacoes graficas em Tk com o algoritmo numa
+thread separada
+
+O algoritmo (iniciado por start) roda numa thread de trabalho, e as
+operacoes graficas que ele chama so colocam um comando numa fila
+limitada (QUEUE_SIZE comandos: quando ela enche, o algoritmo espera,
+ate a fila andar ou ate stop ser chamado).
+A thread do Tk esvazia a fila FPS vezes por segundo e desenha os
+comandos com geocomp.gui.tk, descartando antes o que nao chegaria a
+aparecer: tudo o que vem antes de um config_canvas e os itens criados e
+apagados no mesmo quadro. Assim a janela continua respondendo enquanto
+o algoritmo roda, e um desenho lento nao atrasa o algoritmo.
+
+Se desenhar um comando levanta uma excecao, o algoritmo e' interrompido
+(veja stop) e a excecao e' passada para a funcao chamada no fim, como
+as excecoes do proprio algoritmo.
+
+O sleep do algoritmo espera na thread de trabalho (o delay, ou o proximo
+step, no modo passo a passo) sem bloquear o Tk. Chamadas feitas na
+propria thread do Tk (por exemplo, plot_input ao abrir um arquivo) sao
+desenhadas direto (no proximo update), depois dos comandos ainda na
+fila.
+
+master e' como em geocomp.gui.tk (canvas, delay, step_by_step, show_var
+e tk)."""
+
+import queue
+import itertools
+import threading
+import time
+
+from geocomp.gui import tk
+from geocomp.common import guicontrol
+
+# maximo de comandos na fila
+QUEUE_SIZE = 10000
+
+# quadros desenhados por segundo
+FPS = 60
+
+master = None
+commands = None
+# id devolvido ao algoritmo -> id do item no canvas
+ids = {}
+new_id = None
+tk_thread = None
+
+# copias, para a thread de trabalho, do estado dos controles do Tk
+delay = 0
+step_by_step = 0
+hidden = 0
+step_event = threading.Event ()
+
+# thread de trabalho, funcao chamada no fim e resultado (ou excecao)
+worker = None
+done = None
+outcome = None
+# primeira excecao levantada ao desenhar os comandos do algoritmo
+draw_error = None
+# o algoritmo deve parar (veja stop)
+stopped = False
+
+class Stopped (Exception):
+	"O algoritmo foi interrompido por stop"
+
+# comandos descartados por coalesce desde init_display
+dropped = 0
+
+def init_display (master):
+	global commands, new_id, tk_thread, dropped
+	globals()['master'] = master
+	tk.init_display (master)
+	commands = queue.Queue (QUEUE_SIZE)
+	ids.clear ()
+	new_id = itertools.count (1)
+	tk_thread = threading.get_ident ()
+	dropped = 0
+	_poll ()
+	master.tk.after (1000 // FPS, _frame)
+
+def start (alg, input, callback):
+	"""Roda geocomp.run_algorithm (alg, input) numa thread de trabalho
+
+	Quando o algoritmo termina e tudo o que ele desenhou ja esta na
+	tela, chama (na thread do Tk) callback (result, error): o Result de
+	run_algorithm e None, ou None e a excecao levantada."""
+	global worker, done, outcome, draw_error, stopped, hidden
+	hidden = tk.hide_algorithm ()
+	_poll ()
+	step_event.clear ()
+	done = callback
+	outcome = None
+	draw_error = None
+	stopped = False
+	worker = threading.Thread (target = _work, args = (alg, input),
+	                           daemon = True)
+	worker.start ()
+
+def step ():
+	"Libera o proximo passo do algoritmo, no modo passo a passo"
+	step_event.set ()
+
+def stop ():
+	"""Interrompe o algoritmo: a proxima operacao grafica (ou sleep) dele
+	levanta Stopped, mesmo que ele esteja esperando a fila andar"""
+	global stopped
+	stopped = True
+	step_event.set ()
+
+def _work (alg, input):
+	global outcome
+	try:
+		outcome = (guicontrol.run_algorithm (alg, input), None)
+	except Exception as e:
+		outcome = (None, e)
+
+def _poll ():
+	"Copia o estado dos controles do Tk (so na thread do Tk)"
+	global delay, step_by_step
+	delay = master.delay.get ()
+	step_by_step = master.step_by_step.get ()
+
+def _frame ():
+	"""Desenha os comandos da fila e agenda o proximo quadro (mesmo que
+	desenhar, ou a funcao chamada no fim, levante uma excecao)"""
+	global worker
+	try:
+		_poll ()
+		_draw ()
+		if worker is not None and not worker.is_alive ():
+			worker = None
+			_draw ()
+			result, error = outcome
+			if draw_error is not None:
+				result, error = None, draw_error
+			done (result, error)
+	finally:
+		master.tk.after (1000 // FPS, _frame)
+
+def _draw ():
+	"""Desenha a fila; se der erro, guarda a excecao e interrompe o
+	algoritmo"""
+	global draw_error
+	try:
+		_drain ()
+		tk.flush ()
+	except Exception as e:
+		if draw_error is None:
+			draw_error = e
+		stop ()
+
+def _drain ():
+	"Desenha tudo o que esta na fila agora"
+	ops = []
+	try:
+		while True:
+			ops.append (commands.get_nowait ())
+	except queue.Empty:
+		pass
+	for op in coalesce (ops):
+		_apply (op)
+
+def coalesce (ops):
+	"""Os comandos de ops que aparecem na tela: descarta o que vem antes do
+	ultimo config_canvas e os itens criados e apagados dentro de ops"""
+	global dropped
+	n = len (ops)
+	for i in range (len (ops) - 1, -1, -1):
+		if ops[i][0] == 'config_canvas':
+			ops = ops[i:]
+			break
+	created = set (id for name, id, args in ops
+	               if name != 'plot_delete' and id is not None)
+	dead = set (id for name, id, args in ops
+	            if name == 'plot_delete' and id in created)
+	if dead:
+		ops = [ op for op in ops if op[1] not in dead ]
+	dropped += n - len (ops)
+	return ops
+
+def _apply (op):
+	name, id, args = op
+	if name == 'config_canvas':
+		tk.config_canvas (*args)
+		ids.clear ()
+	elif name == 'plot_delete':
+		tk.plot_delete (ids.pop (id, 0))
+	else:
+		ids[id] = getattr (tk, name) (*args)
+
+def _put (name, id, args):
+	if threading.get_ident () == tk_thread:
+		_drain ()
+		_apply ((name, id, args))
+		return id
+	while True:
+		if stopped:
+			raise Stopped ()
+		try:
+			commands.put ((name, id, args), timeout = 0.05)
+			return id
+		except queue.Full:
+			pass
+
+def _plot (name, args):
+	return _put (name, next (new_id), args)
+
+def get_canvas ():
+	return master.canvas
+
+def update ():
+	# a thread de trabalho nao espera o desenho
+	if threading.get_ident () == tk_thread:
+		tk.flush ()
+
+def sleep ():
+	if threading.get_ident () == tk_thread:
+		return
+	if step_by_step:
+		# o passo a passo pode ser desligado enquanto esperamos
+		while step_by_step and not step_event.wait (0.05):
+			pass
+		step_event.clear ()
+	elif delay:
+		time.sleep (delay / 1000)
+	if stopped:
+		raise Stopped ()
+
+def hide_algorithm ():
+	return hidden
+
+def config_canvas (minx, maxx, miny, maxy):
+	_put ('config_canvas', None, (minx, maxx, miny, maxy))
+
+def plot_delete (id):
+	if id:
+		_put ('plot_delete', id, ())
+
+def plot_disc (x, y, color, r):
+	return _plot ('plot_disc', (x, y, color, r))
+
+def plot_segment (x0, y0, x1, y1, color, linewidth):
+	return _plot ('plot_segment', (x0, y0, x1, y1, color, linewidth))
+
+def plot_points (x, y, color, r):
+	return _plot ('plot_points', (x, y, color, r))
+
+def plot_line (x0, y0, x1, y1, color, linewidth):
+	return _plot ('plot_line', (x0, y0, x1, y1, color, linewidth))
+
+def plot_ray (x0, y0, x1, y1, color, linewidth):
+	return _plot ('plot_ray', (x0, y0, x1, y1, color, linewidth))
+
+def plot_vert_line (x, color, linewidth):
+	return _plot ('plot_vert_line', (x, color, linewidth))
+
+def plot_horiz_line (y, color, linewidth):
+	return _plot ('plot_horiz_line', (y, color, linewidth))
+
+def plot_parabola (y, px, py, startx, endx, steps, color, linewidth):
+	return _plot ('plot_parabola', (y, px, py, startx, endx, steps, color,
+	                                linewidth))
+
+def plot_circle (x, y, color, r):
+	return _plot ('plot_circle', (x, y, color, r))
+
+def plot_curve (xy, color, linewidth):
+	return _plot ('plot_curve', (list (xy), color, linewidth))
+
+def plot_disc_grande (x, y, color, r):
+	return _plot ('plot_disc_grande', (x, y, color, r))
+
+def plot_vert_ray (x0, y0, increasing, color, linewidth):
+	return _plot ('plot_vert_ray', (x0, y0, increasing, color, linewidth))
+
+def plot_horiz_ray (x0, y0, increasing, color, linewidth):
+	return _plot ('plot_horiz_ray', (x0, y0, increasing, color, linewidth))
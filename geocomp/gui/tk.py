@@ -2,24 +2,98 @@
 """Implementacao das operacoes graficas em Tk.
 
 Esse modulo nao deve ser usado diretamente. Para isso,
-veja geocomp.common.control"""
+veja geocomp.common.control
+
+Os itens nao sao criados no canvas um a um: os comandos Tcl ficam em
+pending e sao executados de uma vez por flush, chamado por update e
+sleep (e portanto, entre freeze_update e thaw_update, so no thaw). Como
+o Tk numera os itens de um canvas em sequencia, o id de um item e'
+conhecido antes dele ser criado; por isso, todos os itens do canvas
+devem ser criados por este modulo.
+
+Itens que caem inteiros fora da area visivel nao sao criados (o id
+devolvido e' 0), e plot_points desenha um conjunto grande de pontos
+como uma unica imagem."""
 
 from math import fabs
 
+import numpy as np
+
 master = None
 canvas = None
 
+# comandos Tcl ainda nao executados (veja flush)
+pending = []
+# id que o Tk vai dar ao proximo item criado (None: ainda nao sabemos)
+next_id = None
+# id do ultimo item criado em pending
+last_id = None
+# tamanho da area visivel, em pixels (None: ainda nao configurada)
+view = None
+# imagens de plot_points (o Tk nao guarda uma referencia a elas)
+images = {}
+
 def init_display (master):
+	global next_id, pending, view
 	globals()['canvas'] = master.canvas
 	globals()['master'] = master
+	pending = []
+	next_id = None
+	view = None
+	images.clear ()
 
 def get_canvas ():
+	flush ()
 	return canvas
 
+def flush ():
+	"Executa os comandos pendentes"
+	global pending, next_id, last_id
+	if not pending:
+		return
+	script = '\n'.join (pending)
+	pending = []
+	expected, last_id = last_id, None
+	try:
+		result = canvas.tk.eval (script)
+	except Exception:
+		next_id = None
+		raise
+	if expected is not None and result != str (expected):
+		next_id = None
+		raise RuntimeError ("Tk canvas item ids out of sync: expected %s, got %s"
+		                    % (expected, result))
+
+def _create (kind, coords, options):
+	"Cria (ou deixa pendente) um item do canvas e devolve o seu id"
+	global next_id, last_id
+	if next_id is None:
+		flush ()
+		id = canvas.tk.getint (canvas.tk.eval ('%s create %s %s %s' % (
+			canvas, kind, ' '.join (map (str, coords)), options)))
+		next_id = id + 1
+		return id
+	id = next_id
+	next_id = id + 1
+	last_id = id
+	pending.append ('%s create %s %s %s' % (canvas, kind,
+	                                         ' '.join (map (str, coords)), options))
+	return id
+
+def _visible (x0, y0, x1, y1):
+	"Se o retangulo (em pixels) de cantos (x0,y0) e (x1,y1) e' visivel"
+	if view is None:
+		return True
+	width, height = view
+	return (max (x0, x1) >= 0 and min (x0, x1) <= width and
+	        max (y0, y1) >= 0 and min (y0, y1) <= height)
+
 def update ():
+	flush ()
 	canvas.update ()
 
 def sleep ():
+	flush ()
 	if master.step_by_step.get ():
 		master.tk.wait_variable (master.step)
 	else:
@@ -27,15 +101,55 @@ def sleep ():
 		master.tk.mainloop ()
 
 def plot_disc (x, y, color, r):
-	plot_id = canvas.create_oval (canvas.r2cx(x)-r, canvas.r2cy(y)-r, 
-					canvas.r2cx(x)+r, canvas.r2cy(y)+r, fill=color)
-	return plot_id
+	x = canvas.r2cx (x)
+	y = canvas.r2cy (y)
+	if not _visible (x - r, y - r, x + r, y + r):
+		return 0
+	return _create ('oval', (x - r, y - r, x + r, y + r), '-fill {%s}' % color)
 
 def plot_segment (x0, y0, x1, y1, color, linewidth):
-	lineto_id = canvas.create_line (canvas.r2cx(x0), canvas.r2cy(y0), 
-					   canvas.r2cx(x1), canvas.r2cy(y1), 
-					   fill=color, width=linewidth)
-	return lineto_id
+	x0 = canvas.r2cx (x0)
+	y0 = canvas.r2cy (y0)
+	x1 = canvas.r2cx (x1)
+	y1 = canvas.r2cy (y1)
+	if not _visible (x0, y0, x1, y1):
+		return 0
+	return _create ('line', (x0, y0, x1, y1),
+	                '-fill {%s} -width %s' % (color, linewidth))
+
+def plot_points (x, y, color, r):
+	"""Desenha os pontos (x[i], y[i]) como discos de raio r numa unica
+	imagem, abaixo de todos os outros itens"""
+	from tkinter import PhotoImage
+
+	width, height = view
+	x0, dx, y0, dy = _transform
+	x = np.asarray (x, dtype=float)
+	y = np.asarray (y, dtype=float)
+	cx = ((x - x0) * width*0.8 / dx + 0.1*width).astype (int)
+	cy = height - ((y - y0) * height*0.8 / dy + 0.1*height).astype (int)
+	inside = (cx >= 0) & (cx < width) & (cy >= 0) & (cy < height)
+
+	centers = np.zeros ((height + 2*r, width + 2*r), dtype=bool)
+	centers[cy[inside] + r, cx[inside] + r] = True
+	mask = np.zeros ((height, width), dtype=bool)
+	for i in range (-r, r + 1):
+		for j in range (-r, r + 1):
+			if i*i + j*j <= r*r:
+				mask |= centers[r + i:r + i + height, r + j:r + j + width]
+
+	rgb = np.empty ((height, width, 3), dtype=np.uint8)
+	rgb[...] = [ c >> 8 for c in canvas.winfo_rgb (canvas['background']) ]
+	rgb[mask] = [ c >> 8 for c in canvas.winfo_rgb (color) ]
+	ppm = b'P6 %d %d 255\n' % (width, height) + rgb.tobytes ()
+
+	flush ()
+	image = PhotoImage (master=canvas, data=ppm, format='ppm')
+	id = _create ('image', (0, 0), '-anchor nw -image %s' % image)
+	flush ()
+	canvas.tag_lower (id)
+	images[id] = image
+	return id
 
 def find_intersection_points(x0, y0, x1, y1):
 	"""retorna os dois pontos que a reta passando pelos pontos dos argumentos 
@@ -110,8 +224,8 @@ def find_intersection_points(x0, y0, x1, y1):
 
 def plot_line (x0, y0, x1, y1, color, linewidth):
 	x2, y2, x3, y3 = find_intersection_points(x0, y0, x1, y1) 
-	lineto_id = canvas.create_line (int (x2), int (y2), int (x3), int (y3), 
-					   fill=color, width=linewidth)
+	lineto_id = _create ('line', (int (x2), int (y2), int (x3), int (y3)),
+	                     '-fill {%s} -width %s' % (color, linewidth))
 	return lineto_id
 
 def inner_product(x0, y0, x1, y1):
@@ -131,26 +245,26 @@ def plot_ray (x0, y0, x1, y1, color, linewidth):
 	if inner_product((x2 - x0), (y2 - y0), (x1 - x0), (y1 - y0)) < 0: 
 		x2, y2 = x3, y3
 
-	lineto_id = canvas.create_line (int (x0), int (y0), 
-					   int (x2), int (y2), 
-					   fill=color, width=linewidth)	
-	return lineto_id						 
+	lineto_id = _create ('line', (int (x0), int (y0), int (x2), int (y2)),
+	                     '-fill {%s} -width %s' % (color, linewidth))
+	return lineto_id
 
 def plot_vert_line (x, color, linewidth):
-	lineto_id = canvas.create_line (canvas.r2cx(x), 0, 
-					   canvas.r2cx(x), int (canvas['height']), 
-					   fill=color, width=linewidth)
+	lineto_id = _create ('line', (canvas.r2cx(x), 0,
+	                              canvas.r2cx(x), int (canvas['height'])),
+	                     '-fill {%s} -width %s' % (color, linewidth))
 	return lineto_id
 
 def plot_horiz_line (y, color, linewidth):
-	lineto_id = canvas.create_line (0, canvas.r2cy(y), 
-					   int (canvas['width']), canvas.r2cy(y), 
-					   fill=color, width=linewidth)
+	lineto_id = _create ('line', (0, canvas.r2cy(y),
+	                              int (canvas['width']), canvas.r2cy(y)),
+	                     '-fill {%s} -width %s' % (color, linewidth))
 	return lineto_id
 
 def plot_parabola(y,px,py,startx,endx,steps,color,linewidth):
 	if startx == endx or py == y:
-		line_id = canvas.create_line (px,py,px,y,fill=color,width=linewidth)
+		line_id = _create ('line', (px,py,px,y),
+		                   '-fill {%s} -width %s' % (color, linewidth))
 		return line_id
 	if startx > endx:
 		startx,endx = endx,startx
@@ -162,15 +276,23 @@ def plot_parabola(y,px,py,startx,endx,steps,color,linewidth):
 		curve.append(canvas.r2cx(x))
 		curve.append(canvas.r2cy(yn))
 		x = x + Dx
-	line_id = canvas.create_line (curve,fill=color,width=linewidth)
+	line_id = _create ('line', curve, '-fill {%s} -width %s' % (color, linewidth))
 	return line_id
 
 def plot_delete (id):
-	canvas.delete (id)
+	if not id:
+		return
+	if next_id is None:
+		canvas.delete (id)
+	else:
+		pending.append ('%s delete %s' % (canvas, id))
+	images.pop (id, None)
 
 def config_canvas (minx, maxx, miny, maxy):
-	for item in canvas.find_all ():
-		canvas.delete (item)
+	global view, _transform
+	flush ()
+	canvas.delete ('all')
+	images.clear ()
 
 
 	Dx = maxx - minx
@@ -210,28 +332,32 @@ def config_canvas (minx, maxx, miny, maxy):
 	
 	canvas.r2cx = rx
 	canvas.r2cy = ry
+	view = (width, height)
+	_transform = (minx, Dx, miny, Dy)
 
 def hide_algorithm ():
 	return master.show_var.get () != 0
 
 ################### ANDREW E EDUARDO MUDARAM #######################
 def plot_circle (x, y, color, r):
-	plot_id = canvas.create_oval (canvas.r2cx(x-r), canvas.r2cy(y-r),
-	canvas.r2cx(x+r), canvas.r2cy(y+r), outline=color)
+	plot_id = _create ('oval', (canvas.r2cx(x-r), canvas.r2cy(y-r),
+	                            canvas.r2cx(x+r), canvas.r2cy(y+r)),
+	                   '-outline {%s}' % color)
 	return plot_id
 def plot_curve (xy, color, linewidth):
 	canvas_xy = []
 	for i in range(len(xy)//2):
 		canvas_xy += [canvas.r2cx(xy[i]), canvas.r2cy(xy[i+1])]
-	lineto_id = canvas.create_line (canvas_xy, fill=color, width=linewidth)
+	lineto_id = _create ('line', canvas_xy, '-fill {%s} -width %s' % (color, linewidth))
 	return lineto_id
 
 ####################################################################
 
 ######################## EDUARDO FREIRE ######################
 def plot_disc_grande (x, y, color, r):
-	plot_id = canvas.create_oval (canvas.r2cx(x - r), canvas.r2cy(y - r), 
-					canvas.r2cx(x + r), canvas.r2cy(y + r), fill=color, outline = 'white')
+	plot_id = _create ('oval', (canvas.r2cx(x - r), canvas.r2cy(y - r),
+	                            canvas.r2cx(x + r), canvas.r2cy(y + r)),
+	                   '-fill {%s} -outline white' % color)
 	return plot_id
 #############################################3
 
@@ -240,24 +366,24 @@ def plot_disc_grande (x, y, color, r):
 
 def plot_vert_ray (x0, y0, increasing, color, linewidth):
 	if not increasing:
-		lineto_id = canvas.create_line (canvas.r2cx(x0), canvas.r2cy(y0), 
-						canvas.r2cx(x0), int (canvas['height']), 
-						fill=color, width=linewidth)
+		lineto_id = _create ('line', (canvas.r2cx(x0), canvas.r2cy(y0),
+		                              canvas.r2cx(x0), int (canvas['height'])),
+		                     '-fill {%s} -width %s' % (color, linewidth))
 	else:
-		lineto_id = canvas.create_line (canvas.r2cx(x0), canvas.r2cy(y0), 
-						canvas.r2cx(x0), 0, 
-						fill=color, width=linewidth)	
+		lineto_id = _create ('line', (canvas.r2cx(x0), canvas.r2cy(y0),
+		                              canvas.r2cx(x0), 0),
+		                     '-fill {%s} -width %s' % (color, linewidth))
 	return lineto_id
 
 def plot_horiz_ray (x0, y0, increasing, color, linewidth):
 	if increasing:
-		lineto_id = canvas.create_line (canvas.r2cx(x0), canvas.r2cy(y0), 
-						int (canvas['width']), canvas.r2cy(y0),
-						fill=color, width=linewidth)
+		lineto_id = _create ('line', (canvas.r2cx(x0), canvas.r2cy(y0),
+		                              int (canvas['width']), canvas.r2cy(y0)),
+		                     '-fill {%s} -width %s' % (color, linewidth))
 	else:
-		lineto_id = canvas.create_line (canvas.r2cx(x0), canvas.r2cy(y0), 
-						0, canvas.r2cy(y0), 
-						fill=color, width=linewidth)	
+		lineto_id = _create ('line', (canvas.r2cx(x0), canvas.r2cy(y0),
+		                              0, canvas.r2cy(y0)),
+		                     '-fill {%s} -width %s' % (color, linewidth))
 	return lineto_id
 
 ################################################
@@ -1,9 +1,17 @@
-from . import brute_force
-from . import bentley_ottman
+from geocomp.common import registry
 
 children = [
     ['brute_force', 'Brute_force', 'Forca\nBruta'],
     ['bentley_ottman', 'Bentley_Ottman', 'Bentley\ne\nOttman']
 ]
 
+# tipo da entrada e complexidade de cada algoritmo (veja geocomp.common.registry)
+#   k: numero de intersecoes
+input_type = 'segments'
+complexity = {
+    'Brute_force': 'O(n^2)',
+    'Bentley_Ottman': 'O((n + k) log n)',
+}
+
 __all__ = [a[0] for a in children]
+__getattr__ = registry.lazy (__name__, __all__)
@@ -100,6 +100,10 @@ class _ABCTree(object):
         # removed graingets version, because it was little slower on CPython and much slower on pypy
         # this version runs about 4x faster with pypy than the Cython version
         # Note: Code sharing of succ_item() and ceiling_item() is possible, but has always a speed penalty.
+        # The last node where the search turned left is always smaller than
+        # the previous ones (it is in their left subtree), so keys stored in
+        # the tree are never compared to each other. That matters when the
+        # order depends on cmp_data, as in the sweep line of Bentley_Ottman.
         node = self._root
         succ_node = None
         while node is not None:
@@ -107,8 +111,7 @@ class _ABCTree(object):
             if cmp == 0:
                 break
             elif cmp < 0:
-                if (succ_node is None) or self._cmp(self._cmp_data, node.key, succ_node.key) < 0:
-                    succ_node = node
+                succ_node = node
                 node = node.left
             else:
                 node = node.right
@@ -123,10 +126,7 @@ class _ABCTree(object):
             node = node.right
             while node.left is not None:
                 node = node.left
-            if succ_node is None:
-                succ_node = node
-            elif self._cmp(self._cmp_data, node.key, succ_node.key) < 0:
-                succ_node = node
+            succ_node = node
         elif succ_node is None:  # given key is biggest in tree
             if default is _sentinel:
                 raise KeyError(str(key))
@@ -140,6 +140,7 @@ class _ABCTree(object):
         # removed graingets version, because it was little slower on CPython and much slower on pypy
         # this version runs about 4x faster with pypy than the Cython version
         # Note: Code sharing of prev_item() and floor_item() is possible, but has always a speed penalty.
+        # Same as in succ_item: stored keys are never compared to each other.
         node = self._root
         prev_node = None
 
@@ -150,8 +151,7 @@ class _ABCTree(object):
             elif cmp < 0:
                 node = node.left
             else:
-                if (prev_node is None) or self._cmp(self._cmp_data, prev_node.key, node.key) < 0:
-                    prev_node = node
+                prev_node = node
                 node = node.right
 
         if node is None:  # stay at dead end (None)
@@ -164,10 +164,7 @@ class _ABCTree(object):
             node = node.left
             while node.right is not None:
                 node = node.right
-            if prev_node is None:
-                prev_node = node
-            elif self._cmp(self._cmp_data, prev_node.key, node.key) < 0:
-                prev_node = node
+            prev_node = node
         elif prev_node is None:  # given key is smallest in tree
             if default is _sentinel:
                 raise KeyError(str(key))
@@ -451,12 +448,13 @@ class RBTree(_ABCTree):
                     grand_grand_parent[direction2] = RBTree.jsw_double(grand_parent, 1 - last)
 
             # Stop if found
-            if self._cmp(self._cmp_data, key, node.key) == 0:
+            cmp = self._cmp(self._cmp_data, key, node.key)
+            if cmp == 0:
                 node.value = value  # set new value for key
                 break
 
             last = direction
-            direction = 0 if (self._cmp(self._cmp_data, key, node.key) < 0) else 1
+            direction = 0 if (cmp < 0) else 1
             # Update helpers
             if grand_parent is not None:
                 grand_grand_parent = grand_parent
@@ -487,9 +485,10 @@ class RBTree(_ABCTree):
             grand_parent = parent
             parent = node
             node = node[direction]
-            direction = 1 if (self._cmp(self._cmp_data, key, node.key) > 0) else 0
+            cmp = self._cmp(self._cmp_data, key, node.key)
+            direction = 1 if (cmp > 0) else 0
             # Save found node
-            if self._cmp(self._cmp_data, key, node.key) == 0:
+            if cmp == 0:
                 found = node
 
             # Push the red node down
@@ -533,302 +532,427 @@ class RBTree(_ABCTree):
             raise KeyError(str(key))
 ################################################################################
 
+
+import heapq
+from fractions import Fraction
+from functools import partial
+
 from geocomp.common import prim
-from geocomp.common import segment
 from geocomp.common.point import Point
-from geocomp.common.prim import left, right
 from geocomp.common import control
 from geocomp import config
 
-eps = 0.0001
-
-def compare_point(data, p1, p2):
-    if (abs(p1.x - p2.x) < eps):
-        if abs(p1.y - p2.y) < eps: return 0
-        else: return p1.y - p2.y
-    return p1.x - p2.x
+# Todas as decisoes da varredura sao exatas: os pontos de cruzamento sao
+# calculados com Fraction, e as comparacoes de alturas e inclinacoes
+# fazem a conta em ponto flutuante e so a refazem com Fraction quando o
+# resultado esta dentro de ERRBOUND (relativo) de zero, como prim.orient2d.
+ERRBOUND = 1e-12
+
+def height_sign(seg, event):
+    """Sinal de h - y, com h a altura de seg na reta vertical do ponto
+    (x, y) do evento
+
+    Um segmento vertical (na reta x) esta na altura de y, limitada as suas
+    pontas: a varredura anda por ele de baixo para cima."""
+    prim.add_count('area2')
+    ax = seg.ax
+    ay = seg.ay
+    if seg.vertical:
+        y = event.y
+        if y < ay: return 1
+        if y > seg.by: return -1
+        return 0
+    xf = event.fx
+    yf = event.fy
+    if (xf == ax and yf == ay and event.x == ax and event.y == ay) or \
+       (xf == seg.bx and yf == seg.by and event.x == seg.bx and event.y == seg.by):
+        return 0
+    # dx > 0, entao o sinal de h - y e' o de dy * (x - a.x) - dx * (y - a.y)
+    det = seg.dy * (xf - ax) - seg.dx * (yf - ay)
+    err = seg.err_dy * (event.abs_fx + seg.abs_ax) + \
+          seg.err_dx * (event.abs_fy + seg.abs_ay)
+    if det > err: return 1
+    if det < -err: return -1
+    ax, ay = Fraction(ax), Fraction(ay)
+    det = (Fraction(seg.by) - ay) * (Fraction(event.x) - ax) \
+          - (Fraction(seg.bx) - ax) * (Fraction(event.y) - ay)
+    return (det > 0) - (det < 0)
+
+def height(seg, x, y):
+    "Altura exata de seg na reta vertical x (para um vertical, como em height_sign)"
+    if seg.vertical:
+        return min(max(y, seg.ay), seg.by)
+    ax, ay = Fraction(seg.ax), Fraction(seg.ay)
+    return ay + (Fraction(seg.by) - ay) * (Fraction(x) - ax) / (Fraction(seg.bx) - ax)
+
+def compare_heights(seg, other, event):
+    "Sinal da diferenca das alturas de seg e other na reta vertical do evento"
+    x, y = event.x, event.y
+    if not seg.vertical and not other.vertical:
+        xf = event.fx
+        hs = seg.ay + seg.dy * (xf - seg.ax) / seg.dx
+        ho = other.ay + other.dy * (xf - other.ax) / other.dx
+        err = ERRBOUND * (seg.abs_ay + abs(seg.by) + other.abs_ay + abs(other.by)
+                          + abs(hs) + abs(ho))
+        if hs - ho > err: return 1
+        if ho - hs > err: return -1
+    hs = height(seg, x, y)
+    ho = height(other, x, y)
+    return (hs > ho) - (hs < ho)
+
+def compare_slopes(seg, other):
+    "Sinal da diferenca das inclinacoes de seg e other (vertical e' infinita)"
+    if seg.vertical or other.vertical:
+        return seg.vertical - other.vertical
+    left = seg.dy * other.dx
+    right = other.dy * seg.dx
+    err = ERRBOUND * (abs(left) + abs(right))
+    if left - right > err: return 1
+    if right - left > err: return -1
+    left = (Fraction(seg.by) - Fraction(seg.ay)) * \
+           (Fraction(other.bx) - Fraction(other.ax))
+    right = (Fraction(other.by) - Fraction(other.ay)) * \
+            (Fraction(seg.bx) - Fraction(seg.ax))
+    return (left > right) - (left < right)
+
+def compare_segment(event, seg, other, after):
+    """Compara seg com other na reta de varredura do evento
+
+    Devolve -1 se seg esta abaixo de other, 1 se esta acima e 0 so se
+    seg e' other. Os segmentos sao comparados pela altura na reta vertical
+    do evento; se eles se cruzam nela (no ponto do evento ou num ponto
+    ja' visto, abaixo dele), pela ordem logo depois do cruzamento, e
+    senao pela de logo antes: a menor inclinacao fica embaixo depois, e
+    em cima antes. Segmentos colineares ficam na ordem de id, a mesma
+    antes e depois."""
+    if other is seg:
+        return 0
+    signs = event.signs
+    hs = signs.get(id(seg))
+    if hs is None:
+        hs = signs[id(seg)] = height_sign(seg, event)
+    ho = signs.get(id(other))
+    if ho is None:
+        ho = signs[id(other)] = height_sign(other, event)
+    if hs != ho:
+        return -1 if hs < ho else 1
+    if hs != 0:
+        cmp = compare_heights(seg, other, event)
+        if cmp != 0:
+            return cmp
+        after = hs < 0
+    cmp = compare_slopes(seg, other)
+    if cmp != 0:
+        return cmp if after else -cmp
+    return -1 if id(seg) < id(other) else 1
+
+def side(seg, event):
+    "height_sign(seg, event), guardado em event.signs"
+    signs = event.signs
+    ret = signs.get(id(seg))
+    if ret is None:
+        ret = signs[id(seg)] = height_sign(seg, event)
+    return ret
+
+# as comparacoes da arvore (cmp(cmp_data, a, b)), sem mais uma chamada
+compare_after = partial(compare_segment, after = True)
+compare_before = partial(compare_segment, after = False)
+
+class SweepSegment:
+    """Um segmento da varredura, com as coordenadas das pontas (init antes
+    de to na ordem da fila) guardadas para as comparacoes, que sao feitas
+    muitas vezes para cada segmento
+
+    dx e dy sao as diferencas em ponto flutuante, e err_dx e err_dy, os
+    seus modulos vezes ERRBOUND; ymin e ymax limitam o segmento em y.
+    segment e' o Segment da entrada."""
+    __slots__ = ('segment', 'init', 'to', 'ax', 'ay', 'bx', 'by', 'vertical',
+                 'dx', 'dy', 'abs_ax', 'abs_ay', 'err_dx', 'err_dy', 'ymin',
+                 'ymax')
+
+    def __init__(self, segment):
+        self.segment = segment
+        self.init = a = segment.init
+        self.to = b = segment.to
+        self.ax, self.ay, self.bx, self.by = a.x, a.y, b.x, b.y
+        self.vertical = self.ax == self.bx
+        self.dx = float(self.bx) - float(self.ax)
+        self.dy = float(self.by) - float(self.ay)
+        self.abs_ax = abs(float(self.ax))
+        self.abs_ay = abs(float(self.ay))
+        self.err_dx = ERRBOUND * abs(self.dx)
+        self.err_dy = ERRBOUND * abs(self.dy)
+        self.ymin = min(self.ay, self.by)
+        self.ymax = max(self.ay, self.by)
+
+    def hilight(self, color_line, color_point):
+        return self.segment.hilight(color_line, color_point)
+
+    def unhilight(self):
+        self.segment.unhilight()
+
+def crossing(s1, s2):
+    "Ponto (x, y) exato do cruzamento proprio (fora das pontas) de s1 e s2, ou None"
+    # vizinhos na reta de varredura se sobrepoem em x; em y, nem sempre
+    if s1.ymax < s2.ymin or s2.ymax < s1.ymin:
+        return None
+    return prim.crossing(s1.init, s1.to, s2.init, s2.to)
 
 class Event:
-    def __init__(self, point):
-        self.point = point
+    """Um ponto (x, y) da fila de eventos, com os segmentos que comecam
+    nele (left), os que terminam nele (right) e os que passam por ele
+    (middle, preenchida quando o evento e' tratado)
+
+    x e y sao exatos (Fraction, num cruzamento), e fx e fy, os mesmos em
+    ponto flutuante; point e' o Point devolvido nos registros (o de um
+    cruzamento so' e' criado quando pedido). on guarda os ids dos
+    segmentos que passam pelo ponto, e signs, o height_sign de cada
+    segmento ja' comparado no evento (por id), para que as comparacoes
+    nao refacam a conta."""
+    __slots__ = ('x', 'y', 'fx', 'fy', 'abs_fx', 'abs_fy', '_point', 'left',
+                 'right', 'middle', 'on', 'signs')
+
+    def __init__(self, x, y, point = None):
+        self.x = x
+        self.y = y
+        self.fx = float(x)
+        self.fy = float(y)
+        self.abs_fx = abs(self.fx)
+        self.abs_fy = abs(self.fy)
+        self._point = point
         self.left = []
         self.right = []
-        self.middle = RBTree()
-        self.middle_print = RBTree()
-        self.lines = 0
+        self.middle = []
+        self.on = ()
+        self.signs = {}
+
+    @property
+    def point(self):
+        if self._point is None:
+            self._point = Point(self.fx, self.fy)
+        return self._point
 
     def insert_left(self, seg):
         self.left.append(seg)
-        self.lines += 1
 
     def insert_right(self, seg):
         self.right.append(seg)
-        self.lines += 1
-
-    def insert_middle(self, seg, value = True):
-        seg2 = Segment2(seg.init, seg)
-        self.middle.insert(seg2, value)
-        self.lines += 1
-        self.insert_middle_print(seg)
 
-    def insert_middle_print(self, seg, value = True):
-        seg2 = Segment2(seg.init, seg)
-        self.middle_print.insert(seg2, value)
-        self.lines += 1
+    def segments(self):
+        "Lista dos segmentos (Segment) que passam pelo ponto do evento"
+        segs = [s.segment for s in self.left]
+        segs.extend(s.segment for s in self.middle)
+        segs.extend(s.segment for s in self.right
+                    if not any(s is l for l in self.left))
+        return segs
 
     def print_lines(self):
         print(self.point)
-        for s in self.left: print(s)
-        for s in self.right: print(s)
-        for node in self.middle_print.iter_items(reverse=True): print(node[0].seg)
+        for s in self.segments(): print(s)
         print()
 
-    def __eq__(self, other):
-        if self.point == other.point: return True
-        else: return False
-
-    def __lt__(self, other):
-        if (self.point.x == other.point.x):
-            if (self.point.y < other.point.y): return True
-            else: return False
-        if (self.point.x < other.point.x): return True
-        else: return False
+class EventQueue:
+    """Fila de eventos: um heap de (fx, x, fy, y, evento), mais um
+    dicionario que acha o evento de um ponto (x, y) em tempo constante
 
-    def __gt__(self, other):
-        if (self.point.x == other.point.x):
-            if (self.point.y > other.point.y): return True
-            else: return False
-        if (self.point.x > other.point.x): return True
-        else: return False
+    A ordem da fila e' x, e depois y (a varredura e' uma reta levemente
+    inclinada); dois eventos nunca tem o mesmo ponto. fx e fy vem antes
+    porque o arredondamento preserva a ordem: x e y (Fraction, num
+    cruzamento) so' sao comparados quando os floats empatam."""
 
-class EventQueue:
     def __init__(self, segs):
         for s in segs:
-            if compare_point(None, s.init, s.to) >= 0:
+            if (s.to.x, s.to.y) < (s.init.x, s.init.y):
                 s.init, s.to = s.to, s.init
-        
-        self.queue = RBTree(cmp = compare_point)
+
+        self.heap = []
+        self.events = {}
         for s in segs:
             p1 = s.init
             p1.plot('green')
             p2 = s.to
             p2.plot('yellow')
-            event_p1 = self.queue.get(p1)
-            if (event_p1 is None):
-                event_p1 = Event(p1)
-                event_p1.insert_left(s)
-                self.queue.insert(p1, event_p1)
-            else:
-                event_p1.insert_left(s)
-            
-            event_p2 = self.queue.get(p2)
-            if (event_p2 is None):
-                event_p2 = Event(p2)
-                event_p2.insert_right(s)
-                self.queue.insert(p2, event_p2)
-            else:
-                event_p2.insert_right(s)
+            key = SweepSegment(s)
+            self.at(p1).insert_left(key)
+            self.at(p2).insert_right(key)
+
+    def at(self, p):
+        "O evento da ponta p (criado, se preciso)"
+        event = self.events.get((p.x, p.y))
+        if event is None:
+            event = Event(p.x, p.y, p)
+            self.insert(event)
+        return event
 
     def insert(self, event):
-        self.queue.insert(event.point, event)
+        heapq.heappush(self.heap, (event.fx, event.x, event.fy, event.y, event))
+        self.events[event.x, event.y] = event
 
-            
     def pop_min(self):
-        return self.queue.pop_min()[1]
-    
+        event = heapq.heappop(self.heap)[4]
+        del self.events[event.x, event.y]
+        return event
+
     def is_empty(self):
-        return self.queue.is_empty()
+        return not self.heap
 
     def __contains__(self, key):
-        return key in self.queue
-    
-    def get(self, key):
-        return self.queue.get(key)
-
-class Segment2:
-    def __init__(self, point, seg):
-        self.seg = seg
-        self.point = point
-
-    def __eq__(self, other):
-        return self.seg == other.seg
-
-    def __lt__(self, other):
-        if (other.seg.has_left(self.point)): return True
-        elif (other.seg.has_inside(self.point) and other.seg.has_left(self.seg.to)): return True
-        return False
-
-    def __gt__(self, other):
-        if (right(other.seg.init, other.seg.to, self.point)): return True
-        elif (other.seg.has_inside(self.point) and right(other.seg.init, other.seg.to, self.seg.to)): return True
-        return False
-
-    def __repr__ (self):
-        return repr(self.point) + " " + repr(self.seg)
-    
-
-def vertical(s):
-    return s.init.x == s.to.x
-
-def horizontal(s):
-    return s.init.y == s.to.y
-
-def vertical(seg):
-    return seg.init.x == seg.to.x
-
-def intersection_point(s1, s2):
-    x1, y1 = s1.init.x, s1.init.y
-    x2, y2 = s1.to.x, s1.to.y
-    x3, y3 = s2.init.x, s2.init.y
-    x4, y4 = s2.to.x, s2.to.y
-    if vertical(s1):
-        x = s1.init.x
-        m2 = (y4 - y3)/(x4 - x3)
-        y = m2*(x - x3) + y3
-        p = Point(x,y)
-        return p
-    if vertical(s2):
-        x = s2.init.x
-        m1 = (y2 - y1)/(x2 - x1)
-        y = m1*(x - x1) + y1
-        p = Point(x,y)
-        return p
-    m1 = (y2 - y1)/(x2 - x1)
-    m2 = (y4 - y3)/(x4 - x3)
-    x = (m1*x1 - m2*x3 - y1 + y3)/(m1-m2)
-    y = m1*x + (-m1*x1 + y1)
-
-    p = Point(x,y)
-    return p
-
-def verify_event(event, queue, s1, s2, side = None):
-    q = intersection_point(s1, s2)
-    new_event = Event(q)
-    if (compare_point(None, q, event.point) > 0):
-        if (q not in queue):
-            q.plot('white')
-            new_event.insert_middle(s1)
-            new_event.insert_middle(s2)
-            queue.insert(new_event)
-        else:
-            event2 = queue.get(q)
-            if not event2.middle.is_empty():
-                event2.insert_middle_print(s1)
-                event2.insert_middle_print(s2)
-
-    if (compare_point(None, q, event.point) == 0 and side == 'left'):
-        event.point.plot('white')
-        if (compare_point(None, s2.init, event.point) != 0):
-            event.insert_middle_print(s2)
-    
-def treat_left(event, queue, sweep_line, seg):
-    seg2 = Segment2(event.point, seg)
-    sweep_line.insert(seg2, True)
-    suc = sweep_line.succ_item(seg2, None)
-    prev = sweep_line.prev_item(seg2, None)
-    if (suc is not None):
-        suc[0].seg.hilight('light blue', None)
-        if (seg.intersects(suc[0].seg)):
-            verify_event(event, queue, seg, suc[0].seg, 'left')
-        control.sleep()
-        suc[0].seg.unhilight()
-
-    if (prev is not None):
-        prev[0].seg.hilight('light blue', None)
-        if (seg.intersects(prev[0].seg)):
-            verify_event(event, queue, seg, prev[0].seg, 'left')
-        control.sleep()
-        prev[0].seg.unhilight()
-
-def treat_right(event, queue, sweep_line, seg):
-    seg2 = Segment2(seg.to, seg)
-    suc = sweep_line.succ_item(seg2, None)
-    prev = sweep_line.prev_item(seg2, None)
-    sweep_line.remove(seg2)
-    if (prev is not None) and (suc is not None):
-        suc[0].seg.hilight('light blue', None)
-        prev[0].seg.hilight('light blue', None)
-        if prev[0].seg.intersects(suc[0].seg):
-            verify_event(event, queue, suc[0].seg, prev[0].seg)
-        control.sleep()
-        suc[0].seg.unhilight()
-        prev[0].seg.unhilight()
-
-def swap_points(s):
-    s.init, s.to = s.to, s.init
-
-def treat_middle(event, queue, sweep_line):
-    p = event.point
-    middle = event.middle
-    MIN = middle.min_item()[0].seg
-    MAX = middle.max_item()[0].seg
-    swap_points(MIN)
-    swap_points(MAX)
-    seg_min = Segment2(p, MIN)
-    seg_max = Segment2(p, MAX)
-    prev = sweep_line.prev_item(seg_min, None)
-    suc = sweep_line.succ_item(seg_max, None)
-    swap_points(MIN)
-    swap_points(MAX)
-    for s in middle.iter_items():
-        seg = s[0].seg
-        swap_points(seg)
-        seg2 = Segment2(p, seg)
-        sweep_line.remove(seg2)
-        swap_points(seg)
-    for s in middle.iter_items():
-        seg = s[0].seg
-        seg2 = Segment2(p, seg)
-        sweep_line.insert(seg2, True)
-    if (suc is not None):
-        suc[0].seg.hilight('light blue', None)
-        MIN.hilight('light blue', None)
-        if (MIN.intersects(suc[0].seg)):
-            verify_event(event, queue, MIN, suc[0].seg)
-        control.sleep()
-        MIN.unhilight()
-        suc[0].seg.unhilight()
-
-    if (prev is not None):
-        prev[0].seg.hilight('light blue', None)
-        MAX.hilight('light blue', None)
-        if (MAX.intersects(prev[0].seg)):
-            verify_event(event, queue, MAX, prev[0].seg)
-        control.sleep()
-        MAX.unhilight()
-        prev[0].seg.unhilight()
-
+        return key in self.events
+
+class SweepLine(RBTree):
+    """Reta de varredura: arvore dos segmentos que a cortam, de baixo para
+    cima, comparados com compare_segment no evento passado a cada
+    operacao (como cmp_data)
+
+    A arvore esta sempre na ordem de logo depois do ultimo evento, que e'
+    a de logo antes do evento seguinte: remove_at procura o segmento nessa
+    ordem, e insert_at, na de logo depois do evento."""
+
+    def __init__(self):
+        RBTree.__init__(self, cmp = compare_after)
+
+    def insert_at(self, event, seg):
+        self._cmp_data = event
+        self._cmp = compare_after
+        self.insert(seg, True)
+
+    def remove_at(self, event, seg):
+        self._cmp_data = event
+        self._cmp = compare_before
+        self.remove(seg)
+
+    def split(self, event):
+        """Devolve o segmento logo abaixo do ponto do evento (ou None), a
+        lista dos que passam pelo ponto, de baixo para cima, e o logo acima
+        (ou None)"""
+        below = above = None
+        ret = []
+        stack = []
+        node = self._root
+        # percurso em ordem so dos nos que podem passar pelo ponto: ele
+        #   passa tambem pelos caminhos de busca do anterior e do seguinte
+        while stack or node is not None:
+            if node is not None:
+                sign = side(node.key, event)
+                stack.append((node, sign))
+                node = node.left if sign >= 0 else None
+                continue
+            node, sign = stack.pop()
+            if sign == 0:
+                ret.append(node.key)
+            elif sign < 0:
+                below = node.key
+            elif above is None:
+                above = node.key
+            node = node.right if sign <= 0 else None
+        return below, ret, above
+
+def find_new_event(event, queue, s1, s2):
+    "Poe na fila o cruzamento de s1 e s2, se ele esta depois do evento"
+    s1.hilight('light blue', None)
+    s2.hilight('light blue', None)
+    # pontas sobre outros segmentos e partes comuns de segmentos colineares
+    #   nao sao cruzamentos proprios: caem em eventos de pontas
+    q = crossing(s1, s2)
+    if q is not None and q > (event.x, event.y):
+        new = queue.events.get(q)
+        if new is None:
+            new = Event(q[0], q[1])
+            control.plot_disc(new.fx, new.fy, 'white', config.RADIUS)
+            queue.insert(new)
+        # s1 e s2 passam pelo cruzamento: a conta exata ja' foi feita
+        new.signs[id(s1)] = new.signs[id(s2)] = 0
+    control.sleep()
+    s1.unhilight()
+    s2.unhilight()
 
 def treat_event(event, queue, sweep_line):
-    v = control.plot_vert_line(event.point.x, 'blue', 2)
-    p = event.point.hilight('cyan')
-    
-    for s in event.right: 
+    v = control.plot_vert_line(event.fx, 'blue', 2)
+    hi = control.plot_disc(event.fx, event.fy, 'cyan', config.RADIUS_HILIGHT)
+
+    below, through, above = sweep_line.split(event)
+    event.middle = [s for s in through if not any(s is r for r in event.right)]
+    on = event.on = set(map(id, event.left))
+    on.update(map(id, event.middle))
+    on.update(map(id, event.right))
+    event.signs.update(dict.fromkeys(on, 0))
+    # os segmentos de comprimento zero comecam e terminam aqui, e nunca
+    #   entram na arvore
+    for s in event.right:
         s.hilight('yellow', None)
         control.sleep()
-        treat_right(event, queue, sweep_line, s)
+        if not any(s is l for l in event.left):
+            sweep_line.remove_at(event, s)
         s.unhilight()
-    for s in event.left:
-        s.hilight('yellow', None) 
+    for s in event.middle:
+        sweep_line.remove_at(event, s)
+
+    new = [s for s in event.left if not any(s is r for r in event.right)]
+    new.extend(event.middle)
+    for s in new:
+        s.hilight('yellow', None)
         control.sleep()
-        treat_left(event, queue, sweep_line, s)
+        sweep_line.insert_at(event, s)
         s.unhilight()
-    if (not event.middle.is_empty()): treat_middle(event, queue, sweep_line)
-    if (event.lines > 1):
-        event.print_lines()
+
+    # below e above nao passam pelo ponto, e nao mudaram; os segmentos da
+    #   arvore que passam por ele sao os de new
+    if not new:
+        if below is not None and above is not None:
+            find_new_event(event, queue, below, above)
+    else:
+        lowest = highest = new[0]
+        for s in new:
+            if compare_after(event, s, lowest) < 0: lowest = s
+            if compare_after(event, s, highest) > 0: highest = s
+        if below is not None:
+            find_new_event(event, queue, below, lowest)
+        if above is not None:
+            find_new_event(event, queue, highest, above)
+
     control.sleep()
     control.plot_delete(v)
-    event.point.unhilight(p)
+    control.plot_delete(hi)
 
 
-def Bentley_Ottman(segments):
+def intersection_events(segments):
+    "Gera, na ordem da varredura, os eventos em que se encontram dois ou mais segmentos"
     queue = EventQueue(segments)
-    sweep_line = RBTree()
-    print("Intersection points folled by intersecting segments:")
+    sweep_line = SweepLine()
     while (not queue.is_empty()):
         event = queue.pop_min()
         treat_event(event, queue, sweep_line)
+        if len(event.on) > 1:
+            yield event
+
+def intersections(segments):
+    """Gera um registro (ponto, segmentos) para cada ponto de intersecao,
+    com a lista dos segmentos que passam por ele
+
+    Os pontos sao os cruzamentos proprios e as pontas de segmento que
+    estao sobre outro segmento (veja prim.meeting_points): dois segmentos
+    que se sobrepoem aparecem nas duas pontas do trecho comum. Os
+    registros saem em ordem de (x, y), como em brute_force.intersections."""
+    for event in intersection_events(segments):
+        yield event.point, event.segments()
+
+def count_intersections(segments):
+    """Numero de pontos de intersecao (de registros de intersections),
+    contado sem montar os registros"""
+    count = 0
+    for event in intersection_events(segments):
+        count += 1
+    return count
 
-
-
-        
\ No newline at end of file
+def Bentley_Ottman(segments):
+    """Devolve a lista dos registros (ponto, segmentos) de intersections
+
+    Com config.VERBOSE, imprime cada ponto seguido dos seus segmentos."""
+    ret = list(intersections(segments))
+    if config.VERBOSE:
+        print("Intersection points folled by intersecting segments:")
+        for point, segs in ret:
+            print(point)
+            for s in segs: print(s)
+            print()
+    return ret
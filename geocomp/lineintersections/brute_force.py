@@ -1,13 +1,95 @@
+from fractions import Fraction
+
 from geocomp.common import prim
 from geocomp.common import segment
+from geocomp.common.point import Point
 from geocomp.common import control
 from geocomp import config
 
 def Brute_force (l):
-    print(type(l[0]))
-    print(type(l[0].init))
+    """Devolve a lista dos registros (ponto, segmentos) de intersections
+
+    Com config.VERBOSE, imprime cada ponto seguido dos seus segmentos."""
+    ret = list (intersections (l))
+    if config.VERBOSE:
+        print ("Intersection points folled by intersecting segments:")
+        for point, segs in ret:
+            print (point)
+            for s in segs: print (s)
+            print ()
+    return ret
+
+def intersections (l):
+    """Gera um registro (ponto, segmentos) para cada ponto de intersecao,
+    com a lista dos segmentos de l que passam por ele
+
+    Os pontos sao os mesmos de bentley_ottman.intersections: os
+    cruzamentos proprios e as pontas de segmento que estao sobre outro
+    segmento. Dois segmentos que se sobrepoem aparecem nas duas pontas do
+    trecho comum. Os registros saem em ordem de (x, y), e por isso so'
+    depois de testados todos os pares; iter_intersections gera os mesmos
+    registros a medida que sao achados."""
+    points = sorted (meetings (l), key = lambda record: record[0])
+    for q, segs in points:
+        yield Point (float (q[0]), float (q[1])), segs
+
+def iter_intersections (l):
+    """Os registros de intersections, sem ordem de (x, y): cada ponto sai
+    logo depois de testados os pares do primeiro segmento de l que passa
+    por ele"""
+    for q, segs in meetings (l):
+        yield Point (float (q[0]), float (q[1])), segs
+
+def count_intersections (l):
+    "Numero de pontos de intersecao (de registros de intersections)"
+    count = 0
+    for q in meetings (l, False):
+        count += 1
+    return count
+
+def meetings (l, segments = True):
+    """Gera cada ponto de intersecao, exato, junto com o primeiro segmento
+    l[i] que passa por ele
+
+    Esse ponto q sempre e' encontro (prim.meeting_points) de l[i] com um
+    l[j], j > i: um segmento que nao e' colinear com l[i] o encontra so'
+    em q, e um colinear que passa por q tem uma ponta em q ou contem l[i].
+    Com segments, gera os pares (q, segmentos de l que passam por q); sem,
+    so' os pontos q."""
+    for i, later in intersecting_rows (l):
+        a = l[i]
+        points = set ()
+        for j in later:
+            b = l[j]
+            points.update (prim.meeting_points (a.init, a.to, b.init, b.to))
+        if not points:
+            continue
+        earlier = [b for b in l[:i]
+                   if prim.intersect (a.init, a.to, b.init, b.to)]
+        for q in sorted (points):
+            # q pode estar no meio de um trecho comum de segmentos colineares,
+            #   sem ser encontro de l[i] com eles
+            if any (contains (b, q) for b in earlier):
+                continue
+            if segments:
+                yield q, [a] + [l[j] for j in later if contains (l[j], q)]
+            else:
+                yield q
+
+def contains (s, q):
+    "O ponto (x, y) exato q esta' sobre o segmento s?"
+    ax, ay = Fraction (s.init.x), Fraction (s.init.y)
+    bx, by = Fraction (s.to.x), Fraction (s.to.y)
+    qx, qy = Fraction (q[0]), Fraction (q[1])
+    if (bx - ax) * (qy - ay) != (by - ay) * (qx - ax):
+        return False
+    return min (ax, bx) <= qx <= max (ax, bx) and \
+           min (ay, by) <= qy <= max (ay, by)
+
+def intersecting_rows (l):
+    """Gera, para cada i, o par (i, lista dos j > i tais que l[i] e l[j]
+    se intersectam), logo depois de testados os pares de l[i]"""
     filter_segments(l)
-    intersections = []
 
     for s in l:
         s.plot()
@@ -15,17 +97,19 @@ def Brute_force (l):
     for i in range(0, len(l) - 1):
         l[i].hilight(color_line = "blue")
         control.sleep()
+        row = []
         for j in range(i + 1, len(l)):
             l[j].hilight()
             control.sleep()
             if (prim.intersect(l[i].init, l[i].to, l[j].init, l[j].to)):
-                # guarda os indices dos segmentos que se intersectam
                 l[i].hilight(color_line = "yellow")
                 l[j].hilight(color_line = "yellow")
-                control.sleep()                
-                intersections.append((i, j))
+                control.sleep()
+                row.append(j)
                 l[i].hilight(color_line = "blue")
             l[j].plot()
+        if row:
+            yield i, row
         l[i].plot()
 
 def filter_segments (l):
@@ -0,0 +1,13 @@
+"""Configuracao dos testes (python -m pytest, na raiz do repositorio)
+
+Os testes rodam sem interface grafica (control.set_headless)."""
+
+import os
+import sys
+
+ROOT = os.path.dirname (os.path.dirname (os.path.abspath (__file__)))
+sys.path.insert (0, ROOT)
+
+from geocomp.common import control
+
+control.set_headless (1)
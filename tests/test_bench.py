@@ -0,0 +1,36 @@
+"""geocomp.bench.suite"""
+
+import time
+
+import geocomp
+from geocomp.bench import suite
+from geocomp.common import guicontrol
+from geocomp.common import registry
+from geocomp.common.point import Point
+from geocomp.gui import dummy
+
+
+def test_problem_types ():
+    "Os problemas e os tipos de entrada vem do registro"
+    types = suite.problem_types ()
+    assert types == { 'closest': 'points', 'convex_hull': 'points',
+                      'lineintersections': 'segments' }
+    for problem, kind in types.items ():
+        assert all (a.input_type == kind for a in registry.algorithms (problem))
+
+def test_measure (monkeypatch):
+    "measure usa o tempo do algoritmo (Result.wall_time), sem o desenho da entrada"
+    monkeypatch.setattr (guicontrol, 'gui', None)
+    geocomp.init_display (dummy, None)
+    slow_plot = guicontrol.plot_input
+    monkeypatch.setattr (guicontrol, 'plot_input',
+                         lambda input: time.sleep (0.05) or slow_plot (input))
+
+    def alg (l):
+        time.sleep (0.01)
+
+    times, count = suite.measure (alg, lambda: [Point (0, 0), Point (1, 1)],
+                                  warmup = 1, reps = 2)
+    assert len (times) == 2
+    assert all (0.01 <= t < 0.04 for t in times)
+    assert count == 0
@@ -0,0 +1,115 @@
+"""Bentley_Ottman contra a forca bruta
+
+Os pares de segmentos que aparecem juntos num registro de
+bentley_ottman.intersections devem ser exatamente os pares que se
+intersectam (prim.intersect), e os registros devem ser os mesmos de
+brute_force.intersections, nos arquivos de dados/SEG_INTERSEC e em
+entradas aleatorias cheias de casos degenerados."""
+
+import os
+import random
+
+import pytest
+
+from conftest import ROOT
+from geocomp.common import io
+from geocomp.common import prim
+from geocomp.common.point import Point
+from geocomp.common.segment import Segment
+from geocomp.lineintersections import bentley_ottman
+from geocomp.lineintersections import brute_force
+
+DIR = os.path.join (ROOT, 'dados', 'SEG_INTERSEC')
+
+
+def segment_files ():
+    "Os arquivos de DIR com segmentos (hard tem pontos)"
+    ret = []
+    for name in sorted (os.listdir (DIR)):
+        objects = io.read (os.path.join (DIR, name))
+        if objects and isinstance (objects[0], Segment):
+            ret.append (name)
+    return ret
+
+def brute_pairs (segments):
+    n = len (segments)
+    return set ((i, j) for i in range (n) for j in range (i + 1, n)
+                if prim.intersect (segments[i].init, segments[i].to,
+                                   segments[j].init, segments[j].to))
+
+def records (module, segments, generator = 'intersections'):
+    "Os registros de module.intersections como (x, y, indices)"
+    index = { id (s): i for i, s in enumerate (segments) }
+    ret = []
+    for point, segs in getattr (module, generator) (segments):
+        ids = sorted (index[id (s)] for s in segs)
+        assert len (ids) == len (set (ids)) > 1
+        ret.append ((point.x, point.y, ids))
+    return ret
+
+def check (segments):
+    sweep = records (bentley_ottman, segments)
+    pairs = set ()
+    for x, y, ids in sweep:
+        pairs.update ((ids[a], ids[b]) for a in range (len (ids))
+                      for b in range (a + 1, len (ids)))
+    assert pairs == brute_pairs (segments)
+    assert sweep == records (brute_force, segments)
+    assert sorted (sweep) == \
+           sorted (records (brute_force, segments, 'iter_intersections'))
+    # um registro por ponto exato (pontos distintos podem ter o mesmo float)
+    assert bentley_ottman.count_intersections (segments) == len (sweep)
+    assert brute_force.count_intersections (segments) == len (sweep)
+
+
+@pytest.mark.parametrize ('name', segment_files ())
+def test_seg_intersec_files (name):
+    check (io.read (os.path.join (DIR, name)))
+
+def test_degenerate ():
+    """Grades pequenas: pontas em comum, verticais, colineares, concorrentes
+    e segmentos de tamanho zero"""
+    rng = random.Random (1)
+    for t in range (300):
+        size = rng.choice ([3, 5, 10])
+        segments = []
+        for i in range (rng.randint (2, 25)):
+            a = Point (rng.randint (0, size), rng.randint (0, size))
+            if rng.random () < 0.2:
+                b = Point (a.x, rng.randint (0, size))
+            else:
+                b = Point (rng.randint (0, size), rng.randint (0, size))
+            segments.append (Segment (a, b))
+        check (segments)
+
+def test_float ():
+    rng = random.Random (2)
+    for t in range (50):
+        check ([ Segment (Point (rng.uniform (0, 100), rng.uniform (0, 100)),
+                          Point (rng.uniform (0, 100), rng.uniform (0, 100)))
+                 for i in range (30) ])
+
+def test_algorithms ():
+    "Brute_force e Bentley_Ottman devolvem a lista dos registros"
+    segments = io.read (os.path.join (DIR, 'segments2.txt'))
+    expected = list (bentley_ottman.intersections (segments))
+    for func in brute_force.Brute_force, bentley_ottman.Bentley_Ottman:
+        ret = func (segments)
+        assert isinstance (ret, list)
+        assert [(p.x, p.y, len (s)) for p, s in ret] == \
+               [(p.x, p.y, len (s)) for p, s in expected]
+
+def test_iter_intersections_streams (monkeypatch):
+    "O registro de um ponto sai antes de testados os pares dos segmentos seguintes"
+    segments = [ Segment (Point (0, 0), Point (2, 2)),
+                 Segment (Point (0, 2), Point (2, 0)) ]
+    segments += [ Segment (Point (10 + i, 0), Point (10 + i, 1))
+                  for i in range (20) ]
+    calls = []
+    intersect = prim.intersect
+    monkeypatch.setattr (prim, 'intersect',
+                         lambda *args: calls.append (1) or intersect (*args))
+    point, segs = next (brute_force.iter_intersections (segments))
+    assert (point.x, point.y) == (1, 1) and len (segs) == 2
+    n = len (segments)
+    assert len (calls) < n * (n - 1) // 2
@@ -0,0 +1,71 @@
+"""Formato binario (GEOCOMPB) contra a leitura do texto"""
+
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from geocomp.common import binary
+from geocomp.common import io
+from geocomp.common.disc import Disc
+from geocomp.common.point import Point
+from geocomp.common.polygon import Polygon
+from geocomp.common.segment import Segment
+
+
+def data_files ():
+    ret = []
+    for dirpath, dirnames, filenames in os.walk (os.path.join (ROOT, 'dados')):
+        ret.extend (os.path.join (dirpath, f) for f in sorted (filenames))
+    return sorted (ret)
+
+def key (obj):
+    "Tupla com o tipo e as coordenadas de um objeto de io.read"
+    if isinstance (obj, Point):
+        return ('point', obj.x, obj.y)
+    if isinstance (obj, Segment):
+        return ('segment', obj.init.x, obj.init.y, obj.to.x, obj.to.y)
+    if isinstance (obj, Disc):
+        return ('disc', obj.center.x, obj.center.y, obj.r)
+    return ('polygon',) + tuple ((p.x, p.y) for p in obj.vertices ())
+
+
+@pytest.mark.parametrize ('name', data_files (),
+                          ids = lambda name: os.path.relpath (name, ROOT))
+def test_convert (name, tmp_path):
+    "convert + load devolve os mesmos objetos, na mesma ordem, que o texto"
+    try:
+        expected = io.read (name)
+    except ValueError:
+        pytest.skip ('not a data file')
+    filename = str (tmp_path / 'data.bin')
+    binary.convert (name, filename)
+    assert binary.is_binary (filename)
+    got = binary.load (filename).objects ()
+    assert [key (d) for d in got] == [key (d) for d in expected]
+    # io.read tambem reconhece o arquivo binario
+    assert [key (d) for d in io.read (filename)] == [key (d) for d in expected]
+
+def test_write_mixed (tmp_path):
+    data = [Point (0, 0), Point (1.5, 2), Segment (Point (0, 0), Point (1, 1)),
+            Polygon ([Point (0, 0), Point (1, 0), Point (0, 1)]),
+            Point (3, 4), Disc (1, 2, 3),
+            Polygon ([Point (5, 5), Point (6, 5), Point (5, 6)])]
+    filename = str (tmp_path / 'mixed.bin')
+    binary.write (filename, data)
+    f = binary.load (filename)
+    assert len (f) == len (data)
+    assert [key (d) for d in f.objects ()] == [key (d) for d in data]
+    assert f.points.x.tolist () == [0, 1.5, 3]
+    assert f.polygon_offsets.tolist () == [0, 3, 6]
+
+def test_arrays (tmp_path):
+    "Um arquivo so de pontos nao tem ORDR, e os pontos sao um PointSet mapeado"
+    xy = np.random.default_rng (0).random ((1000, 2))
+    filename = str (tmp_path / 'points.bin')
+    binary.write_arrays (filename, points = xy)
+    f = binary.load (filename)
+    assert f.order is None
+    assert isinstance (f.points.x, np.ndarray)
+    assert (f.points.x == xy[:, 0]).all () and (f.points.y == xy[:, 1]).all ()
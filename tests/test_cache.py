@@ -0,0 +1,92 @@
+"""Cache em disco dos arquivos de entrada"""
+
+import os
+
+import pytest
+
+from conftest import ROOT
+from geocomp import config
+from geocomp.common import cache
+from geocomp.common import io
+from geocomp.common.pointset import PointSet
+
+POINTS = os.path.join (ROOT, 'dados', 'LOOSE_PTS', 'ptos750.pts')
+SEGMENTS = os.path.join (ROOT, 'dados', 'SEG_INTERSEC', 'segments2.txt')
+
+
+@pytest.fixture (autouse = True)
+def cachedir (tmp_path, monkeypatch):
+    monkeypatch.setattr (config, 'CACHE', True)
+    monkeypatch.setattr (config, 'CACHEDIR', str (tmp_path / 'cache'))
+
+def coords (data):
+    return [(p.x, p.y) for p in data]
+
+def test_objects ():
+    expected = io.read (SEGMENTS)
+    for i in range (2):
+        data = cache.read (SEGMENTS)
+        assert [(s.init.x, s.init.y, s.to.x, s.to.y) for s in data] == \
+               [(s.init.x, s.init.y, s.to.x, s.to.y) for s in expected]
+    assert len (cache._entries ()) == 1
+
+def test_arrays ():
+    "Com arrays, um arquivo so de pontos vira o PointSet mapeado da entrada"
+    expected = coords (io.read (POINTS))
+    for i in range (2):
+        data = cache.read (POINTS, arrays = True)
+        assert isinstance (data, PointSet)
+        assert not data.x.flags.writeable
+        assert coords (data) == expected
+    assert coords (cache.read (POINTS)) == expected
+    # arquivos com outros tipos continuam devolvendo objetos
+    assert not isinstance (cache.read (SEGMENTS, arrays = True), PointSet)
+
+def test_hash_only_on_change (tmp_path, monkeypatch):
+    "O hash so e' recalculado quando o mtime ou o tamanho mudam"
+    name = str (tmp_path / 'points.txt')
+    with open (name, 'w') as file:
+        file.write ('0 0\n1 1\n')
+    calls = []
+    hash = cache._hash
+    monkeypatch.setattr (cache, '_hash', lambda f: calls.append (f) or hash (f))
+    cache.read (name)
+    cache.read (name)
+    assert len (calls) == 1
+    with open (name, 'a') as file:
+        file.write ('2 2\n')
+    assert coords (cache.read (name)) == [(0, 0), (1, 1), (2, 2)]
+    assert len (calls) == 2
+
+def test_bad_input (tmp_path):
+    name = str (tmp_path / 'bad.txt')
+    with open (name, 'w') as file:
+        file.write ('1 2 3 4 5\n')
+    with pytest.raises (ValueError):
+        cache.read (name)
+
+def test_off (monkeypatch):
+    "Desligado (o padrao), o cache nao cria nada em disco"
+    monkeypatch.setattr (config, 'CACHE', False)
+    assert coords (cache.read (POINTS)) == coords (io.read (POINTS))
+    assert not os.path.exists (config.CACHEDIR)
+
+def test_evict (tmp_path, monkeypatch):
+    "Entradas apagadas pelo limite de tamanho saem do indice"
+    names = []
+    for i in range (3):
+        name = str (tmp_path / ('points%d.txt' % i))
+        with open (name, 'w') as file:
+            file.write ('%d 0\n1 1\n' % i)
+        names.append (name)
+    cache.read (names[0])
+    entry = os.path.join (config.CACHEDIR, cache._entries ()[0])
+    # a entrada mais antiga e' apagada quando a terceira e' criada
+    os.utime (entry, ns = (0, 0))
+    monkeypatch.setattr (config, 'CACHE_SIZE', 2 * os.path.getsize (entry))
+    for name in names[1:]:
+        cache.read (name)
+    assert not os.path.exists (entry)
+    assert len (cache._entries ()) == 2
+    assert sorted (cache._load_index ()) == names[1:]
+    assert [n for n in os.listdir (config.CACHEDIR) if n.endswith ('.tmp')] == []
@@ -0,0 +1,73 @@
+"""cligeocomp: -j (processos) e -o (registros JSON), com jobs que falham"""
+
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+POINTS = os.path.join (ROOT, 'dados', 'LOOSE_PTS', 'ptos750.pts')
+SEGMENTS = os.path.join (ROOT, 'dados', 'SEG_INTERSEC', 'seg0')
+
+
+def cli (tmp_path, *args):
+    "Roda cligeocomp.py com args; devolve a saida e os registros de -o"
+    out = str (tmp_path / 'out.jsonl')
+    env = dict (os.environ, HOME = str (tmp_path))
+    proc = subprocess.run ([sys.executable, os.path.join (ROOT, 'cligeocomp.py'),
+                            '-o', out] + list (args), cwd = ROOT, env = env,
+                           capture_output = True, text = True, timeout = 300)
+    assert proc.returncode == 0, proc.stderr
+    with open (out) as file:
+        return proc.stdout, [json.loads (line) for line in file]
+
+
+def test_jobs (tmp_path):
+    "-j 2 da' os mesmos registros, na mesma ordem, que um processo so"
+    args = ['-p', 'closest/divide,convex_hull/graham', POINTS,
+            os.path.join (ROOT, 'dados', 'LOOSE_PTS', 'circ32')]
+    out1, serial = cli (tmp_path, '-j', '1', *args)
+    out2, parallel = cli (tmp_path, '-j', '2', *args)
+    assert len (serial) == 4
+    key = lambda r: (r['algorithm'], r['file'], r['count'], r['output'], r['error'])
+    assert [key (r) for r in serial] == [key (r) for r in parallel]
+    for r in serial:
+        assert r['error'] is None
+        assert r['wall_time'] >= 0 and r['cpu_time'] >= 0
+        assert 'stdout' not in r
+    assert serial[0]['extra_info'].startswith ('distancia')
+
+def test_failing_jobs (tmp_path):
+    "Arquivo inexistente, algoritmo desconhecido e erro do algoritmo nao param o lote"
+    missing = str (tmp_path / 'nonexistent.pts')
+    bad = str (tmp_path / 'bad.pts')
+    with open (bad, 'w') as file:
+        file.write ('1 2 3 4 5\n')
+    out, records = cli (tmp_path, '-j', '2', '-p',
+                        'closest/brute,closest/nothing',
+                        missing, bad, POINTS)
+    assert [r['file'] for r in records] == [missing, bad, POINTS] * 2
+    errors = [r['error'] for r in records]
+    assert errors[0].startswith ('FileNotFoundError')
+    assert errors[1].startswith ('ValueError')
+    assert errors[2] is None and records[2]['count'] > 0
+    assert all (e.startswith ('KeyError') for e in errors[3:])
+    assert out.count ('erro:') == 5
+
+def test_algorithm_error (tmp_path):
+    "Um algoritmo de segmentos sobre um arquivo de pontos falha so no seu job"
+    out, records = cli (tmp_path, '-a', POINTS, 'lineintersections/bentley_ottman',
+                        'closest/divide')
+    assert records[0]['error'] is not None
+    assert records[1]['error'] is None
+
+def test_cache_flag (tmp_path):
+    "O cache de entradas so e' usado com -c"
+    cachedir = tmp_path / '.cache' / 'geocomp'
+    out, records = cli (tmp_path, 'closest/brute', POINTS)
+    assert not cachedir.exists ()
+    for i in range (2):
+        out, cached = cli (tmp_path, '-c', '-j', '2', 'closest/brute', POINTS)
+        assert cached[0]['count'] == records[0]['count']
+    assert len ([n for n in os.listdir (cachedir) if n.endswith ('.gcb')]) == 1
@@ -0,0 +1,51 @@
+"""Par mais proximo: Brute, Divide e Grid devolvem o mesmo resultado"""
+
+import math
+import random
+
+import pytest
+
+from geocomp.closest import brute, divide, grid
+from geocomp.common.point import Point
+from geocomp.common.pointset import PointSet, coordinates
+from geocomp.common.segment import Segment
+
+ALGORITHMS = [brute.Brute, divide.Divide, grid.Grid]
+
+
+def d2 (segment):
+    return (segment.init.x - segment.to.x) ** 2 + (segment.init.y - segment.to.y) ** 2
+
+def inputs ():
+    rng = random.Random (0)
+    ret = [[Point (0, 0), Point (3, 4)]]
+    for t in range (30):
+        n = rng.randint (2, 60)
+        if t % 2:
+            ret.append ([Point (rng.randint (0, 8), rng.randint (0, 8)) for i in range (n)])
+        else:
+            ret.append ([Point (rng.uniform (0, 100), rng.uniform (0, 100)) for i in range (n)])
+    return ret
+
+@pytest.mark.parametrize ('alg', ALGORITHMS, ids = lambda f: f.__name__)
+def test_segment (alg):
+    "Cada algoritmo devolve um Segment com a distancia em extra_info"
+    for points in inputs ():
+        expected = d2 (brute.Brute (points))
+        for data in points, PointSet.from_points (points):
+            ret = alg (data)
+            assert isinstance (ret, Segment)
+            assert d2 (ret) == expected
+            assert ret.extra_info == 'distancia: %.2f' % math.sqrt (expected)
+
+@pytest.mark.parametrize ('alg', ALGORITHMS, ids = lambda f: f.__name__)
+def test_too_few (alg):
+    assert alg ([]) is None
+    assert alg ([Point (1, 1)]) is None
+
+def test_coordinates ():
+    ps = PointSet ([1.0, 2.0], [3.0, 4.0])
+    x, y = coordinates (ps)
+    assert x is ps.x and y is ps.y
+    x, y = coordinates ([Point (1, 3), Point (2, 4)])
+    assert x.tolist () == [1, 2] and y.tolist () == [3, 4]
@@ -0,0 +1,131 @@
+"""Fecho convexo: os algoritmos devolvem indices na lista recebida e
+concordam com um fecho de referencia, inclusive com pontos repetidos e
+colineares"""
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+
+from geocomp.convex_hull import akl_toussaint, chan, graham, monotone
+from geocomp.common import prim
+from geocomp.common.point import Point
+from geocomp.common.pointset import PointSet
+
+ALGORITHMS = [graham.Graham, monotone.Monotone, chan.Chan]
+# devolvem so os vertices extremos, a partir do de menor y
+STRICT = [monotone.Monotone, chan.Chan, akl_toussaint.MonotoneFiltrado,
+          akl_toussaint.ChanFiltrado]
+
+
+def inputs ():
+    rng = random.Random (0)
+    ret = [[Point (0, 0), Point (4, 0), Point (0, 3)]]
+    for t in range (30):
+        n = rng.randint (3, 60)
+        if t % 2:
+            ret.append ([Point (rng.randint (0, 8), rng.randint (0, 8)) for i in range (n)])
+        else:
+            ret.append ([Point (rng.uniform (0, 100), rng.uniform (0, 100)) for i in range (n)])
+    return ret
+
+def degenerate ():
+    "Entradas com muitos pontos repetidos ou colineares"
+    rng = random.Random (1)
+    ret = [[Point (i, 2 * i) for i in range (6)],
+           [Point (1, 1)] * 4,
+           [Point (0, 0), Point (0, 0), Point (2, 0), Point (2, 0), Point (1, 1),
+            Point (1, 1), Point (0, 2)],
+           [Point (i, j) for i in range (5) for j in range (5)],
+           # todos os pontos sao vertices
+           [Point (i, i * i) for i in range (-10, 11)],
+           [Point (math.cos (t / 10), math.sin (t / 10)) for t in range (63)]]
+    for t in range (10):
+        pts = [Point (rng.randint (0, 4), rng.randint (0, 4)) for i in range (40)]
+        ret.append (pts + rng.sample (pts, 10))
+    return ret
+
+def reference (points):
+    """Vertices extremos do fecho de points (como pares (x, y)), em sentido
+    anti-horario a partir do de menor y, calculados com Fraction"""
+    pts = sorted (set ((p.x, p.y) for p in points))
+    if len (pts) < 3:
+        return sorted (pts, key = lambda p: (p[1], p[0]))
+    def turn (o, a, b):
+        return (Fraction (a[0]) - Fraction (o[0])) * (Fraction (b[1]) - Fraction (o[1])) - \
+               (Fraction (a[1]) - Fraction (o[1])) * (Fraction (b[0]) - Fraction (o[0]))
+    def chain (pts):
+        ret = []
+        for p in pts:
+            while len (ret) >= 2 and turn (ret[-2], ret[-1], p) <= 0:
+                ret.pop ()
+            ret.append (p)
+        return ret[:-1]
+    hull = chain (pts) + chain (pts[::-1])
+    k = hull.index (min (hull, key = lambda p: (p[1], p[0])))
+    return hull[k:] + hull[:k]
+
+def coords (points, hull):
+    return [(points[i].x, points[i].y) for i in hull]
+
+def distinct (points):
+    "Pontos em posicao geral: sem repetidos e sem tres colineares"
+    for i in range (len (points)):
+        for j in range (i):
+            if (points[i].x, points[i].y) == (points[j].x, points[j].y):
+                return False
+            for k in range (j):
+                if prim.orient2d (points[i], points[j], points[k]) == 0:
+                    return False
+    return True
+
+@pytest.mark.parametrize ('alg', ALGORITHMS, ids = lambda f: f.__name__)
+def test_input_unchanged (alg):
+    "A lista recebida nao e' reordenada"
+    for points in inputs () + degenerate ():
+        before = list (points)
+        alg (points)
+        assert all (p is q for p, q in zip (points, before))
+
+def test_same_indices ():
+    "Graham e Monotone devolvem os mesmos indices, na mesma ordem"
+    for points in inputs () + degenerate ():
+        expected = monotone.Monotone (points)
+        for data in points, PointSet.from_points (points):
+            ret = graham.Graham (data)
+            if distinct (points):
+                assert ret == expected
+            else:
+                # o Graham pode manter pontos repetidos ou colineares com
+                # a primeira aresta
+                assert reference (points[i] for i in ret) == coords (points, expected)
+
+@pytest.mark.parametrize ('alg', STRICT, ids = lambda f: f.__name__)
+def test_reference (alg):
+    "Os vertices devolvidos sao os do fecho de referencia, na mesma ordem"
+    for points in inputs () + degenerate ():
+        expected = reference (points)
+        for data in points, PointSet.from_points (points):
+            ret = alg (data)
+            assert len (set (ret)) == len (ret)
+            assert coords (points, ret) == expected
+
+def test_graham_reference ():
+    "O fecho dos pontos devolvidos pelo Graham e' o de referencia"
+    for alg in graham.Graham, akl_toussaint.GrahamFiltrado:
+        for points in inputs () + degenerate ():
+            ret = alg (points)
+            assert reference (points[i] for i in ret) == reference (points)
+
+def test_filter ():
+    "O filtro de Akl-Toussaint descarta pontos sem mudar o fecho"
+    rng = random.Random (2)
+    points = [Point (rng.uniform (0, 100), rng.uniform (0, 100)) for i in range (2000)]
+    expected = monotone.Monotone (points)
+    for alg in akl_toussaint.MonotoneFiltrado, akl_toussaint.ChanFiltrado:
+        ret = alg (PointSet.from_points (points))
+        assert list (ret) == expected
+        assert 0 < ret.descartados < len (points)
+        assert ret.extra_info == 'descartados: %d de %d pontos' % (ret.descartados,
+                                                                   len (points))
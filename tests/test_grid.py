@@ -0,0 +1,80 @@
+"""closest.grid contra a forca bruta"""
+
+import random
+
+import numpy as np
+
+from geocomp import config
+from geocomp.common.point import Point
+from geocomp.closest import grid
+
+
+def brute_d2 (points):
+    n = len (points)
+    return min ((points[i].x - points[j].x) ** 2 + (points[i].y - points[j].y) ** 2
+                for i in range (n) for j in range (i + 1, n))
+
+def d2 (segment):
+    return (segment.init.x - segment.to.x) ** 2 + (segment.init.y - segment.to.y) ** 2
+
+def test_random ():
+    rng = random.Random (0)
+    for t in range (200):
+        n = rng.randint (2, 80)
+        kind = t % 4
+        if kind == 0:
+            points = [Point (rng.uniform (0, 100), rng.uniform (0, 100))
+                      for i in range (n)]
+        elif kind == 1:
+            # repetidos e celulas cheias
+            points = [Point (rng.randint (0, 10), rng.randint (0, 10))
+                      for i in range (n)]
+        elif kind == 2:
+            # escalas muito diferentes em x e y
+            points = [Point (rng.gauss (0, 1) * 10 ** rng.randint (-6, 6),
+                             rng.gauss (0, 1)) for i in range (n)]
+        else:
+            points = [Point (float (i), 0.0) for i in range (n)]
+        assert d2 (grid.Grid (points, seed = t)) == brute_d2 (points)
+
+def test_cell_table ():
+    rng = np.random.default_rng (0)
+    ix = rng.integers (0, 8, 200)
+    iy = rng.integers (0, 8, 200)
+    cells = grid.CellTable (ix, iy)
+    assert (cells.tx[cells.slots] == ix).all ()
+    assert (cells.ty[cells.slots] == iy).all ()
+    assert (cells.find (ix, iy) == cells.slots).all ()
+    # (ix, iy) e (iy, ix) sao celulas diferentes
+    assert (cells.find (np.arange (8, 18), np.arange (10)) == cells.size).all ()
+    assert (cells.find (ix + 8, iy) == cells.size).all ()
+    order, start = cells.buckets ()
+    assert sorted (order) == list (range (200))
+    for s in set (cells.slots.tolist ()):
+        bucket = order[start[s]:start[s] + cells.counts[s]]
+        assert (cells.slots[bucket] == s).all ()
+
+def test_fine_grid ():
+    """Grades com mais de 2^31 celulas num eixo (as chaves ix * largura + iy
+    nao caberiam em int64) e com mais de 2^52 (o lado e' aumentado)"""
+    for near, far in (1e-9, 1e4), (1e-12, 1e6):
+        rng = random.Random (1)
+        points = [Point (rng.uniform (0, far), rng.uniform (0, far))
+                  for i in range (300)]
+        a = points[7]
+        points.append (Point (a.x + near, a.y - near))
+        x = np.array ([p.x for p in points])
+        y = np.array ([p.y for p in points])
+        ix, iy, side = grid.cell_index (x, y, near)
+        assert (side > near) == (far / near > grid.MAX_INDEX)
+        assert d2 (grid.Grid (points, seed = 0)) == brute_d2 (points)
+
+def test_seed (monkeypatch):
+    "A mesma semente (parametro ou config.SEED) da' o mesmo crivo"
+    rng = np.random.default_rng (5)
+    x, y = rng.random (1000), rng.random (1000)
+    a = grid.sieve (x, y, np.random.default_rng (3))
+    assert grid.sieve (x, y, np.random.default_rng (3)) == a
+    points = [Point (float (px), float (py)) for px, py in zip (x, y)]
+    monkeypatch.setattr (config, 'SEED', 7)
+    assert d2 (grid.Grid (points)) == d2 (grid.Grid (points, seed = 7))
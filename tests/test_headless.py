@@ -0,0 +1,76 @@
+"""Modo sem interface grafica: nenhum algoritmo chama o toolkit"""
+
+import random
+
+import pytest
+
+import geocomp
+from geocomp.common import control
+from geocomp.common import guicontrol
+from geocomp.common import guiprim
+from geocomp.common import prim
+from geocomp.common import registry
+from geocomp.common.point import Point
+from geocomp.common.segment import Segment
+from geocomp.gui import dummy
+
+
+class Forbidden:
+    "Toolkit sem interface grafica que falha se alguma operacao grafica for chamada"
+
+    HEADLESS = True
+
+    def init_display (self, master):
+        pass
+
+    def hide_algorithm (self):
+        return 0
+
+    def __getattr__ (self, name):
+        def call (*args):
+            raise AssertionError ('%s chamado no modo sem interface' % name)
+        return call
+
+@pytest.fixture
+def forbidden ():
+    geocomp.init_display (Forbidden (), None)
+    yield
+    geocomp.init_display (dummy, None)
+
+def inputs (kind):
+    rng = random.Random (0)
+    if kind == 'points':
+        return [Point (rng.randint (0, 50), rng.randint (0, 50)) for i in range (40)]
+    return [Segment (Point (rng.randint (0, 50), rng.randint (0, 50)),
+                     Point (rng.randint (0, 50), rng.randint (0, 50)))
+            for i in range (15)]
+
+@pytest.mark.parametrize ('alg', registry.algorithms (), ids = lambda a: a.name)
+def test_algorithms (forbidden, alg):
+    "Cada algoritmo roda sem tocar no toolkit e ainda conta as primitivas"
+    result = geocomp.run_algorithm (alg.load (), inputs (alg.input_type))
+    assert result.count > 0
+
+def test_drawing_methods (forbidden):
+    "Os metodos de desenho de Point e Segment e as primitivas de guiprim nao desenham"
+    a, b, c = Point (0, 0), Point (1, 0), Point (0, 1)
+    assert a.hilight () is None and a.plot () is None
+    assert a.lineto (b) is None
+    assert not hasattr (a, 'lineto_id')
+    s = Segment (a, b)
+    s.plot ()
+    s.hilight ()
+    assert control.plot_disc (0, 0, 'red', 1) == 0
+    assert guiprim.dist2 (a, c) == prim.dist2 (a, c) == 1
+    assert guiprim.left (a, b, c)
+
+def test_set_headless ():
+    "Desligar o modo sem interface volta os metodos de desenho"
+    hilight = Point.hilight
+    try:
+        guicontrol.set_headless (0)
+        assert Point.hilight is not hilight
+        assert not control.headless
+    finally:
+        guicontrol.set_headless (1)
+    assert Point.hilight is hilight and control.headless
@@ -0,0 +1,124 @@
+"""io: leitor em bloco (io.read, _region_blocks) e leitura preguicosa
+(iter_read), com as regioes que caem no leitor linha a linha"""
+
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from geocomp.common import io
+from geocomp.common.disc import Disc
+from geocomp.common.point import Point
+from geocomp.common.polygon import Polygon
+from geocomp.common.segment import Segment
+
+MIXED = '''# comentario
+0 0
+1.5 2
+[
+0 0
+1 0
+0 1
+]
+# pontos, segmentos e discos misturados sem marcador entre eles
+3 4
+0 0 1 1
+5 6
+1 2 3
+2 2 3 3
+
+7 8
+[
+5 5
+6 5
+# comentario dentro do poligono
+5 6
+]
+'''
+
+
+def key (obj):
+    if isinstance (obj, Point):
+        return ('point', obj.x, obj.y)
+    if isinstance (obj, Segment):
+        return ('segment', obj.init.x, obj.init.y, obj.to.x, obj.to.y)
+    if isinstance (obj, Disc):
+        return ('disc', obj.center.x, obj.center.y, obj.r)
+    return ('polygon',) + tuple ((p.x, p.y) for p in obj.vertices ())
+
+def records (filename):
+    "Os objetos do leitor linha a linha (io._iter_records), como chaves"
+    ret = []
+    for kind, values in io._iter_records (filename):
+        if kind == 'polygon':
+            ret.append (('polygon',) + tuple (values))
+        else:
+            ret.append ((kind,) + tuple (values))
+    return ret
+
+def data_files ():
+    ret = []
+    for dirpath, dirnames, filenames in os.walk (os.path.join (ROOT, 'dados')):
+        ret.extend (os.path.join (dirpath, f) for f in filenames)
+    return sorted (ret)
+
+@pytest.fixture
+def mixed (tmp_path):
+    name = str (tmp_path / 'mixed.txt')
+    with open (name, 'w') as file:
+        file.write (MIXED)
+    return name
+
+
+@pytest.mark.parametrize ('name', data_files (),
+                          ids = lambda name: os.path.relpath (name, ROOT))
+def test_data_files (name):
+    "io.read e iter_read leem o mesmo que o leitor linha a linha"
+    try:
+        expected = records (name)
+    except ValueError:
+        with pytest.raises (ValueError):
+            io.read (name)
+        return
+    assert [key (d) for d in io.read (name)] == expected
+    assert [key (d) for d in io.iter_read (name)] == expected
+
+def test_mixed (mixed):
+    "Regioes com tipos misturados caem no leitor linha a linha"
+    expected = records (mixed)
+    assert [k[0] for k in expected] == ['point', 'point', 'polygon', 'point',
+        'segment', 'point', 'disc', 'segment', 'point', 'polygon']
+    assert [key (d) for d in io.read (mixed)] == expected
+    assert [key (d) for d in io.iter_read (mixed)] == expected
+    assert [key (d) for d in io.iter_read (mixed, 'segment')] == \
+           [k for k in expected if k[0] == 'segment']
+
+def test_small_pieces (mixed, monkeypatch):
+    "O resultado nao depende de onde o arquivo e' cortado em pedacos"
+    expected = records (mixed)
+    for piece in 1, 2, 3, 7, 16:
+        monkeypatch.setattr (io, 'PIECE', piece)
+        assert [key (d) for d in io.read (mixed)] == expected
+
+def test_chunks (tmp_path, monkeypatch):
+    xy = np.random.default_rng (0).random ((1000, 2))
+    name = str (tmp_path / 'points.txt')
+    np.savetxt (name, xy, header = 'pontos')
+    monkeypatch.setattr (io, 'PIECE', 4096)
+    chunks = list (io.iter_read (name, 'point', chunk = 300))
+    assert [len (c) for c in chunks] == [300, 300, 300, 100]
+    assert (np.concatenate (chunks) == xy).all ()
+
+def test_errors (tmp_path, mixed):
+    name = str (tmp_path / 'bad.txt')
+    with open (name, 'w') as file:
+        file.write ('0 0\n1 1\n1 2 3 4 5\n')
+    with pytest.raises (ValueError, match = 'line: 3'):
+        io.read (name)
+    with pytest.raises (ValueError):
+        list (io.iter_read (mixed, 'triangle'))
+    with pytest.raises (ValueError):
+        io.iter_read (mixed, 'polygon', chunk = 10)
+    with pytest.raises (ValueError):
+        io.iter_read (mixed, 'point', chunk = 0)
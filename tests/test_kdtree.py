@@ -0,0 +1,124 @@
+"""KDTree contra a forca bruta
+
+Com empates, qualquer dos pontos a mesma distancia pode ser devolvido,
+entao as buscas de vizinhos sao comparadas pelas distancias."""
+
+import random
+
+import numpy as np
+import pytest
+
+from geocomp.common.kdtree import KDTree
+from geocomp.common.point import Point
+
+
+def d2 (p, q):
+    # como na arvore (x ** 2 nem sempre e' igual a x * x)
+    dx = p.x - q.x
+    dy = p.y - q.y
+    return dx*dx + dy*dy
+
+def point_sets ():
+    "Conjuntos com pontos repetidos, colineares e aleatorios"
+    rng = random.Random (0)
+    ret = [[Point (1.0, 1.0)], [Point (2.0, 3.0)] * 5,
+           [Point (float (i), 0.0) for i in range (20)]]
+    for t in range (20):
+        n = rng.randint (2, 120)
+        if t % 2:
+            ret.append ([Point (float (rng.randint (0, 6)), float (rng.randint (0, 6)))
+                         for i in range (n)])
+        else:
+            ret.append ([Point (rng.uniform (-50, 50), rng.uniform (-50, 50))
+                         for i in range (n)])
+    return ret
+
+def queries (points):
+    rng = random.Random (len (points))
+    return points[:10] + [Point (rng.uniform (-60, 60), rng.uniform (-60, 60))
+                          for i in range (10)]
+
+LEAF_SIZES = [1, 2, 8]
+
+
+@pytest.mark.parametrize ('leaf_size', LEAF_SIZES)
+def test_nearest (leaf_size):
+    for points in point_sets ():
+        tree = KDTree (points, leaf_size)
+        for q in queries (points):
+            i, dist = tree.nearest (q)
+            assert dist == min (d2 (p, q) for p in points) == d2 (points[i], q)
+        for j, q in enumerate (points[:10]):
+            i, dist = tree.nearest (q, exclude = j)
+            others = [d2 (p, q) for k, p in enumerate (points) if k != j]
+            if not others:
+                assert i is None and dist == float ('inf')
+                continue
+            assert i != j and dist == min (others) == d2 (points[i], q)
+
+@pytest.mark.parametrize ('leaf_size', LEAF_SIZES)
+def test_k_nearest (leaf_size):
+    for points in point_sets ():
+        tree = KDTree (points, leaf_size)
+        for k in 1, 3, len (points), len (points) + 5:
+            for q in queries (points):
+                found = tree.k_nearest (q, k)
+                expected = sorted (d2 (p, q) for p in points)[:k]
+                assert [t[1] for t in found] == expected
+                assert len (set (t[0] for t in found)) == len (found)
+                assert all (d2 (points[i], q) == dist for i, dist in found)
+
+@pytest.mark.parametrize ('leaf_size', LEAF_SIZES)
+def test_all_nearest (leaf_size):
+    for points in point_sets ():
+        tree = KDTree (points, leaf_size)
+        nn, dist = tree.all_nearest ()
+        if len (points) < 2:
+            assert nn.tolist () == [-1] * len (points)
+            continue
+        for i, p in enumerate (points):
+            best = min (d2 (q, p) for j, q in enumerate (points) if j != i)
+            assert nn[i] != i and dist[i] == best == d2 (points[nn[i]], p)
+
+@pytest.mark.parametrize ('leaf_size', LEAF_SIZES)
+def test_all_k_nearest (leaf_size):
+    for points in point_sets ():
+        tree = KDTree (points, leaf_size)
+        n = len (points)
+        for k in 1, 4, n + 2:
+            ret = tree.all_k_nearest (k)
+            assert ret.shape == (n, k)
+            for i, p in enumerate (points):
+                expected = sorted (d2 (q, p) for j, q in enumerate (points) if j != i)[:k]
+                row = [j for j in ret[i].tolist () if j >= 0]
+                assert i not in row
+                assert [d2 (points[j], p) for j in row] == expected
+                assert ret[i].tolist ()[len (row):] == [-1] * (k - len (row))
+
+@pytest.mark.parametrize ('leaf_size', LEAF_SIZES)
+def test_ranges (leaf_size):
+    for points in point_sets ():
+        tree = KDTree (points, leaf_size)
+        for q in queries (points):
+            for r in 0.0, 1.0, 10.0:
+                assert sorted (tree.in_radius (q, r)) == \
+                       [i for i, p in enumerate (points) if d2 (p, q) <= r * r]
+            box = (q.x - 3, q.x + 5, q.y - 4, q.y + 2)
+            assert sorted (tree.in_box (*box)) == \
+                   [i for i, p in enumerate (points)
+                    if box[0] <= p.x <= box[1] and box[2] <= p.y <= box[3]]
+
+def test_empty ():
+    tree = KDTree ([])
+    q = Point (0.0, 0.0)
+    assert len (tree) == 0
+    assert tree.nearest (q) == (None, float ('inf'))
+    assert tree.k_nearest (q, 3) == []
+    assert tree.in_radius (q, 10) == [] and tree.in_box (-1, 1, -1, 1) == []
+    nn, dist = tree.all_nearest ()
+    assert len (nn) == 0 and len (dist) == 0
+    assert tree.all_k_nearest (2).shape == (0, 2)
+
+def test_leaf_size ():
+    with pytest.raises (ValueError):
+        KDTree ([Point (0, 0)], leaf_size = 0)
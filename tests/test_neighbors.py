@@ -0,0 +1,74 @@
+"""closest.neighbors contra a forca bruta
+
+Com empates, qualquer vizinho a mesma distancia serve: as respostas
+sao comparadas pelas distancias."""
+
+import random
+
+import numpy as np
+import pytest
+
+from geocomp.closest import neighbors
+from geocomp.common.point import Point
+from geocomp.common.pointset import PointSet
+
+
+def point_sets ():
+    rng = random.Random (1)
+    ret = [[Point (0.0, 0.0), Point (3.0, 4.0)], [Point (1.0, 1.0)] * 4]
+    for t in range (20):
+        n = rng.randint (2, 150)
+        if t % 2:
+            ret.append ([Point (float (rng.randint (0, 5)), float (rng.randint (0, 5)))
+                         for i in range (n)])
+        else:
+            ret.append ([Point (rng.uniform (0, 100), rng.uniform (0, 100))
+                         for i in range (n)])
+    return ret
+
+def distances (points):
+    "Matriz n x n dos quadrados das distancias (inf na diagonal)"
+    x = np.array ([p.x for p in points])
+    y = np.array ([p.y for p in points])
+    dx = x[:, None] - x[None, :]
+    dy = y[:, None] - y[None, :]
+    d2 = dx * dx + dy * dy
+    np.fill_diagonal (d2, np.inf)
+    return d2
+
+
+def test_all_nearest ():
+    for points in point_sets ():
+        d2 = distances (points)
+        rows = np.arange (len (points))
+        for data in points, PointSet.from_points (points):
+            nn = neighbors.all_nearest (data)
+            assert (nn != rows).all ()
+            assert (d2[rows, nn] == d2.min (axis = 1)).all ()
+        brute = neighbors.all_nearest_brute (points)
+        assert (d2[rows, brute] == d2.min (axis = 1)).all ()
+
+@pytest.mark.parametrize ('k', [1, 2, 5])
+def test_k_nearest (k):
+    for points in point_sets ():
+        n = len (points)
+        d2 = distances (points)
+        ret = neighbors.k_nearest (points, k)
+        assert ret.shape == (n, k)
+        m = min (k, n - 1)
+        assert (ret[:, m:] == -1).all ()
+        for i in range (n):
+            row = ret[i, :m]
+            assert len (set (row.tolist ())) == m and i not in row
+            assert d2[i, row].tolist () == sorted (d2[i])[:m]
+
+def test_small ():
+    assert neighbors.all_nearest ([]).tolist () == []
+    assert neighbors.all_nearest ([Point (1.0, 2.0)]).tolist () == [-1]
+    assert neighbors.all_nearest_brute ([Point (1.0, 2.0)]).tolist () == [-1]
+    assert neighbors.k_nearest ([Point (1.0, 2.0)], 2).tolist () == [[-1, -1]]
+
+def test_algorithm ():
+    "AllNearest devolve o array de all_nearest"
+    points = point_sets ()[5]
+    assert (neighbors.AllNearest (points) == neighbors.all_nearest (points)).all ()
@@ -0,0 +1,93 @@
+"""Point, PointSet e PointView"""
+
+import types
+
+import numpy as np
+import pytest
+
+from geocomp.common import prim
+from geocomp.common.point import Point
+from geocomp.common.pointset import PointSet, PointView, point_list
+from geocomp.common.polygon import Polygon
+
+
+def test_point_slots ():
+    "Coordenadas e atributos da interface sao slots; os outros vao para o __dict__"
+    p = Point (1.0, 2.0)
+    for name in 'x', 'y', 'plot_id', 'hi', 'lineto_id', 'polygon_id':
+        assert isinstance (Point.__dict__[name], types.MemberDescriptorType)
+    with pytest.raises (AttributeError):
+        p.plot_id
+    assert p.polygon_id == -1
+    p.hi = 3
+    p.polygon_id = 7
+    p.anything = 'x'
+    assert (p.hi, p.polygon_id, p.anything) == (3, 7, 'x')
+    assert p.__dict__ == { 'anything': 'x' }
+    del p.anything
+    with pytest.raises (AttributeError):
+        p.anything
+    p.x = 5
+    assert (p.x, p.y) == (5, 2.0)
+
+def test_point_dimension ():
+    p = Point (1, 2, 3)
+    assert (p.dimension, p.z, p[2], p[3]) == (3, 3, 3, 0)
+    p[2] = 4
+    assert repr (p) == '( 1, 2, 4 )'
+    q = Point (1)
+    assert (q.dimension, q[0], q[1]) == (1, 1, 0)
+    with pytest.raises (ValueError):
+        Point (1, 2).z
+
+def test_polygon_links ():
+    pts = [Point (0, 0), Point (1, 0), Point (0, 1)]
+    poly = Polygon (pts)
+    assert [(p.x, p.y) for p in poly.vertices ()] == [(0, 0), (1, 0), (0, 1)]
+    assert pts[0].next is pts[1] and pts[0].prev is pts[2]
+
+def test_pointset ():
+    xy = np.array ([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]])
+    ps = PointSet.from_array (xy)
+    assert len (ps) == 3
+    assert (ps.xy == xy).all ()
+    assert [(p.x, p.y) for p in ps] == [(0, 1), (2, 3), (4, 5)]
+    assert (ps[-1].x, ps[-1].y) == (4, 5)
+    with pytest.raises (IndexError):
+        ps[3]
+    part = ps[1:]
+    assert isinstance (part, PointSet) and len (part) == 2
+    part.x[0] = 9
+    assert ps.x[1] == 2
+    same = PointSet.from_points ([Point (0, 1), Point (2, 3), Point (4, 5)])
+    assert (same.x == ps.x).all () and (same.y == ps.y).all ()
+    with pytest.raises (ValueError):
+        PointSet ([1, 2], [1])
+
+def test_point_view ():
+    ps = PointSet ([0.0, 2.0], [1.0, 3.0])
+    v = ps[1]
+    assert isinstance (v, PointView) and isinstance (v, Point)
+    assert v == Point (2.0, 3.0) and Point (2.0, 3.0) == v
+    assert hash (v) == hash (Point (2.0, 3.0))
+    assert (v[0], v[1], v.dimension) == (2, 3, 2)
+    v.x = 7
+    v[1] = 8
+    assert (ps.x[1], ps.y[1]) == (7, 8)
+    v.hi = 1
+    assert v.hi == 1
+    assert prim.dist2 (ps[0], Point (3.0, 5.0)) == 25
+
+def test_point_list ():
+    ps = PointSet ([0.0, 1.0], [0.0, 1.0])
+    l = point_list (ps)
+    assert all (isinstance (p, PointView) for p in l)
+    pts = [Point (0, 0)]
+    assert point_list (pts) is pts
+
+def test_many ():
+    "As primitivas *_many aceitam um PointSet"
+    ps = PointSet ([0.0, 1.0, 2.0], [1.0, 0.0, -1.0])
+    a, b = Point (0, 0), Point (1, 0)
+    assert list (prim.area2_many (a, b, ps)) == [1, 0, -1]
+    assert list (prim.left_many (a, b, ps)) == [True, False, False]
@@ -0,0 +1,171 @@
+"""Primitivas: orient2d exato (filtro de ponto flutuante + Fraction), as
+versoes *_many e a contagem de operacoes primitivas"""
+
+from fractions import Fraction
+
+import numpy as np
+
+import geocomp
+from geocomp.common import prim
+from geocomp.gui import dummy
+from geocomp.common.point import Point
+from geocomp.common.segment import Segment
+
+# distancia entre dois floats consecutivos em [0.5, 1)
+ULP = 2.0 ** -53
+
+
+def exact (a, b, c):
+    det = (Fraction (b.x) - Fraction (a.x)) * (Fraction (c.y) - Fraction (a.y)) - \
+          (Fraction (b.y) - Fraction (a.y)) * (Fraction (c.x) - Fraction (a.x))
+    return (det > 0) - (det < 0)
+
+def naive (a, b, c):
+    det = prim._area2 (a, b, c)
+    return (det > 0) - (det < 0)
+
+def near_degenerate ():
+    """Pontos a uma distancia de poucos ULPs da reta y = x, testados contra
+    (12, 12) e (24, 24): a conta em ponto flutuante erra o sinal em varios"""
+    b, c = Point (12.0, 12.0), Point (24.0, 24.0)
+    return [(Point (0.5 + i * ULP, 0.5 + j * ULP), b, c)
+            for i in range (32) for j in range (32)]
+
+def exact_calls (monkeypatch):
+    "Lista que recebe uma entrada por chamada de _orient2d_exact"
+    calls = []
+    orig = prim._orient2d_exact
+    monkeypatch.setattr (prim, '_orient2d_exact',
+                         lambda a, b, c: calls.append (1) or orig (a, b, c))
+    return calls
+
+
+def test_orient2d_near_degenerate (monkeypatch):
+    "orient2d da' o sinal exato onde area2 em ponto flutuante erra"
+    triples = near_degenerate ()
+    assert any (naive (*t) != exact (*t) for t in triples)
+    calls = exact_calls (monkeypatch)
+    for t in triples:
+        assert prim.orient2d (*t) == exact (*t)
+    # a poucos ULPs da reta, o filtro e' inconclusivo e a conta exata e' feita
+    assert len (calls) == len (triples)
+
+def test_orient2d_filter (monkeypatch):
+    "Longe da degeneracao, o filtro decide sem a conta exata"
+    calls = exact_calls (monkeypatch)
+    a, b = Point (0, 0), Point (10, 1)
+    for c in Point (3, 5), Point (-2, -7), Point (1e9, 1e-9), Point (20, 2.5), Point (0, 0):
+        assert prim.orient2d (a, b, c) == exact (a, b, c)
+    assert calls == []
+
+def test_predicates ():
+    "left, collinear, ... seguem o sinal exato"
+    for t in near_degenerate ():
+        s = exact (*t)
+        assert prim.left (*t) == (s > 0)
+        assert prim.left_on (*t) == (s >= 0)
+        assert prim.collinear (*t) == (s == 0)
+        assert prim.right (*t) == (s < 0)
+        assert prim.right_on (*t) == (s <= 0)
+
+def test_segment_intersects ():
+    "Segment.intersects com pontas a um ULP da reta do outro segmento"
+    s = Segment (Point (0.25, 0.25), Point (24.0, 24.0))
+    above = Point (0.5, 0.5 + ULP)
+    below = Point (0.5 + ULP, 0.5)
+    assert s.intersects (Segment (above, below))
+    assert not s.intersects (Segment (above, Point (0.5 + ULP, 0.5 + 2 * ULP)))
+    assert s.intersects (Segment (above, Point (0.5, 0.5)))
+
+def test_many ():
+    "orient2d_many e os *_many dao o mesmo que as versoes de um ponto"
+    triples = near_degenerate ()
+    b, c = triples[0][1], triples[0][2]
+    points = np.array ([(a.x, a.y) for a, b_, c_ in triples])
+    expected = np.array ([exact (b, c, a) for a, b_, c_ in triples])
+    assert (prim.orient2d_many (b, c, points) == expected).all ()
+    assert (prim.left_many (b, c, points) == (expected > 0)).all ()
+    assert (prim.left_on_many (b, c, points) == (expected >= 0)).all ()
+    assert (prim.collinear_many (b, c, points) == (expected == 0)).all ()
+    assert (prim.right_many (b, c, points) == (expected < 0)).all ()
+    assert (prim.right_on_many (b, c, points) == (expected <= 0)).all ()
+    area = prim.area2_many (b, c, points)
+    assert list (area) == [prim._area2 (b, c, a) for a, b_, c_ in triples]
+
+def test_many_count ():
+    "Um *_many conta como uma chamada de area2 por ponto"
+    points = np.array ([[0.0, 1.0], [1.0, 0.0], [2.0, 2.0]])
+    a, b = Point (0, 0), Point (1, 1)
+    prim.reset_count ()
+    prim.area2_many (a, b, points)
+    prim.left_many (a, b, points)
+    prim.orient2d (a, b, Point (3, 4))
+    assert prim.get_counts ()['area2'] == 7
+
+def primitives ():
+    "Um algoritmo que faz 3 area2 (uma pelo orient2d), 2 dist2 e um area2_many de 4 pontos"
+    a, b, c = Point (0, 0), Point (1, 0), Point (0, 1)
+    prim.area2 (a, b, c)
+    prim.left (a, b, c)
+    prim.area2 (b, c, a)
+    prim.dist2 (a, b)
+    prim.dist2 (b, c)
+    prim.area2_many (a, b, np.zeros ((4, 2)))
+
+def test_counter ():
+    "Cada algoritmo tem seus contadores; reset so zera os do selecionado"
+    counter = prim.Counter ()
+    counter.select ('a')
+    counter.current['area2'] += 3
+    counter.select ('b')
+    counter.current['dist2'] += 2
+    assert counter.total () == 2
+    counter.select ('a')
+    assert counter.total () == 3
+    counter.reset ()
+    assert counter.total () == 0
+    assert counter.counts['b'] == { 'area2': 0, 'dist2': 2 }
+
+def test_set_algorithm ():
+    prim.set_algorithm ('um')
+    prim.reset_count ()
+    primitives ()
+    assert prim.get_counts () == { 'area2': 7, 'dist2': 2 }
+    prim.set_algorithm ('outro')
+    prim.reset_count ()
+    prim.dist2 (Point (0, 0), Point (1, 1))
+    assert prim.get_count () == 1
+    prim.set_algorithm ('um')
+    assert prim.get_count () == 9
+    prim.set_algorithm (None)
+
+def test_set_counting ():
+    "Sem contagem, as primitivas sao as versoes sem contador"
+    prim.reset_count ()
+    try:
+        prim.set_counting (False)
+        assert prim.area2 is prim._area2 and prim.dist2 is prim._dist2
+        primitives ()
+        prim.add_count ('area2', 10)
+        assert prim.get_count () == 0
+    finally:
+        prim.set_counting (True)
+    assert prim.area2 is not prim._area2
+    primitives ()
+    assert prim.get_count () == 9
+    prim.reset_count ()
+
+def test_run_algorithm_count ():
+    "run_algorithm devolve a contagem do algoritmo e zera os contadores"
+    geocomp.init_display (dummy, None)
+    def alg (input):
+        primitives ()
+    for i in range (2):
+        result = geocomp.run_algorithm (alg, [Point (0, 0)])
+        assert result.count == 9
+        assert result.counts == { 'area2': 7, 'dist2': 2 }
+    try:
+        prim.set_counting (False)
+        assert geocomp.run_algorithm (alg, [Point (0, 0)]).count == 0
+    finally:
+        prim.set_counting (True)
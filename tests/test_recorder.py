@@ -0,0 +1,125 @@
+"""Trace gravado por geocomp.gui.recorder e lido por geocomp.gui.replay"""
+
+import random
+
+import pytest
+
+import geocomp
+from geocomp.common.point import Point
+from geocomp.convex_hull import graham
+from geocomp.gui import dummy
+from geocomp.gui import recorder
+from geocomp.gui import replay
+
+
+def record (name, calls):
+    "Grava em name as chamadas (funcao do recorder, argumentos)"
+    recorder.init_display (name)
+    try:
+        return [getattr (recorder, f) (*args) for f, args in calls]
+    finally:
+        recorder.close ()
+
+def naive_state (ops, end):
+    "Estado da tela depois das operacoes ops[:end], sem checkpoints"
+    canvas, live = None, {}
+    for name, id, args in ops[:end]:
+        if name == 'config_canvas':
+            canvas, live = args, {}
+        elif name == 'plot_delete':
+            live.pop (id, None)
+        elif name != 'sleep':
+            live[id] = (name, args)
+    return canvas, live
+
+
+def test_round_trip (tmp_path):
+    "Cada operacao grafica volta do trace com o mesmo id e os mesmos argumentos"
+    name = str (tmp_path / 'ops.trace')
+    calls = [('config_canvas', (0.0, 10.0, -1.0, 1.0)),
+             ('plot_disc', (1.5, 2.25, 'red', 2.0)),
+             ('plot_circle', (1.0, 1.0, 'green', 3.5)),
+             ('plot_disc_grande', (1.0, 1.0, 'red', 0.125)),
+             ('plot_segment', (0.0, 0.0, 1.0, 1.0, 'blue', 1.0)),
+             ('plot_line', (0.0, 0.0, 1.0, 1.0, 'blue', 2.0)),
+             ('plot_ray', (0.0, 0.0, 1.0, 1.0, 'blue', 2.0)),
+             ('sleep', ()),
+             ('plot_vert_line', (3.0, 'yellow', 1.0)),
+             ('plot_horiz_line', (4.0, 'yellow', 1.0)),
+             ('plot_vert_ray', (1.0, 2.0, True, 'red', 1.0)),
+             ('plot_horiz_ray', (1.0, 2.0, False, 'red', 1.0)),
+             ('plot_parabola', (1.0, 2.0, 3.0, -1.0, 1.0, 50, 'cyan', 1.0)),
+             ('plot_curve', ([0.0, 0.0, 1.0, 2.0, 3.0, 1.0], 'white', 2.0)),
+             ('plot_delete', (2,)),
+             ('plot_delete', (0,)),
+             ('sleep', ())]
+    ids = record (name, calls)
+    ops = recorder.read (name)
+    expected = []
+    for (f, args), id in zip (calls, ids):
+        if f in ('config_canvas', 'sleep'):
+            expected.append ((f, None, args))
+        elif f == 'plot_delete':
+            if args[0]:
+                expected.append ((f, args[0], ()))
+        else:
+            expected.append ((f, id, args))
+    assert ops == expected
+    assert len (set (i for i in ids if i is not None)) == 12
+
+def test_algorithm (tmp_path):
+    "Um algoritmo rodado com o recorder grava os desenhos e os sleeps"
+    name = str (tmp_path / 'graham.trace')
+    rng = random.Random (0)
+    points = [Point (rng.uniform (0, 100), rng.uniform (0, 100)) for i in range (50)]
+    geocomp.init_display (recorder, name)
+    try:
+        result = geocomp.run_algorithm (graham.Graham, points)
+    finally:
+        recorder.close ()
+        geocomp.init_display (dummy, None)
+    ops = recorder.read (name)
+    assert ops[0][0] == 'config_canvas'
+    names = set (op[0] for op in ops)
+    assert { 'plot_disc', 'plot_segment', 'plot_delete', 'sleep' } <= names
+    # no fim, o fecho esta desenhado: um segmento por aresta
+    canvas, live = naive_state (ops, len (ops))
+    segments = [args for f, args in live.values () if f == 'plot_segment']
+    assert len (segments) >= len (result.output)
+
+def test_trace_states (tmp_path, monkeypatch):
+    "Trace.state (com checkpoints) da' o mesmo estado que aplicar tudo desde o inicio"
+    monkeypatch.setattr (replay, 'CHECKPOINTS', 7)
+    rng = random.Random (1)
+    calls = [('config_canvas', (0.0, 1.0, 0.0, 1.0))]
+    # o recorder numera os itens a partir de 1
+    discs = 0
+    for i in range (300):
+        r = rng.random ()
+        if r < 0.5 or not discs:
+            calls.append (('plot_disc', (rng.random (), rng.random (), 'red', 2.0)))
+            discs += 1
+        elif r < 0.8:
+            calls.append (('sleep', ()))
+        elif r < 0.98:
+            calls.append (('plot_delete', (rng.randint (1, discs),)))
+        else:
+            calls.append (('config_canvas', (0.0, 2.0, 0.0, 2.0)))
+    name = str (tmp_path / 'random.trace')
+    record (name, calls)
+    ops = recorder.read (name)
+    trace = replay.Trace (ops)
+    # um passo depois de cada sleep, e um para o que vem depois do ultimo
+    sleeps = sum (1 for op in ops if op[0] == 'sleep')
+    assert len (trace) == sleeps + 1 + (ops[-1][0] != 'sleep')
+    assert trace.steps[-1] == len (ops)
+    assert len (trace.checkpoints) > 1
+    for step in range (len (trace)):
+        assert trace.state (step) == naive_state (ops, trace.steps[step])
+
+def test_bad_file (tmp_path):
+    name = str (tmp_path / 'bad.trace')
+    with open (name, 'wb') as file:
+        file.write (b'not a trace at all')
+    with pytest.raises (ValueError):
+        recorder.read (name)
@@ -0,0 +1,62 @@
+"""Registro dos algoritmos e importacao preguicosa dos modulos"""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+from geocomp.common import registry
+
+
+def run (code):
+    "Roda code num interpretador novo (sem nenhum modulo ja importado)"
+    out = subprocess.run ([sys.executable, '-c', code], cwd = ROOT,
+                          capture_output = True, text = True, check = True)
+    return out.stdout.split ()
+
+def test_lazy ():
+    "So o primeiro acesso a um algoritmo importa o seu modulo"
+    out = run ('''
+import sys
+import geocomp
+from geocomp.common import registry
+loaded = lambda: sorted (m for m in sys.modules if m.startswith ('geocomp.')
+                         and m.count ('.') == 2 and not m.startswith ('geocomp.common'))
+print (len (registry.algorithms ()), len (loaded ()))
+f = registry.get_func ('closest/divide')
+print (f.__name__, ' '.join (loaded ()))
+geocomp.convex_hull.graham
+print (' '.join (loaded ()))
+''')
+    n, before = int (out[0]), int (out[1])
+    assert n == len (registry.algorithms ()) and before == 0
+    assert out[2:4] == ['Divide', 'geocomp.closest.divide']
+    assert out[4:] == ['geocomp.closest.divide', 'geocomp.convex_hull.graham']
+
+def test_algorithms ():
+    algorithms = registry.algorithms ()
+    assert len (set (a.name for a in algorithms)) == len (algorithms)
+    for a in algorithms:
+        assert a.input_type in ('points', 'segments')
+        assert a.complexity
+        assert registry.get (a.name) is a
+    closest = registry.algorithms ('closest')
+    assert [a.func for a in closest] == ['Brute', 'Divide', 'Grid', 'AllNearest']
+
+def test_get_func ():
+    from geocomp.closest import grid
+    for name in ('closest/grid', 'closest/grid.Grid', 'geocomp/closest/grid.py',
+                 'geocomp/closest/grid'):
+        assert registry.get_func (name) is grid.Grid
+    # problema/modulo e' o primeiro algoritmo do modulo
+    assert registry.get ('convex_hull/akl_toussaint').func == 'GrahamFiltrado'
+    assert registry.get_func ('convex_hull/akl_toussaint.ChanFiltrado').__name__ == \
+           'ChanFiltrado'
+    with pytest.raises (KeyError, match = 'Unknown algorithm'):
+        registry.get ('closest/nothing')
+
+def test_lazy_attribute_error ():
+    import geocomp.closest
+    with pytest.raises (AttributeError):
+        geocomp.closest.nothing
@@ -0,0 +1,71 @@
+"""guicontrol.run_algorithm: Result, to_json e a saida dos algoritmos"""
+
+import json
+
+import numpy as np
+
+import geocomp
+from geocomp import config
+from geocomp.common.disc import Disc
+from geocomp.common.guicontrol import Result, to_json
+from geocomp.common.point import Point
+from geocomp.common.polygon import Polygon
+from geocomp.common.segment import Segment
+from geocomp.convex_hull import graham
+from geocomp.closest import brute
+from geocomp.gui import dummy
+
+
+def points ():
+    return [Point (0, 0), Point (4, 0), Point (4, 3), Point (0, 3), Point (1, 1)]
+
+def test_result ():
+    geocomp.init_display (dummy, None)
+    result = geocomp.run_algorithm (brute.Brute, points ())
+    assert isinstance (result, Result)
+    assert result.algorithm == 'Brute'
+    assert isinstance (result.output, Segment)
+    assert result.count == sum (result.counts.values ()) > 0
+    # pelo menos um dist2 por par de pontos
+    assert result.counts['dist2'] >= 10
+    assert result.extra_info == 'distancia: %.2f' % 2 ** 0.5
+    assert result.wall_time >= 0 and result.cpu_time >= 0
+    assert result.peak_memory is None
+    # compatibilidade com o (cont, extra_info) de antes
+    count, extra_info = result
+    assert (count, extra_info) == (result.count, result.extra_info)
+
+def test_memory ():
+    geocomp.init_display (dummy, None)
+    result = geocomp.run_algorithm (lambda l: [0] * 100000, points (), memory = True)
+    assert result.peak_memory >= 100000 * 8
+
+def test_as_dict ():
+    geocomp.init_display (dummy, None)
+    result = geocomp.run_algorithm (graham.Graham, points ())
+    record = json.loads (json.dumps (result.as_dict ()))
+    assert record['algorithm'] == 'Graham'
+    assert record['output'] == result.output == [0, 1, 2, 3]
+    assert record['count'] == result.count and record['counts'] == result.counts
+    assert 'output' not in result.as_dict (False)
+
+def test_to_json ():
+    a, b = Point (1, 2), Point (3.5, 4)
+    assert to_json (None) is None
+    assert to_json ([a, (b, 3)]) == [[1, 2], [[3.5, 4], 3]]
+    assert to_json (Segment (a, b)) == [[1, 2], [3.5, 4]]
+    assert to_json (Polygon ([Point (0, 0), Point (1, 0), Point (0, 1)])) == \
+           [[0, 0], [1, 0], [0, 1]]
+    assert to_json (Disc (1, 2, 3)) == [1, 2, 3]
+    assert to_json (np.arange (3)) == [0, 1, 2]
+    assert to_json (np.float64 (0.5)) == 0.5
+    assert to_json (object) == repr (object)
+
+def test_verbose (capsys, monkeypatch):
+    "Os algoritmos so imprimem os pontos com config.VERBOSE"
+    geocomp.init_display (dummy, None)
+    geocomp.run_algorithm (graham.Graham, points ())
+    assert capsys.readouterr ().out == ''
+    monkeypatch.setattr (config, 'VERBOSE', True)
+    geocomp.run_algorithm (graham.Graham, points ())
+    assert '( 4, 3 )' in capsys.readouterr ().out
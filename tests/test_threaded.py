@@ -0,0 +1,144 @@
+"""Interface com o algoritmo numa thread: coalesce, quadros e erros"""
+
+import threading
+import types
+
+import pytest
+
+from geocomp.gui import threaded
+
+
+class Var:
+    def __init__ (self, value):
+        self.value = value
+
+    def get (self):
+        return self.value
+
+class Master:
+    "O suficiente de tkgeocomp para threaded: controles e after"
+
+    def __init__ (self):
+        self.delay = Var (0)
+        self.step_by_step = Var (0)
+        self.frames = []
+        self.tk = types.SimpleNamespace (after = lambda ms, f: self.frames.append (f))
+
+def fake_tk (drawn, fail = False):
+    "Um geocomp.gui.tk que so anota os comandos"
+    def plot (name):
+        def f (*args):
+            if fail:
+                raise RuntimeError ('desenho')
+            drawn.append ((name,) + args)
+            return len (drawn)
+        return f
+    ret = types.SimpleNamespace (init_display = lambda master: None,
+                                 hide_algorithm = lambda: 0,
+                                 flush = lambda: None)
+    ret.config_canvas = plot ('config_canvas')
+    ret.plot_disc = plot ('plot_disc')
+    ret.plot_delete = plot ('plot_delete')
+    return ret
+
+@pytest.fixture
+def display (monkeypatch):
+    "Inicia threaded com o Tk falso; devolve (master, comandos desenhados)"
+    drawn = []
+    monkeypatch.setattr (threaded, 'tk', fake_tk (drawn))
+    monkeypatch.setattr (threaded, 'guicontrol',
+                         types.SimpleNamespace (run_algorithm = lambda alg, input: alg (input)))
+    master = Master ()
+    threaded.init_display (master)
+    yield master, drawn
+    threaded.stop ()
+    if threaded.worker is not None:
+        threaded.worker.join (5)
+
+def run (master, alg, frames = 1000):
+    "Roda alg e desenha quadros ate ele terminar; devolve (result, error)"
+    ret = []
+    threaded.start (alg, [], lambda result, error: ret.append ((result, error)))
+    for i in range (frames):
+        if threaded.worker is not None:
+            threaded.worker.join (0.01)
+        n = len (master.frames)
+        master.frames[-1] ()
+        # todo quadro agenda o proximo
+        assert len (master.frames) == n + 1
+        if ret:
+            return ret[0]
+    raise AssertionError ('o algoritmo nao terminou')
+
+
+def test_coalesce ():
+    "coalesce descarta o que vem antes do config_canvas e o que nasce e morre no quadro"
+    dropped = threaded.dropped
+    ops = [('plot_disc', 1, ()), ('config_canvas', None, (0, 1, 0, 1)),
+           ('plot_disc', 2, ()), ('plot_disc', 3, ()), ('plot_delete', 2, ()),
+           ('plot_delete', 7, ())]
+    assert threaded.coalesce (ops) == [('config_canvas', None, (0, 1, 0, 1)),
+                                       ('plot_disc', 3, ()), ('plot_delete', 7, ())]
+    assert threaded.dropped - dropped == 3
+    assert threaded.coalesce ([]) == []
+
+def test_run (display):
+    "Os comandos do algoritmo sao desenhados (sem os descartados) antes do fim"
+    master, drawn = display
+    def alg (input):
+        a = threaded.plot_disc (0, 0, 'red', 1)
+        b = threaded.plot_disc (1, 1, 'red', 1)
+        threaded.plot_delete (a)
+        return b
+    assert run (master, alg) == (2, None)
+    assert drawn == [('plot_disc', 1, 1, 'red', 1)]
+
+def test_algorithm_error (display):
+    master, drawn = display
+    def alg (input):
+        raise ValueError ('algoritmo')
+    result, error = run (master, alg)
+    assert result is None and isinstance (error, ValueError)
+
+def test_draw_error (display, monkeypatch):
+    "Um erro ao desenhar interrompe o algoritmo e e' passado para o fim"
+    master, drawn = display
+    monkeypatch.setattr (threaded, 'tk', fake_tk (drawn, fail = True))
+    def alg (input):
+        while True:
+            threaded.plot_disc (0, 0, 'red', 1)
+            threaded.sleep ()
+    result, error = run (master, alg)
+    assert result is None and isinstance (error, RuntimeError)
+
+def test_callback_error (display):
+    "O proximo quadro e' agendado mesmo se a funcao chamada no fim falhar"
+    master, drawn = display
+    def callback (result, error):
+        raise KeyError ('fim')
+    threaded.start (lambda input: None, [], callback)
+    threaded.worker.join (5)
+    n = len (master.frames)
+    with pytest.raises (KeyError):
+        master.frames[-1] ()
+    assert len (master.frames) == n + 1
+
+def test_stop_full_queue (display, monkeypatch):
+    "stop libera um algoritmo esperando a fila cheia"
+    master, drawn = display
+    monkeypatch.setattr (threaded, 'commands', threaded.queue.Queue (2))
+    waiting = threading.Event ()
+    def alg (input):
+        for i in range (10):
+            if i == 2:
+                waiting.set ()
+            threaded.plot_disc (i, i, 'red', 1)
+    threaded.start (alg, [], lambda result, error: None)
+    assert waiting.wait (5)
+    threaded.worker.join (0.2)
+    assert threaded.worker.is_alive ()
+    threaded.stop ()
+    threaded.worker.join (5)
+    assert not threaded.worker.is_alive ()
+    result, error = threaded.outcome
+    assert isinstance (error, threaded.Stopped)
@@ -2,9 +2,8 @@
 
 from tkinter import *
 import geocomp
-from geocomp.gui import tk
+from geocomp.gui import threaded
 from geocomp import config
-import geocomp.common.io as io
 import os
 import string
 
@@ -86,7 +85,7 @@ class App:
         self.delay.set (config.DELAY)
         self.delay.pack (fill = X, side=BOTTOM)
 
-        geocomp.init_display (tk, self)
+        geocomp.init_display (threaded, self)
         self.input = []
         self.step = IntVar ()
         self.step.set (1)
@@ -119,11 +118,13 @@ class App:
     def delete_cb (self, arg=None):
         """ fechar tudo """
         self.step.set (1)
+        threaded.stop ()
         self.tk.destroy ()
 
     def step_cb (self, event):
         """passo completado"""
         self.step.set (1)
+        threaded.step ()
         return 'break'
 
     def create_buttons (self, clicked, initial = None):
@@ -206,7 +207,7 @@ class App:
         if os.path.isdir(selection):
             self.update_files(selection)
             return
-        self.input = io.read(selection)
+        self.input = geocomp.open_file(selection)
         geocomp.plot_input(self.input)
         self.current_filename = self.selected_file.get()
         self.reset_labels()
@@ -267,7 +268,10 @@ class App:
         self.file_cont = self.file_cont + 1
 
     def run_algorithm (self, alg, widget, alg_name):
-        """roda o algoritmo alg"""
+        """roda o algoritmo alg
+
+        O algoritmo roda numa thread separada (veja geocomp.gui.threaded);
+        finished e' chamado quando ele termina."""
         self.file_cont = 0
         self.current_algorithm = alg_name
 
@@ -279,14 +283,20 @@ class App:
         self.canvas.focus_set ()
         self.tk.bind('<space>', self.step_cb)
 
-        cont, extra = geocomp.run_algorithm (alg, self.input)
-
-        widget.label['text'] = "%6d" % cont
-        if extra is not None:
-            self.bottom_label['text'] = extra
+        threaded.start (alg, self.input,
+                        lambda result, error, self=self, widget=widget:
+                            self.finished (widget, result, error))
 
+    def finished (self, widget, result, error):
+        """o algoritmo terminou"""
         self.tk.unbind('<space>')
         self.enable()
+        if error is not None:
+            raise error
+
+        widget.label['text'] = "%6d" % result.count
+        if result.extra_info is not None:
+            self.bottom_label['text'] = result.extra_info
 
 
 app = App ()
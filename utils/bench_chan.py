@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Compara Chan, Graham e Embrulho variando o tamanho h do fecho
+
+Para cada h, gera num_pts pontos com rand_n_vertices (h pontos num
+circulo, o resto num disco dentro dele) e mede o tempo e o numero de
+operacoes primitivas de cada algoritmo. No fim, mostra, para cada um
+dos outros dois, a partir de que h o vencedor contra o Chan nao muda
+mais."""
+
+import io
+import os
+import sys
+import time
+import contextlib
+
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
+
+import geocomp
+from geocomp.gui import dummy
+from geocomp.common.point import Point
+from geocomp.convex_hull.chan import Chan
+from geocomp.convex_hull.graham import Graham
+from geocomp.convex_hull.embrulho import Embrulho
+
+import rand_n_vertices
+
+ALGORITHMS = [ Chan, Graham, Embrulho ]
+
+def roda (alg, l, reps):
+	"Menor tempo de reps execucoes de alg sobre l, e o numero de primitivas"
+	best = None
+	for r in range (reps):
+		with contextlib.redirect_stdout (io.StringIO ()):
+			t = time.perf_counter ()
+			cont, extra = geocomp.run_algorithm (alg, l)
+			t = time.perf_counter () - t
+		if best is None or t < best:
+			best = t
+	return best, cont
+
+def bench (num_pts, reps):
+	geocomp.init_display (dummy, None)
+	tabela = []
+	h = 4
+	while h <= num_pts:
+		pts = rand_n_vertices.rand_n_vertices (num_pts, h, 10000)
+		l = [ Point (x, y) for x, y in pts ]
+		linha = [ roda (alg, l, reps) for alg in ALGORITHMS ]
+		tabela.append ((h, linha))
+
+		print ('%8d' % h, end='')
+		for t, cont in linha:
+			print ('  %9.4fs %10d' % (t, cont), end='')
+		print ()
+		sys.stdout.flush ()
+		h *= 2
+	return tabela
+
+def crossover (tabela, k):
+	"""Menor h a partir do qual o vencedor entre o Chan e o algoritmo k
+	nao muda mais, e o vencedor (0 ou k)"""
+	vencedor = None
+	inicio = None
+	for h, linha in tabela:
+		v = k if linha[k][0] < linha[0][0] else 0
+		if v != vencedor:
+			vencedor, inicio = v, h
+	return inicio, vencedor
+
+if __name__ == '__main__':
+	if len (sys.argv) < 2:
+		print (sys.argv[0], '<num_pts> [repeticoes]')
+		sys.exit (1)
+
+	num_pts = int (sys.argv[1])
+	reps = 3
+	if len (sys.argv) > 2:
+		reps = int (sys.argv[2])
+
+	print ('%8s' % 'h', end='')
+	for alg in ALGORITHMS:
+		print ('  %22s' % (alg.__name__ + ' (tempo, prims)'), end='')
+	print ()
+
+	tabela = bench (num_pts, reps)
+
+	for k in range (1, len (ALGORITHMS)):
+		h, v = crossover (tabela, k)
+		print ('Chan x %s: a partir de h = %d, o mais rapido e\' o %s'
+		       % (ALGORITHMS[k].__name__, h, ALGORITHMS[v].__name__))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Compara o leitor linha a linha (io._iter_records) com o leitor em
+blocos (io.read) nos arquivos de dados
+
+Para cada diretorio dado (por padrao, dados e Dados), mede o menor
+tempo de algumas leituras de todos os arquivos com cada leitor, e
+confere que os dois devolvem os mesmos primitivos. Mede tambem so a
+leitura dos numeros, sem criar os objetos: os registros do leitor linha
+a linha contra os arrays do leitor em blocos."""
+
+import os
+import sys
+import time
+
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
+
+from geocomp.common import io
+from geocomp.common import binary
+from geocomp.common.point import Point
+from geocomp.common.segment import Segment
+from geocomp.common.polygon import Polygon
+from geocomp.common.disc import Disc
+
+def arquivos (diretorio):
+	ret = []
+	for raiz, dirs, nomes in os.walk (diretorio):
+		for nome in nomes:
+			ret.append (os.path.join (raiz, nome))
+	return sorted (ret)
+
+def linha_a_linha (nome):
+	"Os objetos do arquivo, como o io.read lia antes do leitor em blocos"
+	ret = []
+	for kind, v in io._iter_records (nome):
+		if kind == 'point':
+			ret.append (Point (v[0], v[1]))
+		elif kind == 'segment':
+			ret.append (Segment (Point (v[0], v[1]), Point (v[2], v[3])))
+		elif kind == 'disc':
+			ret.append (Disc (v[0], v[1], v[2]))
+		else:
+			ret.append (Polygon ([ Point (x, y) for x, y in v ]))
+	return ret
+
+def registros (nome):
+	return list (io._iter_records (nome))
+
+def arrays (nome):
+	return list (io._iter_blocks (nome))
+
+def tempo (leitor, nomes, reps):
+	best = None
+	for r in range (reps):
+		t = time.perf_counter ()
+		for nome in nomes:
+			leitor (nome)
+		t = time.perf_counter () - t
+		if best is None or t < best:
+			best = t
+	return best
+
+def bench (diretorio, reps):
+	nomes = [ nome for nome in arquivos (diretorio)
+	          if not binary.is_binary (nome) ]
+	for nome in nomes:
+		a = [ repr (d) for d in linha_a_linha (nome) ]
+		b = [ repr (d) for d in io.read (nome) ]
+		if a != b:
+			print ('diferenca em', nome)
+
+	print ('%s: %d arquivos' % (diretorio, len (nomes)))
+	for nome, antes, depois in [ ('objetos', linha_a_linha, io.read),
+	                             ('numeros', registros, arrays) ]:
+		antes = tempo (antes, nomes, reps)
+		depois = tempo (depois, nomes, reps)
+		print ('  %s:  linha a linha %8.3fs  blocos %8.3fs  (%.1fx)'
+		       % (nome, antes, depois, antes / depois))
+
+if __name__ == '__main__':
+	reps = 3
+	dirs = sys.argv[1:]
+	if not dirs:
+		base = os.path.dirname (os.path.dirname (os.path.abspath (__file__)))
+		dirs = [ os.path.join (base, 'dados'), os.path.join (base, 'Dados') ]
+	for d in dirs:
+		bench (d, reps)
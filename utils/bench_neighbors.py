@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Compara o vizinho mais proximo de todos os pontos com arvore k-d
+(closest.neighbors.all_nearest) com a forca bruta O(n^2)
+(all_nearest_brute)
+
+Para cada tamanho n (de 1000 ate o maior dado, dobrando), gera n pontos
+uniformes num quadrado, confere que os dois devolvem vizinhos a mesma
+distancia de cada ponto e imprime o tempo e o numero de primitivas
+(dist2) de cada um. A forca bruta para de rodar quando passa de
+LIMITE segundos.
+
+	python utils/bench_neighbors.py [maior n]"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
+
+import numpy as np
+
+from geocomp.common import prim
+from geocomp.common.pointset import PointSet
+from geocomp.closest.neighbors import all_nearest, all_nearest_brute
+from geocomp.bench.generators import randbox
+
+LIMITE = 30.0
+
+def mede (f, pontos):
+	prim.reset_count ()
+	t = time.perf_counter ()
+	nn = f (pontos)
+	return nn, time.perf_counter () - t, prim.get_count ()
+
+def dist2 (pontos, nn):
+	dx = pontos.x[nn] - pontos.x
+	dy = pontos.y[nn] - pontos.y
+	return dx * dx + dy * dy
+
+def bench (maior):
+	prim.set_algorithm ('bench_neighbors')
+	forca_bruta = True
+	n = 1000
+	print ('%8s  %10s %12s  %10s %12s  %7s' % ('n', 'kd (s)', 'dist2',
+	                                          'bruta (s)', 'dist2', 'ganho'))
+	while n <= maior:
+		pontos = PointSet.from_array (randbox (n, 10000, random.Random (n)))
+		nn, t, c = mede (all_nearest, pontos)
+		linha = '%8d  %10.3f %12d' % (n, t, c)
+		if forca_bruta:
+			nn_b, t_b, c_b = mede (all_nearest_brute, pontos)
+			if not np.array_equal (dist2 (pontos, nn), dist2 (pontos, nn_b)):
+				print ('diferenca em n =', n)
+			linha += '  %10.3f %12d  %6.1fx' % (t_b, c_b, t_b / t)
+			forca_bruta = t_b < LIMITE
+		print (linha)
+		n *= 2
+
+if __name__ == '__main__':
+	maior = 128000
+	if len (sys.argv) > 1:
+		maior = int (sys.argv[1])
+	bench (maior)
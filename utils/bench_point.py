@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Mede o custo de criar pontos e de ler suas coordenadas
+
+Compara o Point atual (x e y em slots) com o Point original (coordenadas
+numa lista privada, lidas por properties, e um dicionario lineto_id por
+ponto), e a PointView atual (ndarray.item) com a leitura por
+float(array[i]). Para cada um, mostra o tempo de criar n pontos, a
+memoria de cada ponto, e o tempo de somar x + y de todos eles."""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
+
+from geocomp.common.point import Point
+from geocomp.common.pointset import PointSet, PointView
+
+class PontoOriginal:
+	"O Point de antes dos slots"
+
+	def __init__ (self, *args):
+		self.__coord = list (args)
+		self.polygon_id = -1
+		self.lineto_id = {}
+
+	@property
+	def x (self):
+		return self.__coord[0]
+
+	@property
+	def y (self):
+		return self.__coord[1]
+
+class ViewFloat (PointView):
+	"A PointView que convertia o escalar do NumPy com float"
+
+	__slots__ = ()
+
+	@property
+	def x (self):
+		return float (self.pointset.x[self.index])
+
+	@property
+	def y (self):
+		return float (self.pointset.y[self.index])
+
+def tempo (f, reps):
+	best = None
+	for r in range (reps):
+		t = time.perf_counter ()
+		ret = f ()
+		t = time.perf_counter () - t
+		if best is None or t < best:
+			best = t
+	return best, ret
+
+def memoria (cria):
+	tracemalloc.start ()
+	antes = tracemalloc.get_traced_memory ()[0]
+	pts = cria ()
+	depois = tracemalloc.get_traced_memory ()[0]
+	tracemalloc.stop ()
+	return (depois - antes) / len (pts)
+
+def soma (pts):
+	s = 0.0
+	for p in pts:
+		s += p.x + p.y
+	return s
+
+def bench (n, reps):
+	rng = np.random.default_rng (0)
+	ps = PointSet (rng.random (n), rng.random (n))
+	xs, ys = ps.x.tolist (), ps.y.tolist ()
+	tipos = [ ('Point original', lambda: [ PontoOriginal (x, y) for x, y in zip (xs, ys) ]),
+	          ('Point', lambda: [ Point (x, y) for x, y in zip (xs, ys) ]),
+	          ('PointView float', lambda: [ ViewFloat (ps, i) for i in range (n) ]),
+	          ('PointView item', lambda: [ PointView (ps, i) for i in range (n) ]) ]
+	print ('%d pontos' % n)
+	esperado = None
+	for nome, cria in tipos:
+		t_cria, pts = tempo (cria, reps)
+		t_soma, s = tempo (lambda: soma (pts), reps)
+		if esperado is None:
+			esperado = s
+		elif s != esperado:
+			print ('  diferenca em', nome)
+		print ('  %-16s  criar %6.3fs  %6.1f bytes/ponto  ler x e y %6.1f ns/ponto'
+		       % (nome, t_cria, memoria (cria), t_soma / n * 1e9))
+
+if __name__ == '__main__':
+	n = int (sys.argv[1]) if len (sys.argv) > 1 else 10 ** 6
+	bench (n, 3)
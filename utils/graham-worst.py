@@ -1,32 +1,18 @@
 #!/usr/bin/env python
 
-import random
-import embaralha
+import os
 import sys
-from math import *
 
-RADIUS = 10000
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
 
-if len (sys.argv) < 2:
-	print sys.argv[0],'<num-pts>'
-	sys.exit (1)
+from geocomp.bench.generators import graham_worst
 
-num_pts = int (sys.argv[1])
-if num_pts < 0: num_pts = - num_pts
+if __name__ == '__main__':
+	if len (sys.argv) < 2:
+		print (sys.argv[0],'<num-pts>')
+		sys.exit (1)
 
-l = [(0,0), (-2 * RADIUS, 0), (0, RADIUS)]
+	l = graham_worst (int (sys.argv[1]))
 
-delta = (pi*5./40) /int (num_pts - 3)
-theta = 35*pi/40
-for i in range (0, int (num_pts - 3)):
-
-	x = int (RADIUS * cos (theta))
-	y = int (RADIUS * sin (theta))
-
-	l.append ((x,y))
-	theta = theta + delta
-
-l = embaralha.embaralha (l)
-
-for i in l:
-	print i[0],i[1]
+	for i in l:
+		print (i[0],i[1])
@@ -1,33 +1,18 @@
 #!/usr/bin/env python
 
-import randdisc
-import uniform_circ
-import random
-import embaralha
+import os
+import sys
 
-def rand_n_vertices (num_pts, num_vertices, radius):
-	if radius < 0: radius = -radius
-	if radius == 0: radius = 10000
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
 
-	if num_vertices < 4: num_vertices = 4
-
-	if num_vertices > num_pts:
-		num_vertices, num_pts = num_pts, num_vertices
-	
-	l1 = randdisc.randdisc (num_pts - num_vertices, 0.7*radius)
-	l2 = uniform_circ.uniform_circ (num_vertices, radius)
-
-	l1.extend (l2)
-
-	return embaralha.embaralha (l1)
+from geocomp.bench.generators import rand_n_vertices
 
 if __name__ == '__main__':
-	import sys
 	RADIUS = 10000
 
 	if len (sys.argv) < 3:
-		print sys.argv[0],'<num_pts> <num_vertices> [radius]'
-		print '"radius"  multiplicado internamente por 0.7'
+		print (sys.argv[0],'<num_pts> <num_vertices> [radius]')
+		print ('"radius" é multiplicado internamente por 0.7')
 		sys.exit (1)
 
 	num_pts = int (sys.argv[1])
@@ -39,4 +24,4 @@ if __name__ == '__main__':
 	l = rand_n_vertices (num_pts, num_vertices, RADIUS)
 
 	for p in l:
-		print p[0],p[1]
+		print (p[0],p[1])
@@ -1,23 +1,17 @@
 #!/usr/bin/env python
 
-import random
+import os
+import sys
 
-def randbox (num_pts, side_length):
-	l = []
-	for i in range (0, num_pts):
-		x = float (random.uniform (0, side_length))
-		y = float (random.uniform (0, side_length))
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
 
-		l.append ( (x, y) )
-	
-	return l
+from geocomp.bench.generators import randbox
 
 if __name__ == '__main__':
-	import sys
 	LENGTH = 100
 
 	if len (sys.argv) < 2:
-		print sys.argv[0],'<num> [length]'
+		print (sys.argv[0],'<num> [length]')
 		sys.exit (1)
 
 	if len (sys.argv) > 2:
@@ -27,4 +21,4 @@ if __name__ == '__main__':
 	l = randbox (int (sys.argv[1]), LENGTH)
 
 	for p in l:
-		print p[0],p[1]
+		print (p[0],p[1])
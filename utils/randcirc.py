@@ -1,27 +1,17 @@
 #!/usr/bin/env python
 
-import random
-from math import *
-
-def randcirc (num_pts, radius):
-	if radius < 0: radius = -radius
-	if radius == 0: radius = 15000
-	l = []
-	for i in range (0, num_pts):
-		theta = random.uniform (0, 2*pi)
-		x = float (radius * cos (theta))
-		y = float (radius * sin (theta))
-
-		l.append ((x, y))
-	
-	return l
+import os
+import sys
+
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
+
+from geocomp.bench.generators import randcirc
 
 if __name__ == '__main__':
-	import sys
 	RADIUS = 15000
 
 	if len (sys.argv) < 2:
-		print sys.argv[0],'<num> [radius]'
+		print (sys.argv[0],'<num> [radius]')
 		sys.exit (1)
 
 	if len (sys.argv) > 2:
@@ -31,4 +21,4 @@ if __name__ == '__main__':
 	l = randcirc (int (sys.argv[1]), RADIUS)
 
 	for p in l:
-		print p[0],p[1]
+		print (p[0],p[1])
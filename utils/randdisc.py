@@ -1,31 +1,17 @@
 #!/usr/bin/env python
 
-import random
-from math import *
+import os
+import sys
 
-def randdisc (num_pts, radius):
-	if radius < 0: radius = -radius
-	if radius == 0: radius = 10000
-	l = []
-	for i in range (0, num_pts):
-		r2 = random.uniform (0, radius*radius)
-		r = sqrt (r2)
-		theta = random.uniform (0, 2 * pi)
-
-		x = float (r * cos (theta))
-		y = float (r * sin (theta))
-
-		l.append ( (x,y) )
-	
-	return l
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
 
+from geocomp.bench.generators import randdisc
 
 if __name__ == '__main__':
-	import sys
 	RADIUS = 10000
 
 	if len (sys.argv) < 2:
-		print sys.argv[0],'<num> [radius]'
+		print (sys.argv[0],'<num> [radius]')
 		sys.exit (1)
 
 	if len (sys.argv) > 2:
@@ -35,4 +21,4 @@ if __name__ == '__main__':
 	l = randdisc (int (sys.argv[1]), RADIUS)
 
 	for p in l:
-		print p[0],p[1]
+		print (p[0],p[1])
@@ -1,30 +1,15 @@
 #!/usr/bin/env python
 
-from math import *
+import os
+import sys
 
-RADIUS = 100
+sys.path.insert (0, os.path.dirname (os.path.dirname (os.path.abspath (__file__))))
 
-def randspiral (num_pts, num_turns):
-
-	l = []
-	theta = 0
-	radius = RADIUS
-	for i in range (num_pts):
-		theta = i*(num_turns*2*pi)/num_pts
-		radius = RADIUS * exp (3.32614159909e-2*theta)
-
-		x = radius * cos (theta)
-		y = radius * sin (theta)
-
-		l.append ( (x, y) )
-	
-	return l
+from geocomp.bench.generators import randspiral
 
 if __name__ == '__main__':
-	import sys
-
 	if len (sys.argv) != 3:
-		print sys.argv[0],'<num_pts> <num_turns>'
+		print (sys.argv[0],'<num_pts> <num_turns>')
 		sys.exit (1)
 
 	num_pts = int (sys.argv[1])
@@ -33,4 +18,4 @@ if __name__ == '__main__':
 	l = randspiral (num_pts, num_turns)
 
 	for p in l:
-		print p[0],p[1]
+		print (p[0],p[1])